@@ -0,0 +1,100 @@
+"""Token signing and verification throughput for jwt_service.
+
+Generates throwaway node keys in a temp dir and measures, per second:
+  sign_token (RS256):
+    reload + sign  — parse the PEM and sign on every call (the behaviour before caching)
+    cached key     — keep the parsed key, sign a new token every call (fresh=True)
+    reused token   — the default: one signature per audience per token lifetime
+  RS256 vs EdDSA:
+    sign           — jwt.encode with the parsed private key
+    verify         — verify_token with the parsed public key (what require_jwt does on a cache miss)
+
+Usage (from api/):
+    python -m benchmarks.bench_jwt [--seconds 2] [--audiences 4]
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+
+from config import settings
+from services import jwt_service
+from startup import ensure_key_pair
+
+
+def _reload_and_sign(audience: str) -> None:
+    jwt_service._signing_keys.clear()
+    jwt_service.sign_token(audience, fresh=True)
+
+
+def _cached_key(audience: str) -> None:
+    jwt_service.sign_token(audience, fresh=True)
+
+
+def _reused_token(audience: str) -> None:
+    jwt_service.sign_token(audience)
+
+
+def _per_second(op, seconds: float) -> float:
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        op()
+        calls += 1
+    return calls / (time.perf_counter() - start)
+
+
+def run_algorithm(algorithm: str, seconds: float) -> tuple[float, float]:
+    """(signs/s, verifies/s) for one algorithm with this node's key for it."""
+    private_key = jwt_service._load_private_key(algorithm)
+    public_key = serialization.load_pem_public_key(jwt_service.load_public_key_pem(algorithm).encode())
+    now = datetime.now(timezone.utc)
+    payload = {"iss": "node-b", "aud": settings.node_id, "iat": now, "exp": now + timedelta(minutes=5)}
+    token = jwt.encode(payload, private_key, algorithm=algorithm)
+    signs = _per_second(lambda: jwt.encode(payload, private_key, algorithm=algorithm), seconds)
+    verifies = _per_second(lambda: jwt_service.verify_token(token, public_key), seconds)
+    return signs, verifies
+
+
+def run(sign, seconds: float, audiences: int) -> float:
+    """Return sign_token calls per second, cycling over `audiences` peers."""
+    names = [f"node-{i}" for i in range(audiences)]
+    calls = iter(range(10**12))
+    return _per_second(lambda: sign(names[next(calls) % audiences]), seconds)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--audiences", type=int, default=4)
+    args = parser.parse_args()
+
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        patch.object(settings, "private_key_path", str(Path(tmp) / "node.key")),
+        patch("services.connections.get_peer_public_key", return_value=None),  # no peers → RS256
+    ):
+        ensure_key_pair()
+        print(f"sign_token, {args.audiences} audiences, {args.seconds:g} s per mode")
+        print(f"{'mode':<16} {'tokens/s':>12}")
+        for name, sign in [
+            ("reload + sign", _reload_and_sign), ("cached key", _cached_key), ("reused token", _reused_token),
+        ]:
+            jwt_service._issued.clear()
+            print(f"{name:<16} {run(sign, args.seconds, args.audiences):>12.0f}")
+
+        print()
+        print(f"{'algorithm':<16} {'sign/s':>12} {'verify/s':>12}")
+        for algorithm in ("RS256", "EdDSA"):
+            signs, verifies = run_algorithm(algorithm, args.seconds)
+            print(f"{algorithm:<16} {signs:>12.0f} {verifies:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Overhead of the API metrics (metrics.py).
+
+Calls a minimal FastAPI app in-process, straight through its ASGI interface (no
+sockets, no HTTP client), so the middleware is a measurable share of each request:
+  bare           — the app without MetricsMiddleware
+  instrumented   — the same app wrapped in MetricsMiddleware
+and reports the difference per request. Also times metrics.timed() around an
+empty block, the cost added to every triple store, AMQP and JWT verify call.
+
+Usage (from api/):
+    python -m benchmarks.bench_metrics [--requests 20000]
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+import metrics
+
+
+def _app(instrumented: bool):
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: str):
+        return {"id": item_id}
+
+    return metrics.MetricsMiddleware(app) if instrumented else app
+
+
+async def _drive(app, requests: int) -> float:
+    """Return seconds per request."""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    def scope(i: int) -> dict:
+        return {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": f"/items/{i % 100}", "raw_path": f"/items/{i % 100}".encode(),
+            "query_string": b"", "root_path": "", "headers": [], "server": ("bench", 80), "client": ("bench", 1),
+        }
+
+    for i in range(min(requests, 1000)):  # warm up
+        await app(scope(i), receive, send)
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(scope(i), receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+def run_timed(calls: int) -> float:
+    """Return seconds per metrics.timed() block."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        with metrics.timed("triple_store", "query"):
+            pass
+    return (time.perf_counter() - start) / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    bare = asyncio.run(_drive(_app(False), args.requests))
+    instrumented = asyncio.run(_drive(_app(True), args.requests))
+    print(f"{args.requests} in-process requests per mode")
+    print(f"{'mode':<14} {'µs/request':>12} {'requests/s':>12}")
+    for name, per in [("bare", bare), ("instrumented", instrumented)]:
+        print(f"{name:<14} {per * 1e6:>12.1f} {1 / per:>12.0f}")
+    print(f"middleware overhead: {(instrumented - bare) * 1e6:.1f} µs/request "
+          f"({(instrumented - bare) / bare:.1%} of the bare in-process request)")
+    print(f"metrics.timed():     {run_timed(args.requests * 5) * 1e6:.2f} µs/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Concurrency benchmark for connections.get_peer_public_key.
+
+Fills a throwaway database with --peers connections (a quarter of them active)
+and calls get_peer_public_key from N threads at once, optionally while one
+writer thread keeps updating rows (as accept/reject/delete do):
+  open per call — sqlite3.connect + close on every call, rollback journal (the
+                  behaviour before services/sqlite_pool.py)
+  pooled WAL    — services/sqlite_pool.py
+
+Usage (from api/):
+    python -m benchmarks.bench_sqlite [--seconds 2] [--peers 200]
+"""
+import argparse
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from unittest.mock import patch
+
+from config import settings
+from services import connections, sqlite_pool
+
+
+@contextmanager
+def _open_per_call():
+    db = sqlite3.connect(settings.db_path)
+    db.row_factory = sqlite3.Row
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _fill(peers: int) -> None:
+    with connections._conn() as db:
+        db.executescript(connections._DB_SCHEMA)
+        now = connections._now()
+        db.executemany(
+            "INSERT INTO connections VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (f"conn-{i}", f"node-{i}", f"Node {i}", f"http://node-{i}:8000", "-----BEGIN PUBLIC KEY-----",
+                 "active" if i % 4 == 0 else "rejected", "them", now, now)
+                for i in range(peers)
+            ],
+        )
+        db.commit()
+
+
+def _writer(stop: threading.Event) -> None:
+    while not stop.is_set():
+        with connections._conn() as db:
+            db.execute("UPDATE connections SET updated_at = ? WHERE peer_node_id = ?", (connections._now(), "node-1"))
+            db.commit()
+        time.sleep(0.001)
+
+
+def run(threads: int, seconds: float, peers: int, with_writer: bool) -> float:
+    """Return get_peer_public_key calls per second across all reader threads."""
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def reader(n: int) -> None:
+        i = n
+        while not stop.is_set():
+            connections.get_peer_public_key(f"node-{i % peers}")
+            counts[n] += 1
+            i += 1
+        sqlite_pool.close()
+
+    workers = [threading.Thread(target=reader, args=(n,)) for n in range(threads)]
+    if with_writer:
+        workers.append(threading.Thread(target=_writer, args=(stop,)))
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    time.sleep(seconds)
+    stop.set()
+    for w in workers:
+        w.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--peers", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.peers} connections, {args.seconds:g} s per run")
+    print(f"{'mode':<14} {'threads':>8} {'writer':>7} {'calls/s':>10}")
+    for name, conn in [("open per call", _open_per_call), ("pooled WAL", sqlite_pool.connect)]:
+        with (
+            tempfile.TemporaryDirectory() as tmp,
+            patch.object(settings, "db_path", str(Path(tmp) / "hilo.db")),
+            patch.object(connections, "_conn", conn),
+        ):
+            _fill(args.peers)
+            for threads in (1, 4, 16):
+                for with_writer in (False, True):
+                    rate = run(threads, args.seconds, args.peers, with_writer)
+                    print(f"{name:<14} {threads:>8} {'yes' if with_writer else 'no':>7} {rate:>10.0f}")
+            sqlite_pool.close()
+
+
+if __name__ == "__main__":
+    main()
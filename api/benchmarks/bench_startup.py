@@ -0,0 +1,123 @@
+"""Startup time of the API, checked against a budget.
+
+Starts `uvicorn main:app` in a subprocess and measures the time from spawning it
+to the first 200 from GET /health:
+  first boot — empty data directory, so the lifespan generates the node keys
+  restart    — keys and SQLite file already present (median of --runs)
+Also measures `import main` alone in a fresh interpreter (median of --runs),
+and lists which heavy dependencies that import pulled in; they are meant to load
+on first use instead.
+
+The server gets a throwaway data directory, Sentry is disabled (HILO_SENTRY_DSN=""),
+and GraphDB / RabbitMQ point at a closed port, so the dependency probes fail at
+once rather than waiting on timeouts.
+
+Exits with status 1 if the restart time exceeds --budget seconds (default
+HILO_STARTUP_BUDGET_SECONDS, else 3), so it can gate CI.
+
+Usage (from api/):
+    python -m benchmarks.bench_startup [--runs 5] [--budget 3]
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+HEAVY_MODULES = ("anthropic", "pika", "sentry_sdk")
+
+_IMPORT_PROBE = f"""
+import sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _env(data_dir: str) -> dict:
+    closed = f"127.0.0.1:{_free_port()}"
+    return {
+        **os.environ,
+        "HILO_SENTRY_DSN": "",
+        "HILO_PRIVATE_KEY_PATH": str(Path(data_dir) / "node.key"),
+        "HILO_DB_PATH": str(Path(data_dir) / "hilo.db"),
+        "HILO_PAYLOAD_CACHE_DIR": str(Path(data_dir) / "payload-cache"),
+        "HILO_GRAPHDB_URL": f"http://{closed}",
+        "HILO_RABBITMQ_URL": f"amqp://hilo:hilo@{closed}/",
+        "HILO_RABBITMQ_MANAGEMENT_URL": f"http://{closed}",
+    }
+
+
+def time_to_first_health(data_dir: str, timeout: float = 60.0) -> float:
+    """Seconds from spawning uvicorn to the first 200 on GET /health."""
+    port = _free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=_env(data_dir),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with status {proc.returncode}")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=5).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.TransportError:
+                pass
+            time.sleep(0.01)
+        raise TimeoutError(f"no /health response within {timeout:g} s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def time_import(data_dir: str) -> tuple[float, list[str]]:
+    """(seconds to `import main` in a fresh interpreter, heavy modules it loaded)."""
+    out = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE], env=_env(data_dir), capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return float(out[0]), out[1].split(",") if len(out) > 1 else []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=float(os.environ.get("HILO_STARTUP_BUDGET_SECONDS", 3.0)))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        first_boot = time_to_first_health(data_dir)
+        restarts = [time_to_first_health(data_dir) for _ in range(args.runs)]
+        imports = [time_import(data_dir) for _ in range(args.runs)]
+
+    restart = statistics.median(restarts)
+    heavy = sorted({m for _, loaded in imports for m in loaded})
+    print(f"{'phase':<24} {'seconds':>8}")
+    print(f"{'import main':<24} {statistics.median(t for t, _ in imports):>8.3f}")
+    print(f"{'first boot → /health':<24} {first_boot:>8.3f}")
+    print(f"{'restart → /health':<24} {restart:>8.3f}")
+    print(f"heavy modules loaded at import: {', '.join(heavy) or 'none'}")
+    if restart > args.budget:
+        print(f"FAIL: restart {restart:.3f} s exceeds the {args.budget:g} s budget")
+        sys.exit(1)
+    print(f"OK: within the {args.budget:g} s budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Throughput scaling and memory per worker with several API worker processes.
+
+For each worker count (default 1, 2, 4, 8) starts `uvicorn main:app --workers N`
+with HILO_WORKERS=N, drives GET --path from --clients client processes for
+--seconds, and reports requests per second and the resident memory (VmRSS) of
+each worker process after the run.
+
+The server gets a throwaway data directory, Sentry is disabled, and GraphDB /
+RabbitMQ point at a closed port (see bench_startup.py). The default path,
+/.well-known/hilo-node, reads the node keys and builds the identity document on
+every request without touching the triple store. Scaling flattens out at the
+machine's core count (os.cpu_count() is printed), and the client processes share
+those cores with the server.
+
+Usage (from api/):
+    python -m benchmarks.bench_workers [--workers 1 2 4 8] [--seconds 5] [--clients 8]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import httpx
+
+from benchmarks.bench_startup import _env, _free_port
+
+
+def _worker_pids(pid: int) -> list[int]:
+    """Worker processes of a uvicorn supervisor (its spawned children, not the resource tracker)."""
+    try:
+        children = [int(p) for p in Path(f"/proc/{pid}/task/{pid}/children").read_text().split()]
+        return [c for c in children if b"spawn_main" in Path(f"/proc/{c}/cmdline").read_bytes()]
+    except OSError:
+        return []
+
+
+def _rss_mb(pid: int) -> float:
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _client(url: str, seconds: float) -> int:
+    """Requests completed by one client process."""
+    done = 0
+    deadline = time.perf_counter() + seconds
+    with httpx.Client(timeout=10) as client:
+        while time.perf_counter() < deadline:
+            if client.get(url).status_code == 200:
+                done += 1
+    return done
+
+
+def _wait_ready(proc: subprocess.Popen, port: int, workers: int, timeout: float = 60.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {proc.returncode}")
+        try:
+            ready = httpx.get(f"http://127.0.0.1:{port}/health/live", timeout=2).status_code == 200
+        except httpx.TransportError:
+            ready = False
+        # With --workers > 1 uvicorn runs a supervisor whose children serve requests
+        if ready and (workers == 1 or len(_worker_pids(proc.pid)) >= workers):
+            time.sleep(1.0)  # let every worker finish its lifespan
+            return
+        time.sleep(0.05)
+    raise TimeoutError(f"{workers} worker(s) not ready within {timeout:g} s")
+
+
+def run(workers: int, path: str, seconds: float, clients: int) -> tuple[float, list[float]]:
+    """(requests/s, RSS in MB of each worker process)."""
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = {**_env(data_dir), "HILO_WORKERS": str(workers)}
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+             "--workers", str(workers), "--log-level", "warning"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_ready(proc, port, workers)
+            url = f"http://127.0.0.1:{port}{path}"
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=clients) as pool:
+                done = sum(pool.map(_client, [url] * clients, [seconds] * clients))
+            rate = done / (time.perf_counter() - start)
+            pids = _worker_pids(proc.pid) if workers > 1 else [proc.pid]
+            return rate, [_rss_mb(pid) for pid in pids]
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--path", default="/.well-known/hilo-node")
+    args = parser.parse_args()
+
+    print(f"GET {args.path}, {args.clients} client processes, {args.seconds:g} s per run, {os.cpu_count()} CPU(s)")
+    print(f"{'workers':>8} {'requests/s':>12} {'speedup':>8} {'RSS/worker MB':>14} {'RSS total MB':>13}")
+    baseline = None
+    for workers in args.workers:
+        rate, rss = run(workers, args.path, args.seconds, args.clients)
+        baseline = baseline or rate
+        per_worker = sum(rss) / len(rss) if rss else 0.0
+        print(f"{workers:>8} {rate:>12.0f} {rate / baseline:>7.2f}x {per_worker:>14.1f} {sum(rss):>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,15 +9,52 @@ class Settings(BaseSettings):
     rabbitmq_management_url: str = "http://localhost:15672"
     rabbitmq_management_user: str = "hilo"
     rabbitmq_management_pass: str = "hilo"
+    consumer_status_url: str = "http://consumer:9100"  # queue consumer's status server
+    health_probe_interval: float = 10.0  # seconds between background dependency probes
+    queue_stats_interval: float = 5.0  # seconds between background queue-stats samples
+    queue_stats_history_size: int = 720  # samples kept for /queue/stats/history (1 h at 5 s)
     node_id: str = "node-a"
     node_name: str = "HILO Node"
     node_base_url: str = "http://localhost:8000"
-    private_key_path: str = "/data/node.key"
+    private_key_path: str = "/data/node.key"  # RSA key; the Ed25519 key is at <path>.ed25519
+    jwt_algorithms: list[str] = ["EdDSA", "RS256"]  # offered to peers; JSON list in HILO_JWT_ALGORITHMS
     db_path: str = "/data/hilo.db"
+    sqlite_busy_timeout_ms: int = 5000  # how long a writer waits for the SQLite write lock
+    sqlite_cached_statements: int = 256  # prepared statements kept per pooled connection
+    dedup_retention_days: int = 30  # received notification ids kept for duplicate detection
+    dedup_max_rows: int = 1_000_000  # ...and at most this many (oldest pruned first)
+    peer_task_max_attempts: int = 5  # acceptance callbacks / disconnect notices to peers
+    peer_task_backoff_seconds: float = 2.0  # doubles per attempt
+    peer_task_backoff_max_seconds: float = 300.0
+    peer_task_poll_seconds: float = 30.0  # worker wakes at least this often
+    peer_timeout_default_seconds: float = 10.0  # per-peer timeout before any RTT has been measured
+    peer_timeout_min_seconds: float = 2.0
+    peer_timeout_max_seconds: float = 30.0
+    peer_rtt_history_size: int = 100  # calls kept per peer for GET /connections/{peer}/rtt
+    peer_probe_interval: float = 60.0  # probe peers idle for this long (seconds)
     jwt_expiry_minutes: int = 5
     jwt_audience: str = ""  # defaults to node_id at runtime if empty
+    jwt_reuse_margin_seconds: int = 60  # issued tokens are reused until this close to exp
+    jwt_verified_cache_size: int = 10000  # verified peer tokens cached until exp
+    event_etag_cache_size: int = 50000  # event ETags kept for 304s (least recently used evicted)
     internal_key: str = "dev"
     anthropic_api_key: str = ""
+    graph_summary_interval: float = 600.0  # seconds between refreshes of the graph summary in Ask AI prompts
+    graph_summary_size: int = 20  # classes and predicates listed in the summary
+    translation_cache_ttl_seconds: int = 604800  # cached Ask AI translations expire after this (7 days)
+    sentry_dsn: str = "https://7c8ba4f75ecc2bb6f89a4060a2447b96@o4511019058331648.ingest.de.sentry.io/4511019060822096"  # "" disables Sentry
+    payload_cache_dir: str = "/data/payload-cache"  # prefetched peer event payloads
+    payload_cache_max_mb: int = 256
+    prefetch_concurrency: int = 4  # parallel background fetches from peers
+    prefetch_max_pending: int = 500  # queued fetches beyond this are skipped
+    import_concurrency: int = 4  # parallel peer fetches in a bulk import-from-source
+    live_heartbeat_seconds: float = 15.0
+    live_max_backlog: int = 256  # messages buffered per stream before it is dropped
+    live_retry_ms: int = 3000  # EventSource reconnect delay sent to browsers
+    workers: int = 1  # API worker processes (uvicorn --workers); >1 turns on cross-process invalidation and the /live relay
+    live_relay_poll_seconds: float = 0.25  # with workers > 1: how often each worker picks up other workers' /live messages
+    leader_retry_seconds: float = 5.0  # with workers > 1: how often a worker not running the pollers retries their lock
+    key_lock_timeout_seconds: float = 60.0  # how long a worker waits for another to finish generating the node keys
 
     model_config = SettingsConfigDict(env_prefix="HILO_")
 
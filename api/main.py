@@ -1,36 +1,80 @@
 import sys
 from contextlib import asynccontextmanager
 
-import sentry_sdk
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from config import settings
+from metrics import MetricsMiddleware
 
 _testing = "pytest" in sys.modules
 
-sentry_sdk.init(
-    dsn="" if _testing else "https://7c8ba4f75ecc2bb6f89a4060a2447b96@o4511019058331648.ingest.de.sentry.io/4511019060822096",
-    send_default_pii=True,
-    enable_logs=True,
-    traces_sample_rate=1.0,
-    profile_session_sample_rate=1.0,
-    profile_lifecycle="trace",
-)
-sentry_sdk.set_tag("node_id", settings.node_id)
+# Sentry is off under pytest or with HILO_SENTRY_DSN="", and the SDK is then not even
+# imported. Its integrations are listed explicitly: auto-enabling would import every
+# supported library that is installed, including the anthropic SDK (~1 s), which
+# services/llm.py loads lazily.
+if settings.sentry_dsn and not _testing:
+    import sentry_sdk
+    from sentry_sdk.integrations.fastapi import FastApiIntegration
+    from sentry_sdk.integrations.httpx import HttpxIntegration
+    from sentry_sdk.integrations.starlette import StarletteIntegration
+
+    sentry_sdk.init(
+        dsn=settings.sentry_dsn,
+        send_default_pii=True,
+        enable_logs=True,
+        traces_sample_rate=1.0,
+        profile_session_sample_rate=1.0,
+        profile_lifecycle="trace",
+        auto_enabling_integrations=False,
+        integrations=[StarletteIntegration(), FastApiIntegration(), HttpxIntegration()],
+    )
+    sentry_sdk.set_tag("node_id", settings.node_id)
 
-from routes import bridge, connections, data, events, health, queue_stats, well_known
+from routes import bridge, connections, data, events, health, live, metrics, prefetch, queue_stats, well_known
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Generate RSA key pair on first boot (no-op if key already exists)
+    # Generate RSA (and Ed25519) key pairs on first boot (no-op if the keys already exist)
     from startup import ensure_key_pair
     ensure_key_pair()
     # Initialise SQLite connections table
     from services.connections import init_db
     init_db()
+    # Periodic pollers run in one worker process only (services/leader.py)
+    from services import leader
+    leader.start(_start_pollers)
+    # Deliver acceptance callbacks and disconnect notices to peers in the background
+    from services import peer_tasks
+    peer_tasks.start()
+    # With several worker processes, pass /live messages between them
+    from services import live
+    live.start()
     yield
+    from services import graph_summary, health_probes, peer_rtt, queue_sampler
+    queue_sampler.stop()
+    health_probes.stop()
+    peer_tasks.stop()
+    peer_rtt.stop()
+    live.stop()
+    graph_summary.stop()
+    leader.stop()
+
+
+def _start_pollers() -> None:
+    # Sample queue stats in the background; /queue/stats serves the latest sample
+    from services import queue_sampler
+    queue_sampler.start()
+    # Probe GraphDB and RabbitMQ in the background; /health* serve cached results
+    from services import health_probes
+    health_probes.start()
+    # Probe idle peers for round-trip times; per-peer timeouts are derived from them
+    from services import peer_rtt
+    peer_rtt.start()
+    # Keep a summary of the graph's classes and predicates for Ask AI prompts
+    from services import graph_summary
+    graph_summary.start()
 
 
 app = FastAPI(
@@ -49,6 +93,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so request latency includes CORS handling
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(health.router)
 app.include_router(events.router)
@@ -56,4 +102,7 @@ app.include_router(data.router)
 app.include_router(queue_stats.router)
 app.include_router(connections.router)
 app.include_router(bridge.router)
+app.include_router(prefetch.router)
+app.include_router(live.router)
 app.include_router(well_known.router)
+app.include_router(metrics.router)
@@ -0,0 +1,122 @@
+"""Prometheus metrics for the API.
+
+Served as GET /metrics (routes/metrics.py). Two families:
+  hilo_api_request_seconds    — one observation per HTTP request, labelled by method,
+                                route template (/events/{event_id}, not the raw path)
+                                and status; its _count series is the request count
+  hilo_api_dependency_seconds — calls to the triple store, RabbitMQ and JWT
+                                verification, labelled by dependency and operation
+                                (see timed())
+
+Label cardinality stays bounded: requests that match no route are recorded under
+route="<unmatched>" rather than their path.
+
+With several worker processes (HILO_WORKERS > 1) each worker only sees its own
+observations, and a scrape lands on one of them. The Dockerfile then sets
+PROMETHEUS_MULTIPROC_DIR (emptied before the workers start): prometheus_client
+writes every worker's values there, and render() adds them up across workers.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    "hilo_api_request_seconds",
+    "HTTP request handling time, from the first byte received to the last byte sent",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DEPENDENCY_LATENCY = Histogram(
+    "hilo_api_dependency_seconds",
+    "Duration of one call to a backing service",
+    ["dependency", "operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+DEPENDENCY_ERRORS = Counter(
+    "hilo_api_dependency_errors_total",
+    "Calls to a backing service that raised",
+    ["dependency", "operation"],
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# (metric, label values) → child. Histogram.labels() validates and locks on every
+# call; a plain dict lookup is a third of the cost of the whole observation.
+_children: dict[tuple, object] = {}
+
+
+def _child(metric, *labels: str):
+    key = (metric, labels)
+    child = _children.get(key)
+    if child is None:
+        child = _children[key] = metric.labels(*labels)
+    return child
+
+
+@contextmanager
+def timed(dependency: str, operation: str) -> Iterator[None]:
+    """Observe the duration of the block; count it as an error if it raises.
+
+    dependency is "triple_store", "amqp" or "jwt".
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        _child(DEPENDENCY_ERRORS, dependency, operation).inc()
+        raise
+    finally:
+        _child(DEPENDENCY_LATENCY, dependency, operation).observe(time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording hilo_api_request_seconds for every HTTP request.
+
+    The route template is read from scope["route"], which the router fills in when
+    a route matches, so no path matching is repeated here. Streaming responses
+    (GET /live) are timed until the stream ends.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            _child(
+                REQUEST_LATENCY, scope["method"], getattr(route, "path", UNMATCHED_ROUTE), str(status),
+            ).observe(time.perf_counter() - started)
+
+
+def render() -> tuple[bytes, str]:
+    """Return (body, content_type) for a scrape, summed over all workers in multiprocess mode."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,57 @@
+"""
+One-time migration of peer data stored before per-peer named graphs existed.
+
+Notifications received (and triples imported) before peer data was partitioned
+sit in the default graph, where POST /connections/{peer}/purge and the
+source_node-scoped event queries cannot see them. This moves each such
+notification, and the triples imported for it, into the source node's graph
+http://hilo.semantics.io/graphs/peer/{node_id}. Safe to re-run: events already in
+a named graph are not selected again.
+
+Imported triples are matched by the event's stored payload; if local data holds
+an identical triple, that copy moves to the peer's graph too.
+
+Run inside the API container:
+    docker-compose exec api python migrate_peer_graphs.py --dry-run
+    docker-compose exec api python migrate_peer_graphs.py
+"""
+import argparse
+import sys
+from collections import Counter
+
+from services import graphdb
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Move pre-partitioning peer data into per-peer named graphs.")
+    parser.add_argument("--source-node", help="only migrate events from this peer")
+    parser.add_argument("--dry-run", action="store_true", help="report what would be moved; change nothing")
+    args = parser.parse_args(argv)
+
+    events = graphdb.legacy_peer_events()
+    if args.source_node:
+        events = [e for e in events if e["source_node"] == args.source_node]
+    per_source = Counter(e["source_node"] for e in events)
+    imported = Counter(e["source_node"] for e in events if e["payload"])
+    for source_node, count in sorted(per_source.items()):
+        print(f"{source_node}: {count} notification(s), {imported[source_node]} with imported triples")
+    if not events:
+        print("Nothing to migrate")
+        return 0
+    if args.dry_run:
+        return 0
+
+    failed = 0
+    for i, event in enumerate(events, 1):
+        try:
+            graphdb.move_legacy_event(event["meta"], event["source_node"], event["payload"])
+        except Exception as exc:
+            failed += 1
+            print(f"\nCould not move {event['meta']}: {exc}", file=sys.stderr)
+        print(f"\rmoved {i - failed}/{len(events)}  failed {failed}", end="", flush=True)
+    print()
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,8 @@ class ConnectionRequest(BaseModel):
     name: str
     base_url: str
     public_key: str  # PEM-encoded RSA public key
+    algorithms: list[str] = ["RS256"]  # JWT algorithms the requester supports (absent before version 3)
+    public_keys: dict[str, str] = {}  # algorithm → PEM public key
 
 
 class AcceptedCallback(BaseModel):
@@ -53,7 +55,24 @@ class NodeIdentity(BaseModel):
     name: str
     base_url: str
     public_key: str  # PEM-encoded RSA public key
-    version: str = "2"
+    algorithms: list[str] = ["RS256"]  # JWT algorithms this node accepts, in preference order
+    public_keys: dict[str, str] = {}  # algorithm → PEM public key
+    version: str = "3"
+
+
+class PeerTask(BaseModel):
+    """Returned by GET /connections/tasks — an outbound lifecycle call to a peer."""
+    id: int
+    kind: str  # "acceptance_callback" | "disconnect_notice"
+    peer_node_id: str
+    url: str
+    status: str  # "pending" | "running" | "done" | "failed" | "cancelled"
+    attempts: int
+    max_attempts: int
+    next_run_at: datetime
+    last_error: Optional[str]
+    created_at: datetime
+    updated_at: datetime
 
 
 class TokenResponse(BaseModel):
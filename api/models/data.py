@@ -7,3 +7,10 @@ class DataQuery(BaseModel):
 
 class DataInsert(BaseModel):
     triples: str  # Turtle-formatted RDF string
+
+
+class TranslationCacheStats(BaseModel):
+    entries: int
+    hits: int
+    misses: int
+    hit_rate: float  # hits / (hits + misses)
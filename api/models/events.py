@@ -28,6 +28,11 @@ class EventImportRequest(BaseModel):
     triples: str
 
 
+class EventBulkImportRequest(BaseModel):
+    """Body for POST /events/import-from-source — peer events to fetch and import server-side."""
+    event_ids: list[str] = Field(min_length=1, max_length=500)
+
+
 class EventNotification(BaseModel):
     """Lightweight notification that travels through the queue to peers.
     Contains no RDF triples — peers fetch full data via data_url with a JWT."""
@@ -38,3 +43,8 @@ class EventNotification(BaseModel):
     created_at: datetime
     data_url: str  # "{HILO_NODE_BASE_URL}/events/{event_id}"
     receiver: str  # routing: "all" or peer_node_id; no default — explicit error if missing
+
+
+class NotificationBatch(BaseModel):
+    """Body for POST /bridge/receive/batch — several notifications from one source node."""
+    notifications: list[EventNotification] = Field(min_length=1, max_length=500)
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, model_validator
+
+
+class PrefetchRuleCreate(BaseModel):
+    """Body for POST /prefetch/rules. A rule matches a notification when every field it sets matches."""
+    event_type: Optional[str] = None
+    source_node: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _at_least_one_field(self):
+        if not self.event_type and not self.source_node:
+            raise ValueError("a rule needs event_type, source_node, or both")
+        return self
+
+
+class PrefetchRule(PrefetchRuleCreate):
+    id: int
+    created_at: datetime
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class ReplayRequest(BaseModel):
+    """Body for POST /queue/dead-letters/replay. All filters are optional and combine with AND."""
+    event_type: Optional[str] = None
+    receiver: Optional[str] = None  # notification receiver, or the peer a delivery message was bound for
+    min_age_seconds: Optional[float] = Field(default=None, ge=0)  # dead-lettered at least this long ago
+    max_age_seconds: Optional[float] = Field(default=None, ge=0)  # dead-lettered at most this long ago
+    limit: Optional[int] = Field(default=None, ge=1)  # stop after this many matches
+    rate_per_second: float = Field(default=10.0, gt=0, le=1000)
+    dry_run: bool = False
+
+
+class ReplayReport(BaseModel):
+    """Progress and outcome of a dead-letter replay. Updated in place while the job runs."""
+    job_id: str
+    status: str = "running"  # running | completed | failed
+    dry_run: bool
+    scanned: int = 0
+    matched: int = 0
+    replayed: int = 0
+    failed: int = 0
+    queue_depth: Optional[int] = None  # DLQ depth when the job started
+    matched_event_ids: list[str] = Field(default_factory=list)  # first 100 matches
+    error: Optional[str] = None
+    started_at: datetime
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,56 @@
+"""
+CLI for replaying the dead-letter queue — the command-line twin of
+POST /queue/dead-letters/replay.
+
+Run inside the API container:
+    docker-compose exec api python replay_dead_letters.py --receiver node-b --rate 5
+    docker-compose exec api python replay_dead_letters.py --event-type order_created --dry-run
+"""
+import argparse
+import sys
+
+from models.queue import ReplayReport, ReplayRequest
+from services import dead_letters
+
+
+def _print_progress(report: ReplayReport) -> None:
+    depth = report.queue_depth if report.queue_depth is not None else "?"
+    print(
+        f"\r[{report.status}] scanned {report.scanned}/{depth}  matched {report.matched}  "
+        f"replayed {report.replayed}  failed {report.failed}",
+        end="",
+        flush=True,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay messages from hilo.events.dead back onto hilo.events.")
+    parser.add_argument("--event-type", help="only replay this event_type")
+    parser.add_argument("--receiver", help="only replay messages for this receiver / peer_node_id")
+    parser.add_argument("--min-age", type=float, help="only messages dead-lettered at least this many seconds ago")
+    parser.add_argument("--max-age", type=float, help="only messages dead-lettered at most this many seconds ago")
+    parser.add_argument("--limit", type=int, help="stop after this many matching messages")
+    parser.add_argument("--rate", type=float, default=10.0, help="messages per second (default 10)")
+    parser.add_argument("--dry-run", action="store_true", help="report what would be replayed; change nothing")
+    args = parser.parse_args(argv)
+
+    req = ReplayRequest(
+        event_type=args.event_type,
+        receiver=args.receiver,
+        min_age_seconds=args.min_age,
+        max_age_seconds=args.max_age,
+        limit=args.limit,
+        rate_per_second=args.rate,
+        dry_run=args.dry_run,
+    )
+    report = dead_letters.replay(req, progress=_print_progress)
+    print()
+    if report.dry_run and report.matched_event_ids:
+        print("Would replay:", ", ".join(report.matched_event_ids))
+    if report.error:
+        print(f"Error: {report.error}", file=sys.stderr)
+    return 0 if report.status == "completed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
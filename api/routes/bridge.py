@@ -1,5 +1,12 @@
 """
-POST /bridge/receive — accept forwarded event notifications from peer nodes.
+POST /bridge/receive       — accept forwarded event notifications from peer nodes.
+POST /bridge/receive/batch — same, for a micro-batch of notifications in one request.
+GET  /bridge/stats         — received / duplicate notification counters.
+
+Notifications whose event_id was already stored are answered with status
+"duplicate" without touching the triple store (services/notification_dedup.py).
+Newly stored notifications matching a prefetch rule have their payload fetched
+in the background (services/prefetch.py).
 
 Intentionally unauthenticated: notifications carry no sensitive data (no triples).
 A forged notification results in a 404 or 401 when the peer tries to fetch data.
@@ -9,14 +16,28 @@ import logging
 
 from fastapi import APIRouter
 
-from models.events import EventNotification
-from services import graphdb
+from models.events import EventNotification, EventResponse, NotificationBatch
+from services import event_etags, graphdb, live, notification_dedup, prefetch
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/bridge", tags=["bridge"])
 
 
+def _announce(notification: EventNotification) -> None:
+    """Push the new notification to open GET /live streams, shaped like a GET /events item."""
+    event = EventResponse(
+        id=notification.event_id,
+        source_node=notification.source_node,
+        event_type=notification.event_type,
+        subject=notification.subject,
+        triples="",
+        created_at=notification.created_at,
+        links={"self": f"/events/{notification.event_id}"},
+    )
+    live.publish("event", event.model_dump(mode="json"))
+
+
 @router.post("/receive", status_code=200)
 def receive_notification(notification: EventNotification) -> dict:
     """Store incoming event notification from a peer node.
@@ -24,10 +45,90 @@ def receive_notification(notification: EventNotification) -> dict:
     Does NOT re-forward — avoids propagation loops.
     Full event data is fetched lazily on demand via notification.data_url.
     """
+    if notification_dedup.is_duplicate(notification.event_id):
+        logger.debug("Bridge: duplicate notification for event %s ignored", notification.event_id)
+        return {"status": "duplicate", "event_id": notification.event_id}
+
     graphdb.store_notification(notification)
+    notification_dedup.mark_stored(notification.event_id, notification.source_node)
+    event_etags.events_changed()
+    _announce(notification)
+    prefetch.schedule(notification)
     logger.info(
         "Bridge: received notification for event %s from %s",
         notification.event_id,
         notification.source_node,
     )
     return {"status": "received", "event_id": notification.event_id}
+
+
+@router.post("/receive/batch", status_code=200)
+def receive_notification_batch(batch: NotificationBatch) -> dict:
+    """Store a batch of notifications from a peer node in one triple-store update.
+
+    Returns one status per notification, in request order: "received",
+    "duplicate" (already stored — not written again) or "error". If the single
+    update fails, each notification is retried on its own so the sender only has
+    to resend the ones reported as "error". Once one fails, later notifications
+    about the same subject are reported as "error" without being stored, so they
+    cannot overtake it.
+    """
+    notifications = batch.notifications
+    statuses: dict[int, dict] = {}
+    fresh = []
+    for i, n in enumerate(notifications):
+        if notification_dedup.is_duplicate(n.event_id):
+            statuses[i] = {"event_id": n.event_id, "status": "duplicate"}
+        else:
+            fresh.append((i, n))
+
+    try:
+        graphdb.store_notifications([n for _, n in fresh])
+        for i, n in fresh:
+            notification_dedup.mark_stored(n.event_id, n.source_node)
+            statuses[i] = {"event_id": n.event_id, "status": "received"}
+    except Exception as exc:
+        logger.warning("Bridge: batch store of %d notifications failed (%s) — storing individually", len(fresh), exc)
+        failed_subjects = set()
+        for i, n in fresh:
+            if n.subject in failed_subjects:
+                # Storing it would put it ahead of the earlier one the sender will resend
+                statuses[i] = {
+                    "event_id": n.event_id,
+                    "status": "error",
+                    "error": "an earlier notification for this subject failed",
+                }
+                continue
+            try:
+                graphdb.store_notification(n)
+                notification_dedup.mark_stored(n.event_id, n.source_node)
+                statuses[i] = {"event_id": n.event_id, "status": "received"}
+            except Exception as item_exc:
+                logger.error("Bridge: could not store notification %s: %s", n.event_id, item_exc)
+                failed_subjects.add(n.subject)
+                statuses[i] = {"event_id": n.event_id, "status": "error", "error": str(item_exc)}
+
+    if any(statuses[i]["status"] == "received" for i, _ in fresh):
+        event_etags.events_changed()
+    for i, n in fresh:
+        if statuses[i]["status"] == "received":
+            _announce(n)
+            prefetch.schedule(n)
+
+    results = [statuses[i] for i in range(len(notifications))]
+    stored = sum(1 for r in results if r["status"] == "received")
+    failed = sum(1 for r in results if r["status"] == "error")
+    logger.info(
+        "Bridge: received batch of %d notifications from %s (%d stored, %d duplicate)",
+        len(notifications),
+        notifications[0].source_node,
+        stored,
+        len(notifications) - len(fresh),
+    )
+    return {"status": "partial" if failed else "received", "results": results}
+
+
+@router.get("/stats")
+def bridge_stats() -> dict:
+    """Notification counters since startup, including the duplicate rate."""
+    return notification_dedup.get_stats()
@@ -4,26 +4,44 @@ Connection management endpoints.
 POST /connections/request          — Node B calls on Node A to initiate
 POST /connections/outgoing         — Record an outgoing request we sent to a peer
 GET  /connections                  — List all connections (local, no auth)
-GET  /connections/{peer}/token     — Get fresh RS256 JWT for peer
+GET  /connections/{peer}/token     — Get a JWT for peer (RS256 or EdDSA, per connection)
 POST /connections/{id}/accept      — Operator accepts incoming request
 POST /connections/{id}/reject      — Operator rejects incoming request
 POST /connections/accepted         — Callback from accepting node
 POST /connections/{id}/resend      — Retry acceptance callback (accept_pending)
+POST /connections/{peer}/disconnect — Remove a connection (?purge=true also drops the peer's data; local UI only)
+POST /connections/{peer}/purge     — Drop a peer's data, with or without a connection (local UI only)
+GET  /connections/{peer}/rtt       — Measured round trips / errors to a peer and the derived timeout
+GET  /connections/tasks            — Outbound calls to peers (acceptance callbacks, disconnect notices)
+GET  /connections/tasks/{id}       — One such task
 """
 import logging
 
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
-from config import settings
 from models.connections import (
     AcceptedCallback,
     ConnectionRequest,
     ConnectionResponse,
     OutgoingConnectionRequest,
+    PeerTask,
     TokenResponse,
 )
-from services import connections as conn_svc
-from services.jwt_service import sign_token
+from services import (
+    connections as conn_svc,
+    consumer_status,
+    event_etags,
+    graphdb,
+    live,
+    notification_dedup,
+    payload_cache,
+    peer_rtt,
+    peer_tasks,
+)
+from services.jwt_service import require_jwt, select_peer_key, sign_token
 
 logger = logging.getLogger(__name__)
 
@@ -37,13 +55,20 @@ def request_connection(body: ConnectionRequest):
     if existing:
         raise HTTPException(status_code=409, detail="Connection request already exists")
 
+    selected = select_peer_key(body.algorithms, body.public_keys, body.public_key)
+    if selected is None:
+        raise HTTPException(
+            status_code=400, detail=f"No common signing algorithm (peer offers {', '.join(body.algorithms)})"
+        )
+    algorithm, peer_public_key = selected
+
     connection = conn_svc.create_incoming_request(
         peer_node_id=body.node_id,
         peer_name=body.name,
         peer_base_url=body.base_url,
-        peer_public_key=body.public_key,
+        peer_public_key=peer_public_key,
     )
-    logger.info("Incoming connection request from %s (%s)", body.node_id, body.base_url)
+    logger.info("Incoming connection request from %s (%s, %s)", body.node_id, body.base_url, algorithm)
     return connection
 
 
@@ -73,9 +98,45 @@ def list_connections():
     return conn_svc.list_connections()
 
 
+@router.get("/tasks", response_model=list[PeerTask])
+def list_tasks(
+    status: Optional[str] = Query(default=None, description="pending | running | done | failed | cancelled"),
+    peer: Optional[str] = Query(default=None, description="Only tasks for this peer_node_id"),
+    limit: int = Query(default=100, ge=1, le=1000),
+):
+    """Outbound lifecycle calls to peers, most recent first."""
+    return peer_tasks.list_tasks(status=status, peer_node_id=peer, limit=limit)
+
+
+@router.get("/tasks/{task_id}", response_model=PeerTask)
+def get_task(task_id: int):
+    task = peer_tasks.get_task(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+@router.get("/{peer_node_id}/rtt")
+def get_peer_rtt(peer_node_id: str, limit: int = Query(default=50, ge=1, le=1000)):
+    """Measured round trips and errors to a peer, and the timeout currently derived from them.
+
+    api — this API's calls (payload fetches, lifecycle tasks, probes)
+    consumer — the queue consumer's notification forwards, or null if its status server is unreachable
+    """
+    peer = conn_svc.get_connection_by_peer(peer_node_id)
+    if not peer:
+        raise HTTPException(status_code=404, detail="Connection not found")
+    consumer_links = consumer_status.get_peer_rtt() or []
+    return {
+        "peer_node_id": peer_node_id,
+        "api": peer_rtt.snapshot(peer_node_id, limit),
+        "consumer": next((c for c in consumer_links if c.get("peer_base_url") == peer.peer_base_url), None),
+    }
+
+
 @router.get("/{peer_node_id}/token", response_model=TokenResponse)
 def get_token(peer_node_id: str):
-    """Generate a fresh RS256 JWT signed with this node's private key for the named peer."""
+    """A JWT signed with this node's private key for the named peer, in the connection's algorithm."""
     peer = conn_svc.get_connection_by_peer(peer_node_id)
     if not peer or peer.status.value != "active":
         raise HTTPException(status_code=404, detail="Active peer connection not found")
@@ -135,11 +196,17 @@ def connection_accepted(body: AcceptedCallback):
     peer_public_key = None
     well_known_url = f"{peer.peer_base_url}/.well-known/hilo-node"
     try:
-        resp = httpx.get(well_known_url, timeout=5)
+        with peer_rtt.call(body.node_id, "well_known") as timeout:
+            resp = httpx.get(well_known_url, timeout=timeout)
         resp.raise_for_status()
         identity = resp.json()
-        peer_public_key = identity.get("public_key")
-        logger.info("Fetched public key for %s from %s", body.node_id, well_known_url)
+        selected = select_peer_key(
+            identity.get("algorithms", ["RS256"]), identity.get("public_keys") or {}, identity.get("public_key"),
+        )
+        if selected is None:
+            raise ValueError(f"no common signing algorithm (peer offers {identity.get('algorithms')})")
+        algorithm, peer_public_key = selected
+        logger.info("Fetched %s public key for %s from %s", algorithm, body.node_id, well_known_url)
     except Exception as exc:
         logger.warning(
             "Could not fetch public key for %s from %s: %s — marking active without key",
@@ -165,33 +232,67 @@ def resend_acceptance(connection_id: str):
 
 
 @router.post("/{peer_node_id}/disconnect", status_code=200)
-def disconnect(peer_node_id: str):
+def disconnect(
+    peer_node_id: str,
+    purge: bool = Query(default=False, description="Also drop the peer's named graph (notifications + imported data)"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+):
     """Remove a connection and notify the peer.
 
-    Notifies the peer via POST /connections/{this_node_id}/disconnected, then hard-deletes
-    locally regardless of whether the peer is reachable.
+    Queues POST /connections/{this_node_id}/disconnected to the peer as a background
+    task, retried with backoff, then hard-deletes locally without waiting for it.
+    With purge=true the peer's named graph is dropped as well — a single DROP GRAPH,
+    not a pattern delete — along with any prefetched payloads. Purging destroys data,
+    so it needs the internal key (401/403), checked before anything is removed.
     """
-    import httpx
-
+    if purge:
+        _require_internal(require_jwt(credentials))
     conn = conn_svc.get_connection_by_peer(peer_node_id)
     if not conn:
         raise HTTPException(status_code=404, detail="Connection not found")
 
-    # Notify peer — fire-and-forget, don't block on failure
-    try:
-        url = f"{conn.peer_base_url}/connections/{settings.node_id}/disconnected"
-        resp = httpx.post(url, timeout=5)
-        if not resp.is_success:
-            logger.warning("Peer %s returned %d on disconnected notify", peer_node_id, resp.status_code)
-        else:
-            logger.info("Peer %s notified of disconnect", peer_node_id)
-    except Exception as exc:
-        logger.warning("Could not notify peer %s of disconnect: %s — deleting locally anyway", peer_node_id, exc)
+    # Notify peer in the background (GET /connections/tasks shows whether it got through)
+    conn_svc.notify_disconnect(conn)
 
     conn_svc.delete_connection(peer_node_id)
+
+    if purge:
+        _purge_peer_data(peer_node_id, "Disconnected, but purging peer data failed")
+        return {"status": "disconnected", "peer": peer_node_id, "purged": True}
     return {"status": "disconnected", "peer": peer_node_id}
 
 
+def _require_internal(token_payload: dict = Depends(require_jwt)) -> dict:
+    if token_payload.get("sub") != "internal":
+        raise HTTPException(status_code=403, detail="Purging peer data is local-UI only")
+    return token_payload
+
+
+def _purge_peer_data(peer_node_id: str, failure: str) -> None:
+    """Drop everything received from a peer: named graph, ETags, dedup ids, prefetched payloads."""
+    try:
+        graphdb.drop_peer_graph(peer_node_id)
+        event_etags.source_purged(peer_node_id)
+        live.publish("events_purged", {"source_node": peer_node_id})
+        notification_dedup.forget_source(peer_node_id)
+        payload_cache.drop_source(peer_node_id)
+    except Exception as exc:
+        logger.error("Could not purge data for %s: %s", peer_node_id, exc)
+        raise HTTPException(status_code=502, detail=f"{failure}: {exc}")
+
+
+@router.post("/{peer_node_id}/purge", status_code=200)
+def purge_peer(peer_node_id: str, _token: dict = Depends(_require_internal)):
+    """Drop a peer's data without touching the connection. Local UI only.
+
+    Works whether or not a connection row exists, so data from a peer that
+    disconnected first (POST /{node_id}/disconnected already removed the row) can
+    still be purged. Idempotent.
+    """
+    _purge_peer_data(peer_node_id, "Purging peer data failed")
+    return {"status": "purged", "peer": peer_node_id}
+
+
 @router.post("/{node_id}/disconnected", status_code=200)
 def peer_disconnected(node_id: str):
     """Peer notifies us that they have removed the connection.
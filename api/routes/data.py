@@ -5,9 +5,10 @@ from pydantic import BaseModel
 from typing import Optional
 
 from config import settings
-from models.data import DataInsert
+from models.data import DataInsert, TranslationCacheStats
 from services import graphdb
 from services import llm
+from services import translation_cache
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +44,8 @@ class AskResponse(BaseModel):
     sparql: Optional[str] = None
     results: Optional[dict] = None
     error: Optional[str] = None
+    cached: bool = False  # sparql came from the translation cache, not the LLM
+    cache: Optional[TranslationCacheStats] = None
 
 
 @router.post("/ask", response_model=AskResponse)
@@ -58,20 +61,35 @@ def ask_natural_language(payload: AskRequest):
             detail="Ask AI is not configured on this node",
         )
 
-    sparql_query: Optional[str] = None
+    sparql_query: Optional[str] = translation_cache.get(payload.question, llm.PROMPT_VERSION)
+    cached = sparql_query is not None
 
-    try:
-        sparql_query = llm.translate_to_sparql(payload.question)
-    except ValueError as exc:
-        # Non-SELECT query blocked by validator
-        return AskResponse(sparql=sparql_query, results=None, error=str(exc))
-    except Exception as exc:
-        logger.error("LLM translation failed: %s", exc)
-        return AskResponse(sparql=None, results=None, error=str(exc))
+    if not cached:
+        try:
+            sparql_query = llm.translate_to_sparql(payload.question)
+        except ValueError as exc:
+            # Non-SELECT query blocked by validator
+            return AskResponse(sparql=sparql_query, results=None, error=str(exc), cache=translation_cache.stats())
+        except Exception as exc:
+            logger.error("LLM translation failed: %s", exc)
+            return AskResponse(sparql=None, results=None, error=str(exc), cache=translation_cache.stats())
 
     try:
         results = graphdb.query_data(sparql_query)
-        return AskResponse(sparql=sparql_query, results=results, error=None)
     except Exception as exc:
         logger.error("GraphDB query failed (Ask AI): %s", exc)
-        return AskResponse(sparql=sparql_query, results=None, error=str(exc))
+        return AskResponse(
+            sparql=sparql_query, results=None, error=str(exc), cached=cached, cache=translation_cache.stats(),
+        )
+    if not cached:
+        # Only translations that ran are worth repeating
+        translation_cache.put(payload.question, sparql_query, llm.PROMPT_VERSION)
+    return AskResponse(
+        sparql=sparql_query, results=results, error=None, cached=cached, cache=translation_cache.stats(),
+    )
+
+
+@router.delete("/ask/cache")
+def purge_ask_cache(question: Optional[str] = Query(None, description="Purge only this question (normalised)")):
+    """Drop cached natural-language → SPARQL translations: one question, or all of them."""
+    return {"purged": translation_cache.purge(question)}
@@ -2,11 +2,12 @@ import logging
 from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import httpx
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 
 from config import settings
-from models.events import EventCreate, EventImportRequest, EventNotification, EventResponse
-from services import connections as connections_service, graphdb, queue as queue_service
+from models.events import EventBulkImportRequest, EventCreate, EventImportRequest, EventNotification, EventResponse
+from services import connections as connections_service, event_etags, graphdb, live, payload_cache, peer_fetch, queue as queue_service
 from services.jwt_service import require_jwt
 
 logger = logging.getLogger(__name__)
@@ -31,6 +32,8 @@ def create_event(event: EventCreate, _token: dict = Depends(require_jwt)):
 
     # Server stamps source_node — callers do not assert their own identity
     stored = graphdb.store_event(event)
+    event_etags.events_changed()
+    live.publish("event", stored.model_dump(mode="json"))
     logger.info("Event created: %s type=%s", stored.id, stored.event_type)
 
     # Build lightweight notification (no triples) for the queue
@@ -54,26 +57,145 @@ def create_event(event: EventCreate, _token: dict = Depends(require_jwt)):
     return stored
 
 
+def _imported(event_id: str) -> None:
+    """has_local_copy flipped — invalidate cached ETags and tell live viewers."""
+    event_etags.event_changed(event_id)
+    live.publish("event_updated", {"id": event_id, "has_local_copy": True})
+
+
+def _cache_headers(etag: str, source_node: Optional[str] = None) -> dict:
+    """Responses vary by caller and are never shared-cacheable (they require auth).
+
+    Locally-originated events never change, so browsers may keep them; anything
+    that can change (peer events, lists) must be revalidated with If-None-Match.
+    """
+    if source_node == settings.node_id:
+        cache_control = "private, max-age=86400, immutable"
+    else:
+        cache_control = "private, no-cache"
+    return {"ETag": etag, "Cache-Control": cache_control, "Vary": "Authorization"}
+
+
 @router.get("", response_model=list[EventResponse])
 def list_events(
+    response: Response,
     since: Optional[str] = Query(default=None),
     event_type: Optional[str] = Query(default=None),
     limit: int = Query(default=50, ge=1, le=500),
+    source_node: Optional[str] = Query(default=None, description="Only events from this node (a peer's named graph)"),
+    if_none_match: Optional[str] = Header(default=None),
     _token: dict = Depends(require_jwt),
 ):
-    """List events ordered by creation time descending. Includes both local and peer notifications."""
-    return graphdb.get_events(since=since, event_type=event_type, limit=limit)
+    """List events ordered by creation time descending. Includes both local and peer notifications.
+
+    Returns 304 without querying the triple store when no event has been stored,
+    received, imported or purged since the ETag in If-None-Match was issued.
+    """
+    etag = event_etags.list_etag(since=since, event_type=event_type, limit=limit, source_node=source_node)
+    headers = _cache_headers(etag)
+    if event_etags.matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return graphdb.get_events(since=since, event_type=event_type, limit=limit, source_node=source_node)
 
 
 @router.get("/{event_id}", response_model=EventResponse)
-def get_event(event_id: str, _token: dict = Depends(require_jwt)):
-    """Retrieve full event with triples. Requires a valid Bearer JWT or internal key."""
+def get_event(
+    event_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(default=None),
+    _token: dict = Depends(require_jwt),
+):
+    """Retrieve full event with triples. Requires a valid Bearer JWT or internal key.
+
+    Strong ETag over the event id and state; a matching If-None-Match for an event
+    this process has already served is answered 304 without a triple-store query.
+    """
+    known = event_etags.known_etag(event_id)
+    if known and event_etags.matches(if_none_match, known):
+        return Response(status_code=304, headers=_cache_headers(known, event_etags.known_source(event_id)))
+
     event = graphdb.get_event_by_id(event_id)
     if event is None:
         raise HTTPException(status_code=404, detail="Event not found")
+    etag = event_etags.event_etag(event)
+    headers = _cache_headers(etag, event.source_node)
+    if event_etags.matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
     return event
 
 
+@router.post("/import-from-source")
+def import_many_from_source(body: EventBulkImportRequest, token_payload: dict = Depends(require_jwt)):
+    """Fetch and import many peer events server-side. One result per id, in request order.
+
+    Local UI only. Each result has status "imported", "already_imported" or "error".
+    """
+    if token_payload.get("sub") != "internal":
+        raise HTTPException(status_code=403, detail="Import endpoint is local-UI only")
+    results = peer_fetch.import_many(body.event_ids)
+    for result in results:
+        if result["status"] == "imported":
+            _imported(result["id"])
+    return {"results": results}
+
+
+@router.get("/{event_id}/payload")
+def get_cached_payload(
+    event_id: str,
+    fetch: bool = Query(default=False, description="On a cache miss, fetch from the source node and cache it"),
+    token_payload: dict = Depends(require_jwt),
+):
+    """Return a peer event's payload from the local payload cache.
+
+    Local UI only. Without fetch, never calls the source node: 404 when the payload
+    has not been prefetched. With fetch=true a miss is fetched server-side (422 if
+    the data link is not the source's, 502 if the source is unreachable) and cached,
+    so a later import needs no second fetch.
+    """
+    if token_payload.get("sub") != "internal":
+        raise HTTPException(status_code=403, detail="Payload cache is local-UI only")
+
+    event = graphdb.get_event_by_id(event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if "data" not in event.links:
+        raise HTTPException(status_code=400, detail="This event was originated locally — it has no peer payload")
+
+    if fetch:
+        try:
+            payload, _ = peer_fetch.get_payload(event_id, event.source_node, event.links["data"])
+        except peer_fetch.UntrustedDataUrl as exc:
+            raise HTTPException(status_code=422, detail=str(exc))
+        except httpx.HTTPError as exc:
+            raise HTTPException(status_code=502, detail=f"Could not fetch event from {event.source_node}: {exc}")
+        return payload
+
+    payload = payload_cache.get(event.source_node, event_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Payload not cached")
+    return payload
+
+
+@router.post("/{event_id}/import-from-source", status_code=200)
+def import_from_source(event_id: str, token_payload: dict = Depends(require_jwt)):
+    """Import a peer event by fetching its triples server-side from links["data"].
+
+    Local UI only. Uses the payload cache when the event was prefetched or already
+    viewed. Check sequence as for /import, plus 422 when the data link is not served
+    by the connected source node and 502 when the source is unreachable.
+    """
+    if token_payload.get("sub") != "internal":
+        raise HTTPException(status_code=403, detail="Import endpoint is local-UI only")
+    try:
+        result = peer_fetch.import_from_source(event_id)
+    except peer_fetch.PeerImportError as exc:
+        raise HTTPException(status_code=exc.status, detail=exc.detail)
+    _imported(event_id)
+    return result
+
+
 @router.post("/{event_id}/import", status_code=200)
 def import_event(event_id: str, body: EventImportRequest, token_payload: dict = Depends(require_jwt)):
     """Import fetched RDF triples from a peer event into the local triple store.
@@ -101,5 +223,6 @@ def import_event(event_id: str, body: EventImportRequest, token_payload: dict =
     if event.has_local_copy:
         raise HTTPException(status_code=409, detail="Event already imported")
 
-    graphdb.import_event_triples(event_id, body.triples)
+    graphdb.import_event_triples(event_id, body.triples, source_node=event.source_node)
+    _imported(event_id)
     return {"status": "imported", "id": event_id}
@@ -1,23 +1,36 @@
+"""
+GET /health       — dependency summary (UI dashboard); always 200
+GET /health/live  — liveness: the process is up and serving; never touches dependencies
+GET /health/ready — readiness: 200 only if every dependency's last probe succeeded, else 503
+
+All three answer from the cached results of the background probes
+(services/health_probes.py), so orchestrator probes cost nothing.
+"""
 from fastapi import APIRouter
-from services import graphdb, queue
+from fastapi.responses import JSONResponse
+
+from services import health_probes
 
 router = APIRouter()
 
 
 @router.get("/health")
 def health_check():
-    result = {"graphdb": "unknown", "queue": "unknown", "status": "healthy"}
+    checks = health_probes.snapshot()
+    result = {name: dep["status"] for name, dep in checks.items()}
+    result["status"] = "healthy" if all(dep["status"] == "ok" for dep in checks.values()) else "degraded"
+    result["checks"] = checks
+    return result
 
-    try:
-        result["graphdb"] = graphdb.check_health()
-    except Exception as exc:
-        result["graphdb"] = f"error: {exc}"
-        result["status"] = "degraded"
 
-    try:
-        result["queue"] = queue.check_health()
-    except Exception as exc:
-        result["queue"] = f"error: {exc}"
-        result["status"] = "degraded"
+@router.get("/health/live")
+def liveness():
+    return {"status": "alive"}
 
-    return result
+
+@router.get("/health/ready")
+def readiness():
+    checks = health_probes.snapshot()
+    ready = all(dep["status"] == "ok" and not health_probes.is_stale(dep) for dep in checks.values())
+    body = {"status": "ready" if ready else "not_ready", "checks": checks}
+    return JSONResponse(status_code=200 if ready else 503, content=body)
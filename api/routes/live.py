@@ -0,0 +1,33 @@
+"""
+GET /live — Server-Sent Events stream of new events, connection changes and queue stats.
+
+See services/live.py for the topics. Local UI only. Browsers' EventSource cannot
+send an Authorization header, so the internal key may also be passed as
+?access_token=...
+"""
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+
+from services import live
+from services.jwt_service import require_jwt
+
+router = APIRouter(tags=["live"])
+
+
+@router.get("/live")
+async def live_stream(request: Request, access_token: Optional[str] = Query(default=None)):
+    header = request.headers.get("authorization", "")
+    token = header[7:] if header.lower().startswith("bearer ") else access_token
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token) if token else None
+    payload = require_jwt(credentials)
+    if payload.get("sub") != "internal":
+        raise HTTPException(status_code=403, detail="Live stream is local-UI only")
+
+    return StreamingResponse(
+        live.stream(request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
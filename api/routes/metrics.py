@@ -0,0 +1,17 @@
+"""
+GET /metrics — Prometheus exposition of the API's request and dependency latencies.
+
+See metrics.py for the metric families. Scraped from inside the Docker network;
+like /health, no authentication.
+"""
+from fastapi import APIRouter, Response
+
+import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def scrape():
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,45 @@
+"""
+GET    /prefetch/rules        — list prefetch rules
+POST   /prefetch/rules        — add a rule (event_type and/or source_node)
+DELETE /prefetch/rules/{id}   — remove a rule
+GET    /prefetch/stats        — background fetch counters and payload cache size
+
+Local UI only: rules decide which peers this node pulls data from, so peer JWTs
+are rejected.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Response
+
+from models.prefetch import PrefetchRule, PrefetchRuleCreate
+from services import prefetch
+from services.jwt_service import require_jwt
+
+router = APIRouter(prefix="/prefetch", tags=["prefetch"])
+
+
+def _require_internal(token_payload: dict = Depends(require_jwt)) -> dict:
+    if token_payload.get("sub") != "internal":
+        raise HTTPException(status_code=403, detail="Prefetch endpoints are local-UI only")
+    return token_payload
+
+
+@router.get("/rules", response_model=list[PrefetchRule])
+def list_rules(_token: dict = Depends(_require_internal)):
+    return prefetch.list_rules()
+
+
+@router.post("/rules", status_code=201, response_model=PrefetchRule)
+def add_rule(body: PrefetchRuleCreate, _token: dict = Depends(_require_internal)):
+    """Prefetch payloads of future notifications matching every field set on the rule."""
+    return prefetch.add_rule(body)
+
+
+@router.delete("/rules/{rule_id}", status_code=204)
+def delete_rule(rule_id: int, _token: dict = Depends(_require_internal)):
+    if not prefetch.delete_rule(rule_id):
+        raise HTTPException(status_code=404, detail="Prefetch rule not found")
+    return Response(status_code=204)
+
+
+@router.get("/stats")
+def prefetch_stats(_token: dict = Depends(_require_internal)):
+    return prefetch.get_stats()
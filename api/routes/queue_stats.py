@@ -1,15 +1,64 @@
-from fastapi import APIRouter
+from typing import Optional
 
-from services import rabbitmq_management
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from config import settings
+from models.queue import ReplayReport, ReplayRequest
+from services import dead_letters, queue_sampler
+from services.jwt_service import require_jwt
 
 router = APIRouter(prefix="/queue", tags=["queue"])
 
 
 @router.get("/stats")
 def get_queue_stats():
-    """Return live RabbitMQ queue stats.
+    """Return RabbitMQ queue stats plus the consumer's per-peer circuit breakers.
 
-    Fields are null when the management API is unreachable — see
+    Served from the background sampler's latest snapshot (sampled_at says when);
+    read directly only until the first sample exists. Fields are null when the
+    management API (or the consumer) is unreachable — see
     services/rabbitmq_management.py for the rationale.
     """
-    return rabbitmq_management.get_queue_stats()
+    latest = queue_sampler.latest()
+    if latest is not None:
+        return latest
+    return queue_sampler.read_now()
+
+
+@router.get("/stats/history")
+def get_queue_stats_history(limit: Optional[int] = Query(default=None, ge=1)):
+    """Recent queue-stats samples, oldest first, for throughput and backlog charts.
+
+    One point per sample interval (HILO_QUEUE_STATS_INTERVAL); the buffer holds the
+    last HILO_QUEUE_STATS_HISTORY_SIZE samples and is not persisted across restarts.
+    """
+    return {
+        "interval_seconds": settings.queue_stats_interval,
+        "samples": queue_sampler.history(limit),
+    }
+
+
+@router.post("/dead-letters/replay", response_model=ReplayReport)
+def replay_dead_letters(body: ReplayRequest, token_payload: dict = Depends(require_jwt)):
+    """Replay dead-lettered messages back onto hilo.events, throttled to body.rate_per_second.
+
+    Local UI only. A dry run scans synchronously and returns the final report (200).
+    A real replay runs in the background and returns its live report (202) — poll
+    GET /queue/dead-letters/replay/{job_id} for progress.
+    """
+    if token_payload.get("sub") != "internal":
+        raise HTTPException(status_code=403, detail="Dead-letter replay is local-UI only")
+
+    if body.dry_run:
+        return dead_letters.replay(body)
+    report = dead_letters.start_replay(body)
+    return JSONResponse(status_code=202, content=report.model_dump(mode="json"))
+
+
+@router.get("/dead-letters/replay/{job_id}", response_model=ReplayReport)
+def get_replay_progress(job_id: str, _token: dict = Depends(require_jwt)):
+    report = dead_letters.get_replay(job_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Replay job not found")
+    return report
@@ -1,17 +1,18 @@
 """
 GET /.well-known/hilo-node — public node identity endpoint.
 
-Returns this node's identity (node_id, name, base_url, RSA public key).
+Returns this node's identity (node_id, name, base_url, RSA public key, and the
+public key for each supported JWT algorithm).
 Used by peers during connection handshake to discover and verify this node.
 No authentication required — public endpoint.
 """
 import logging
-import os
 
 from fastapi import APIRouter, HTTPException
 
 from config import settings
 from models.connections import NodeIdentity
+from services.jwt_service import load_public_key_pem, local_algorithms
 
 logger = logging.getLogger(__name__)
 
@@ -20,19 +21,20 @@ router = APIRouter()
 
 @router.get("/.well-known/hilo-node", response_model=NodeIdentity)
 def get_node_identity() -> NodeIdentity:
-    pub_key_path = settings.private_key_path + ".pub"
-    if not os.path.exists(pub_key_path):
+    try:
+        public_key_pem = load_public_key_pem("RS256")
+        public_keys = {algorithm: load_public_key_pem(algorithm) for algorithm in local_algorithms()}
+    except FileNotFoundError:
         raise HTTPException(
             status_code=503,
             detail="Node public key not yet generated — node is still starting up",
         )
 
-    with open(pub_key_path, "r") as f:
-        public_key_pem = f.read()
-
     return NodeIdentity(
         node_id=settings.node_id,
         name=settings.node_name,
         base_url=settings.node_base_url,
         public_key=public_key_pem,
+        algorithms=local_algorithms(),
+        public_keys=public_keys,
     )
@@ -13,18 +13,19 @@ Schema:
     created_at TEXT,
     updated_at TEXT
   )
+  + index on status (get_active_peers, get_peer_public_key)
+
+Connections come from services/sqlite_pool.py (per-thread, WAL).
 """
 import logging
 import sqlite3
 import uuid
-from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Optional
 
-import httpx
-
 from config import settings
 from models.connections import ConnectionResponse, ConnectionStatus
+from services import jwt_service, live, peer_rtt, peer_tasks, queue as queue_service, sqlite_pool
 
 logger = logging.getLogger(__name__)
 
@@ -40,24 +41,18 @@ CREATE TABLE IF NOT EXISTS connections (
     created_at TEXT NOT NULL,
     updated_at TEXT NOT NULL
 );
+CREATE INDEX IF NOT EXISTS idx_connections_status ON connections (status);
 """
 
 
 def init_db() -> None:
     """Create the connections table if it doesn't exist."""
     with _conn() as db:
-        db.execute(_DB_SCHEMA)
-        db.commit()
+        db.executescript(_DB_SCHEMA)
 
 
-@contextmanager
 def _conn():
-    db = sqlite3.connect(settings.db_path)
-    db.row_factory = sqlite3.Row
-    try:
-        yield db
-    finally:
-        db.close()
+    return sqlite_pool.connect()
 
 
 def _now() -> str:
@@ -120,6 +115,30 @@ def get_peer_public_key(peer_node_id: str) -> Optional[str]:
     return row["peer_public_key"] if row else None
 
 
+# ── Delivery queues ───────────────────────────────────────────────────────────
+
+def _declare_delivery_queue(peer_node_id: str) -> None:
+    """Create the peer's delivery queue. Failure is logged only — the consumer
+    declares the queue lazily on first dispatch as well."""
+    try:
+        queue_service.declare_peer_queue(peer_node_id)
+    except Exception as exc:
+        logger.warning("Could not declare delivery queue for %s: %s", peer_node_id, exc)
+
+
+def _delete_delivery_queue(peer_node_id: str) -> None:
+    try:
+        queue_service.delete_peer_queue(peer_node_id)
+    except Exception as exc:
+        logger.warning("Could not delete delivery queue for %s: %s", peer_node_id, exc)
+
+
+def _announce(peer_node_id: str, status: str) -> None:
+    """Drop the peer's cached JWT key and tokens, and push the state change to open GET /live streams."""
+    jwt_service.forget_peer(peer_node_id)
+    live.publish("connection", {"peer_node_id": peer_node_id, "status": status})
+
+
 # ── Write ─────────────────────────────────────────────────────────────────────
 
 def create_incoming_request(
@@ -149,6 +168,7 @@ def create_incoming_request(
             ),
         )
         db.commit()
+    _announce(peer_node_id, ConnectionStatus.pending_incoming.value)
     return get_connection_by_id(connection_id)
 
 
@@ -178,6 +198,7 @@ def create_outgoing_request(
             ),
         )
         db.commit()
+    _announce(peer_node_id, ConnectionStatus.pending_outgoing.value)
     return get_connection_by_id(connection_id)
 
 
@@ -193,6 +214,8 @@ def accept_connection(connection_id: str) -> Optional[ConnectionResponse]:
     conn = get_connection_by_id(connection_id)
 
     if conn and conn.status == ConnectionStatus.active:
+        _declare_delivery_queue(conn.peer_node_id)
+        _announce(conn.peer_node_id, conn.status.value)
         # Fire-and-forget acceptance callback to peer
         _send_acceptance_callback(conn)
 
@@ -200,39 +223,40 @@ def accept_connection(connection_id: str) -> Optional[ConnectionResponse]:
 
 
 def _send_acceptance_callback(conn: ConnectionResponse) -> None:
-    """POST /connections/accepted to peer node. Retries 3× with backoff.
-    On failure, marks connection accept_pending."""
-    import time
-
-    payload = {"node_id": settings.node_id, "status": "accepted"}
-    url = f"{conn.peer_base_url}/connections/accepted"
-
-    for attempt in range(1, 4):
-        try:
-            resp = httpx.post(url, json=payload, timeout=5)
-            if resp.is_success:
-                logger.info("Acceptance callback sent to %s", conn.peer_node_id)
-                return
-            logger.warning(
-                "Acceptance callback attempt %d/%d to %s returned %d",
-                attempt, 3, conn.peer_node_id, resp.status_code,
-            )
-        except Exception as exc:
-            logger.warning(
-                "Acceptance callback attempt %d/%d to %s failed: %s",
-                attempt, 3, conn.peer_node_id, exc,
-            )
-        if attempt < 3:
-            time.sleep(2 ** attempt)
+    """Queue POST /connections/accepted to the peer node (services/peer_tasks.py retries it
+    with backoff). If every attempt fails, the connection is marked accept_pending.
+    An outstanding callback for the peer is reused, so repeated resends queue one task."""
+    peer_tasks.enqueue_once(
+        "acceptance_callback",
+        conn.peer_node_id,
+        f"{conn.peer_base_url}/connections/accepted",
+        {"node_id": settings.node_id, "status": "accepted"},
+    )
 
-    # All retries failed — mark accept_pending
+
+def _acceptance_failed(peer_node_id: str) -> None:
+    """peer_tasks failure hook — the peer never got the acceptance callback."""
     with _conn() as db:
-        db.execute(
-            "UPDATE connections SET status = ?, updated_at = ? WHERE id = ?",
-            (ConnectionStatus.accept_pending, _now(), conn.id),
+        cursor = db.execute(
+            "UPDATE connections SET status = ?, updated_at = ? WHERE peer_node_id = ? AND status = ?",
+            (ConnectionStatus.accept_pending, _now(), peer_node_id, ConnectionStatus.active),
         )
         db.commit()
-    logger.error("Acceptance callback failed after 3 attempts — marked accept_pending for %s", conn.peer_node_id)
+    if cursor.rowcount:
+        _announce(peer_node_id, ConnectionStatus.accept_pending.value)
+        logger.error("Acceptance callback failed — marked accept_pending for %s", peer_node_id)
+
+
+peer_tasks.on_failed("acceptance_callback", _acceptance_failed)
+
+
+def notify_disconnect(conn: ConnectionResponse) -> None:
+    """Queue POST /connections/{this_node_id}/disconnected to the peer node."""
+    peer_tasks.enqueue(
+        "disconnect_notice",
+        conn.peer_node_id,
+        f"{conn.peer_base_url}/connections/{settings.node_id}/disconnected",
+    )
 
 
 def reject_connection(connection_id: str) -> bool:
@@ -250,6 +274,9 @@ def reject_connection(connection_id: str) -> bool:
             ),
         )
         db.commit()
+        row = db.execute("SELECT peer_node_id FROM connections WHERE id = ?", (connection_id,)).fetchone()
+    if cursor.rowcount > 0 and row:
+        _announce(row["peer_node_id"], ConnectionStatus.rejected.value)
     return cursor.rowcount > 0
 
 
@@ -272,7 +299,11 @@ def mark_active_from_callback(peer_node_id: str, peer_public_key: str) -> Option
             ),
         )
         db.commit()
-    return get_connection_by_peer(peer_node_id)
+    conn = get_connection_by_peer(peer_node_id)
+    if conn and conn.status == ConnectionStatus.active:
+        _declare_delivery_queue(peer_node_id)
+        _announce(peer_node_id, conn.status.value)
+    return conn
 
 
 def resend_acceptance(connection_id: str) -> Optional[ConnectionResponse]:
@@ -288,20 +319,29 @@ def resend_acceptance(connection_id: str) -> Optional[ConnectionResponse]:
             )
             db.commit()
         conn = get_connection_by_id(connection_id)
+        _announce(conn.peer_node_id, conn.status.value)
         _send_acceptance_callback(conn)
     return get_connection_by_id(connection_id)
 
 
 def delete_connection(peer_node_id: str) -> bool:
-    """Hard-delete a connection by peer node ID. Idempotent — no error if not found."""
+    """Hard-delete a connection by peer node ID. Idempotent — no error if not found.
+
+    Outstanding acceptance callbacks are cancelled: a retry landing after our
+    disconnect notice would make the peer mark the connection active again.
+    """
     with _conn() as db:
         cursor = db.execute(
             "DELETE FROM connections WHERE peer_node_id = ?", (peer_node_id,)
         )
         db.commit()
+    peer_tasks.cancel("acceptance_callback", peer_node_id)
     deleted = cursor.rowcount > 0
     if deleted:
         logger.info("Connection with %s deleted", peer_node_id)
+        _delete_delivery_queue(peer_node_id)
+        peer_rtt.forget(peer_node_id)
+        _announce(peer_node_id, "deleted")
     else:
         logger.info("disconnect: no connection found for %s — nothing to delete", peer_node_id)
     return deleted
@@ -0,0 +1,36 @@
+"""
+Read-only view of the queue consumer's runtime state.
+
+The consumer runs in its own container and serves its circuit breaker states and
+per-peer round-trip times on a small status server (queue/consumer.py, HILO_STATUS_PORT). Like the management API
+stats, this is a monitoring read: None means "unavailable", never an error.
+"""
+import logging
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def get_circuit_breakers() -> list[dict] | None:
+    """Return one entry per peer the consumer has delivered to, or None if unreachable."""
+    try:
+        resp = httpx.get(f"{settings.consumer_status_url}/breakers", timeout=2)
+        resp.raise_for_status()
+        return resp.json()
+    except Exception as exc:
+        logger.warning("Consumer status server unavailable: %s", exc)
+        return None
+
+
+def get_peer_rtt() -> list[dict] | None:
+    """Return the consumer's RTT estimate per peer it forwards to, or None if unreachable."""
+    try:
+        resp = httpx.get(f"{settings.consumer_status_url}/rtt", timeout=2)
+        resp.raise_for_status()
+        return resp.json()
+    except Exception as exc:
+        logger.warning("Consumer status server unavailable: %s", exc)
+        return None
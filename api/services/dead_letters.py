@@ -0,0 +1,206 @@
+"""
+Dead-letter replay — move messages from hilo.events.dead back onto hilo.events.
+
+Each message is republished with its original routing key, so dispatch messages
+go back through the fan-out and delivery messages go straight back onto their
+peer's queue. Messages that don't match the filters (or every message, in dry-run
+mode) are held unacked while the queue is scanned, then requeued in place.
+
+Replays are throttled to rate_per_second so a recovered peer is not flooded.
+
+Background jobs save their report to SQLite as they go, so any worker process can
+answer GET /queue/dead-letters/replay/{job_id}.
+
+Schema:
+  dead_letter_replays (
+    job_id TEXT PRIMARY KEY,
+    report TEXT,      -- ReplayReport as JSON
+    updated_at TEXT
+  )
+"""
+import json
+import logging
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from models.queue import ReplayReport, ReplayRequest
+from services import queue as queue_service
+from services import sqlite_pool
+
+logger = logging.getLogger(__name__)
+
+_MAX_REPORTED_IDS = 100
+
+_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dead_letter_replays (
+    job_id TEXT PRIMARY KEY,
+    report TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+
+def _conn():
+    return sqlite_pool.connect(_DB_SCHEMA)
+
+
+def _save(report: ReplayReport) -> None:
+    try:
+        with _conn() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO dead_letter_replays (job_id, report, updated_at) VALUES (?, ?, ?)",
+                (report.job_id, report.model_dump_json(), datetime.now(timezone.utc).isoformat()),
+            )
+            db.commit()
+    except sqlite3.Error as exc:
+        # Progress is informational; a failed write must not abort the replay
+        logger.warning("Dead-letter replay %s: could not save progress: %s", report.job_id, exc)
+
+
+def _dead_lettered_at(properties) -> Optional[datetime]:
+    """Time the broker dead-lettered the message, from the first x-death entry."""
+    deaths = (properties.headers or {}).get("x-death") if properties else None
+    if not deaths:
+        return None
+    ts = deaths[0].get("time")
+    if isinstance(ts, datetime):
+        return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+    if isinstance(ts, (int, float)):
+        return datetime.fromtimestamp(ts, tz=timezone.utc)
+    return None
+
+
+def _matches(req: ReplayRequest, notification: dict, routing_key: str, dead_at: Optional[datetime], now: datetime) -> bool:
+    if req.event_type and notification.get("event_type") != req.event_type:
+        return False
+    if req.receiver:
+        peer_key = f".peer.{req.receiver}"
+        if notification.get("receiver") != req.receiver and not routing_key.endswith(peer_key):
+            return False
+    if req.min_age_seconds is not None or req.max_age_seconds is not None:
+        if dead_at is None:
+            return False
+        age = (now - dead_at).total_seconds()
+        if req.min_age_seconds is not None and age < req.min_age_seconds:
+            return False
+        if req.max_age_seconds is not None and age > req.max_age_seconds:
+            return False
+    return True
+
+
+def replay(
+    req: ReplayRequest,
+    report: Optional[ReplayReport] = None,
+    progress: Optional[Callable[[ReplayReport], None]] = None,
+) -> ReplayReport:
+    """Scan the dead-letter queue once and replay matching messages. Blocks until done.
+
+    progress, if given, is called after every replayed message (and once at the end).
+    """
+    import pika
+    from pika.exceptions import UnroutableError
+
+    if report is None:
+        report = ReplayReport(job_id=str(uuid.uuid4()), dry_run=req.dry_run, started_at=datetime.now(timezone.utc))
+    interval = 1.0 / req.rate_per_second
+    held: list[int] = []
+
+    conn = None
+    try:
+        conn = queue_service._get_connection()
+        channel = conn.channel()
+        queue_service.ensure_infrastructure(channel)
+        channel.confirm_delivery()
+        depth = channel.queue_declare(queue=queue_service.DLX_QUEUE, durable=True, passive=True).method.message_count
+        report.queue_depth = depth
+        now = datetime.now(timezone.utc)
+
+        # Bounded by the depth at start: held messages stay unacked, so basic_get never returns them twice
+        for _ in range(depth):
+            if req.limit is not None and report.matched >= req.limit:
+                break
+            method, properties, body = channel.basic_get(queue=queue_service.DLX_QUEUE, auto_ack=False)
+            if method is None:
+                break
+            report.scanned += 1
+
+            try:
+                notification = json.loads(body)
+            except Exception:
+                notification = {}
+            if not _matches(req, notification, method.routing_key, _dead_lettered_at(properties), now):
+                held.append(method.delivery_tag)
+                continue
+
+            report.matched += 1
+            if len(report.matched_event_ids) < _MAX_REPORTED_IDS:
+                report.matched_event_ids.append(notification.get("event_id", ""))
+            if req.dry_run:
+                held.append(method.delivery_tag)
+                continue
+
+            headers = {k: v for k, v in (properties.headers or {}).items() if k != "x-death"}
+            headers["x-hilo-replayed"] = int(headers.get("x-hilo-replayed", 0)) + 1
+            try:
+                channel.basic_publish(
+                    exchange=queue_service.EXCHANGE_NAME,
+                    routing_key=method.routing_key,
+                    body=body,
+                    properties=pika.BasicProperties(
+                        delivery_mode=2,  # persistent
+                        content_type="application/json",
+                        headers=headers,
+                    ),
+                    mandatory=True,
+                )
+                channel.basic_ack(delivery_tag=method.delivery_tag)
+                report.replayed += 1
+            except UnroutableError:
+                # e.g. a delivery message for a peer that has since disconnected
+                logger.warning("Replay: no queue bound for %s — leaving message in DLQ", method.routing_key)
+                held.append(method.delivery_tag)
+                report.failed += 1
+
+            if progress:
+                progress(report)
+            conn.sleep(interval)
+
+        for tag in held:
+            channel.basic_nack(delivery_tag=tag, requeue=True)
+        report.status = "completed"
+    except Exception as exc:
+        logger.error("Dead-letter replay %s failed: %s", report.job_id, exc)
+        report.status = "failed"
+        report.error = str(exc)
+    finally:
+        report.finished_at = datetime.now(timezone.utc)
+        if conn is not None and conn.is_open:
+            conn.close()  # anything still unacked returns to the DLQ
+
+    logger.info(
+        "Dead-letter replay %s %s: scanned=%d matched=%d replayed=%d failed=%d dry_run=%s",
+        report.job_id, report.status, report.scanned, report.matched, report.replayed, report.failed, req.dry_run,
+    )
+    if progress:
+        progress(report)
+    return report
+
+
+def start_replay(req: ReplayRequest) -> ReplayReport:
+    """Run replay() on a background thread and return its initial report."""
+    report = ReplayReport(job_id=str(uuid.uuid4()), dry_run=req.dry_run, started_at=datetime.now(timezone.utc))
+    _save(report)
+    threading.Thread(
+        target=replay, args=(req, report, _save), name=f"dlq-replay-{report.job_id[:8]}", daemon=True
+    ).start()
+    return report
+
+
+def get_replay(job_id: str) -> Optional[ReplayReport]:
+    """Latest saved report for a background job, from whichever worker runs it."""
+    with _conn() as db:
+        row = db.execute("SELECT report FROM dead_letter_replays WHERE job_id = ?", (job_id,)).fetchone()
+    return ReplayReport.model_validate_json(row["report"]) if row else None
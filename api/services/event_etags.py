@@ -0,0 +1,124 @@
+"""
+ETags for GET /events and GET /events/{id}.
+
+Events are immutable once created; the only state that changes is has_local_copy,
+when a peer event is imported. An event's ETag is therefore a hash of its id,
+source node and has_local_copy. Once an event has been served, its ETag is kept
+here, so a matching If-None-Match is answered 304 without querying the triple store.
+At most event_etag_cache_size ETags are kept, least recently used evicted first; an
+evicted event just costs one triple-store query on its next conditional GET.
+Every path that changes an event (import, purge) invalidates it here.
+
+List responses depend on every event, so they carry a version ETag instead:
+"{boot}-{version}-{query hash}". The version is bumped whenever events are created,
+received, imported or purged through this API; the boot id keeps ETags from a
+previous process from matching. Writes made behind the API's back (e.g. raw SPARQL
+updates via /data) are not tracked.
+
+With several worker processes (settings.workers > 1), every change is also
+announced through services/invalidation.py; a worker that sees another's change
+forgets its known ETags and bumps its own version before answering.
+"""
+import hashlib
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from config import settings
+from models.events import EventResponse
+from services import invalidation
+
+_boot = uuid.uuid4().hex[:8]
+_version = 0
+_lock = threading.Lock()
+
+# event_id → (etag, source_node), least recently used first
+_known: OrderedDict[str, tuple[str, str]] = OrderedDict()
+
+
+def _hash(*parts: object) -> str:
+    return hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()[:20]
+
+
+def _sync_with_other_workers() -> None:
+    global _version
+    if invalidation.stale("events"):
+        with _lock:
+            _known.clear()
+            _version += 1
+
+
+def event_etag(event: EventResponse) -> str:
+    """Strong ETag for a single event, and remember it for later conditional requests."""
+    etag = f'"{_hash(event.id, event.source_node, event.has_local_copy)}"'
+    with _lock:
+        _known[event.id] = (etag, event.source_node)
+        _known.move_to_end(event.id)
+        while len(_known) > settings.event_etag_cache_size:
+            _known.popitem(last=False)
+    return etag
+
+
+def _lookup(event_id: str) -> Optional[tuple[str, str]]:
+    _sync_with_other_workers()
+    with _lock:
+        entry = _known.get(event_id)
+        if entry is not None:
+            _known.move_to_end(event_id)
+    return entry
+
+
+def known_etag(event_id: str) -> Optional[str]:
+    entry = _lookup(event_id)
+    return entry[0] if entry else None
+
+
+def known_source(event_id: str) -> Optional[str]:
+    entry = _lookup(event_id)
+    return entry[1] if entry else None
+
+
+def list_etag(**params: object) -> str:
+    """ETag for a GET /events response with these query parameters."""
+    _sync_with_other_workers()
+    with _lock:
+        version = _version
+    return f'"{_boot}-{version}-{_hash(*sorted(params.items()))[:12]}"'
+
+
+def events_changed() -> None:
+    """New events were stored — invalidate every list ETag."""
+    global _version
+    with _lock:
+        _version += 1
+    invalidation.notify("events")
+
+
+def event_changed(event_id: str) -> None:
+    """An event's state changed (e.g. imported) — invalidate it and every list ETag."""
+    global _version
+    with _lock:
+        _known.pop(event_id, None)
+        _version += 1
+    invalidation.notify("events")
+
+
+def source_purged(source_node: str) -> None:
+    """All of a peer's events were dropped."""
+    global _version
+    with _lock:
+        for event_id in [k for k, (_, src) in _known.items() if src == source_node]:
+            del _known[event_id]
+        _version += 1
+    invalidation.notify("events")
+
+
+def matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value matches etag (weak comparison, per RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return any(c.removeprefix("W/") == etag for c in candidates)
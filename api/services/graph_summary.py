@@ -0,0 +1,106 @@
+"""
+Periodically refreshed summary of what is in the triple store, for Ask AI prompts.
+
+The system prompt only knows the ontology's conventions, so the LLM guesses class
+and predicate names ("hilo:Order" when the data says hilo:PurchaseOrder) and the
+query comes back empty. A background thread counts the most common classes and
+predicates every graph_summary_interval seconds; llm.translate_to_sparql appends
+the rendered text to the system prompt.
+
+The text only changes when a refresh finds different terms or counts, so it can
+sit behind the static prompt as a second cached prompt block. Counts are rounded
+to two significant figures so steady growth does not rewrite it on every refresh.
+
+The thread runs only when Ask AI is configured (settings.anthropic_api_key), and
+with several worker processes only in the leader (services/leader.py), which
+shares the text with the other workers. Until the first refresh succeeds, or if
+the graph is empty, text() returns "" and the prompt goes without a summary.
+"""
+import logging
+import threading
+from typing import Optional
+
+from config import settings
+from services import graphdb, leader
+
+logger = logging.getLogger(__name__)
+
+_text = ""
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def _approx(count: int) -> str:
+    """Two significant figures: 1234 → "~1200", 87 → "87"."""
+    if count < 100:
+        return str(count)
+    digits = len(str(count)) - 2
+    return f"~{round(count, -digits)}"
+
+
+def render(classes: list[tuple[str, int]], predicates: list[tuple[str, int]]) -> str:
+    """Prompt text for the given (IRI, count) lists, or "" if both are empty."""
+    if not classes and not predicates:
+        return ""
+    lines = [
+        "## What is currently in the graph",
+        "",
+        "Prefer these classes and predicates; they are the most common ones in the data.",
+    ]
+    if classes:
+        lines += ["", "Classes (instances):"]
+        lines += [f"- <{iri}> ({_approx(n)})" for iri, n in classes]
+    if predicates:
+        lines += ["", "Predicates (triples):"]
+        lines += [f"- <{iri}> ({_approx(n)})" for iri, n in predicates]
+    return "\n".join(lines)
+
+
+def refresh() -> None:
+    """Count classes and predicates now and replace the summary."""
+    global _text
+    summary = render(
+        graphdb.top_classes(settings.graph_summary_size),
+        graphdb.top_predicates(settings.graph_summary_size),
+    )
+    with _lock:
+        changed = summary != _text
+        _text = summary
+    if settings.workers > 1:
+        leader.share("graph_summary", summary)
+    if changed:
+        logger.info("Graph summary changed (%d characters)", len(summary))
+
+
+def text() -> str:
+    """The latest summary for the prompt ("" if none yet)."""
+    if not leader.is_leader():
+        return leader.shared("graph_summary") or ""
+    with _lock:
+        return _text
+
+
+def _run() -> None:
+    while not _stop.is_set():
+        try:
+            refresh()
+        except Exception as exc:
+            logger.warning("Graph summary refresh failed: %s", exc)
+        _stop.wait(settings.graph_summary_interval)
+
+
+def start() -> None:
+    """Start the refresh thread (idempotent). Called from the app lifespan."""
+    global _thread
+    if not settings.anthropic_api_key:
+        return
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="graph-summary", daemon=True)
+    _thread.start()
+
+
+def stop() -> None:
+    _stop.set()
@@ -1,9 +1,11 @@
 import logging
 import uuid
 from datetime import datetime
+from urllib.parse import quote
 
 import httpx
 
+import metrics
 from config import settings
 from models.events import EventCreate, EventNotification, EventResponse
 
@@ -29,6 +31,29 @@ def _sparql_update_endpoint() -> str:
     return f"{settings.graphdb_url}/repositories/{settings.graphdb_repository}/statements"
 
 
+PEER_GRAPH_BASE = "http://hilo.semantics.io/graphs/peer/"
+
+
+def peer_graph(source_node: str) -> str:
+    """Named graph holding everything received from one peer: notifications and imported triples.
+
+    Locally-originated data stays in the default graph. Keeping each peer in its own
+    graph lets per-peer queries scope to it and lets disconnect purge it with one DROP.
+    """
+    return PEER_GRAPH_BASE + quote(source_node, safe="")
+
+
+def _any_graph(pattern: str) -> str:
+    """Match a graph pattern in the default graph or any named graph.
+
+    GraphDB's default graph already is the union of all graphs. Fuseki keeps named
+    graphs out of the default graph, so the pattern is repeated under GRAPH ?g.
+    """
+    if settings.graphdb_backend == "fuseki":
+        return f"{{ {pattern} }} UNION {{ GRAPH ?g {{ {pattern} }} }}"
+    return pattern
+
+
 def _health_url() -> str:
     if settings.graphdb_backend == "fuseki":
         return f"{settings.graphdb_url}/$/ping"
@@ -37,7 +62,8 @@ def _health_url() -> str:
 
 def check_health() -> str:
     try:
-        resp = httpx.get(_health_url(), timeout=5)
+        with metrics.timed("triple_store", "health"):
+            resp = httpx.get(_health_url(), timeout=5)
         resp.raise_for_status()
         return "ok"
     except Exception as exc:
@@ -95,16 +121,12 @@ def store_event(event: EventCreate) -> EventResponse:
     )
 
 
-def store_notification(notification: EventNotification) -> None:
-    """Store an incoming EventNotification from a peer node.
-
-    Writes metadata only — no triples. The data_url can be used to fetch
-    the full event from the source node on demand.
-    """
+def _notification_turtle(notification: EventNotification) -> str:
+    """Metadata-only Turtle for a peer notification (no triples)."""
     subject_escaped = notification.subject.replace('"', '\\"')
     data_url_escaped = notification.data_url.replace('"', '\\"')
 
-    meta_turtle = f"""
+    return f"""
 @prefix hilo: <http://hilo.semantics.io/ontology/> .
 @prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
 
@@ -116,7 +138,28 @@ def store_notification(notification: EventNotification) -> None:
     hilo:createdAt "{notification.created_at.isoformat()}"^^xsd:dateTime ;
     hilo:dataUrl "{data_url_escaped}" .
 """
-    insert_turtle(meta_turtle)
+
+
+def store_notification(notification: EventNotification) -> None:
+    """Store an incoming EventNotification from a peer node.
+
+    Writes metadata only — no triples — into the source node's named graph. The
+    data_url can be used to fetch the full event from the source node on demand.
+    """
+    insert_turtle(_notification_turtle(notification), graph=peer_graph(notification.source_node))
+
+
+def store_notifications(notifications: list[EventNotification]) -> None:
+    """Store a batch of peer notifications in a single triple-store update per source node.
+
+    All-or-nothing per source: raises if an update fails, and callers fall back to
+    store_notification per item to find out which ones are at fault.
+    """
+    by_source: dict[str, list[EventNotification]] = {}
+    for n in notifications:
+        by_source.setdefault(n.source_node, []).append(n)
+    for source_node, batch in by_source.items():
+        insert_turtle("".join(_notification_turtle(n) for n in batch), graph=peer_graph(source_node))
 
 
 def _turtle_data_endpoint() -> str:
@@ -126,10 +169,30 @@ def _turtle_data_endpoint() -> str:
     return None  # GraphDB uses SPARQL UPDATE
 
 
-def insert_turtle(triples: str) -> None:
-    """Insert a Turtle document into the triple store.
-
-    Fuseki: POST raw Turtle to the /data endpoint.
+def _turtle_update(operation: str, triples: str, graph: str | None = None) -> str:
+    """INSERT DATA / DELETE DATA update for a Turtle document (@prefix lines → PREFIX)."""
+    seen_prefixes: dict[str, str] = {}
+    body_lines = []
+    for line in triples.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("@prefix"):
+            # @prefix foo: <...> .  →  PREFIX foo: <...>
+            sparql_prefix = "PREFIX" + stripped[7:].rstrip(" .")
+            parts = sparql_prefix.split()
+            prefix_name = parts[1] if len(parts) > 1 else sparql_prefix
+            seen_prefixes[prefix_name] = sparql_prefix
+        else:
+            body_lines.append(line)
+    body = "\n".join(body_lines)
+    if graph:
+        body = f"GRAPH <{graph}> {{\n{body}\n}}"
+    return "\n".join(seen_prefixes.values()) + f"\n{operation} DATA {{\n" + body + "\n}"
+
+
+def insert_turtle(triples: str, graph: str | None = None) -> None:
+    """Insert a Turtle document into the triple store — the default graph, or the named graph `graph`.
+
+    Fuseki: POST raw Turtle to the /data endpoint (?graph=<uri> for a named graph).
     GraphDB: convert @prefix declarations to SPARQL PREFIX syntax and execute INSERT DATA.
 
     Prefix deduplication: if the same prefix name appears more than once (across calls),
@@ -140,12 +203,14 @@ def insert_turtle(triples: str) -> None:
         # Fuseki accepts raw Turtle via POST /dataset/data
         endpoint = _turtle_data_endpoint()
         try:
-            resp = httpx.post(
-                endpoint,
-                content=triples.encode(),
-                headers={"Content-Type": "text/turtle"},
-                timeout=10,
-            )
+            with metrics.timed("triple_store", "insert"):
+                resp = httpx.post(
+                    endpoint,
+                    params={"graph": graph} if graph else None,
+                    content=triples.encode(),
+                    headers={"Content-Type": "text/turtle"},
+                    timeout=10,
+                )
             resp.raise_for_status()
         except httpx.HTTPStatusError as exc:
             logger.error("Fuseki INSERT failed: %s — %s", exc.response.status_code, exc.response.text)
@@ -153,26 +218,15 @@ def insert_turtle(triples: str) -> None:
     else:
         # GraphDB: SPARQL UPDATE with prefixes converted to SPARQL PREFIX syntax
         endpoint = _sparql_update_endpoint()
-        seen_prefixes: dict[str, str] = {}
-        body_lines = []
-        for line in triples.splitlines():
-            stripped = line.strip()
-            if stripped.startswith("@prefix"):
-                # @prefix foo: <...> .  →  PREFIX foo: <...>
-                sparql_prefix = "PREFIX" + stripped[7:].rstrip(" .")
-                parts = sparql_prefix.split()
-                prefix_name = parts[1] if len(parts) > 1 else sparql_prefix
-                seen_prefixes[prefix_name] = sparql_prefix
-            else:
-                body_lines.append(line)
-        insert_query = "\n".join(seen_prefixes.values()) + f"\nINSERT DATA {{\n" + "\n".join(body_lines) + "\n}"
+        insert_query = _turtle_update("INSERT", triples, graph)
         try:
-            resp = httpx.post(
-                endpoint,
-                data={"update": insert_query},
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-                timeout=10,
-            )
+            with metrics.timed("triple_store", "insert"):
+                resp = httpx.post(
+                    endpoint,
+                    data={"update": insert_query},
+                    headers={"Content-Type": "application/x-www-form-urlencoded"},
+                    timeout=10,
+                )
             resp.raise_for_status()
         except httpx.HTTPStatusError as exc:
             logger.error("GraphDB INSERT failed: %s — %s", exc.response.status_code, exc.response.text)
@@ -183,12 +237,13 @@ def _sparql_update(sparql: str) -> None:
     """Execute a SPARQL UPDATE against the configured triple store."""
     endpoint = _sparql_update_endpoint()
     try:
-        resp = httpx.post(
-            endpoint,
-            data={"update": sparql},
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-            timeout=10,
-        )
+        with metrics.timed("triple_store", "update"):
+            resp = httpx.post(
+                endpoint,
+                data={"update": sparql},
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=10,
+            )
         resp.raise_for_status()
     except httpx.HTTPStatusError as exc:
         logger.error("SPARQL UPDATE failed: %s — %s", exc.response.status_code, exc.response.text)
@@ -199,12 +254,13 @@ def query_data(sparql: str) -> dict:
     """Execute a SPARQL SELECT query and return the raw JSON results binding."""
     endpoint = _sparql_endpoint()
     try:
-        resp = httpx.get(
-            endpoint,
-            params={"query": sparql},
-            headers={"Accept": "application/sparql-results+json"},
-            timeout=15,
-        )
+        with metrics.timed("triple_store", "query"):
+            resp = httpx.get(
+                endpoint,
+                params={"query": sparql},
+                headers={"Accept": "application/sparql-results+json"},
+                timeout=15,
+            )
         resp.raise_for_status()
         return resp.json()
     except httpx.HTTPStatusError as exc:
@@ -216,22 +272,26 @@ def get_events(
     since: str | None = None,
     event_type: str | None = None,
     limit: int = 50,
+    source_node: str | None = None,
 ) -> list[EventResponse]:
     """Query the event metadata graph. Returns lightweight EventResponse objects (no triples).
 
     has_local_copy is derived from whether hilo:triplesPayload exists on the metadata subject —
     True for locally-originated events and imported peer events, False for unimported notifications.
+
+    source_node scopes the query: a peer's node id reads only that peer's named graph;
+    this node's own id reads local events only.
     """
     filters = []
     if since:
         filters.append(f'FILTER(?createdAt >= "{since}"^^xsd:dateTime)')
     if event_type:
         filters.append(f'FILTER(?eventType = "{event_type}")')
+    if source_node == settings.node_id:
+        filters.append(f'FILTER(?sourceNode = "{source_node}")')
     filter_block = "\n    ".join(filters)
 
-    sparql = f"""
-{PREFIXES}
-SELECT ?eventId ?sourceNode ?eventType ?subject ?createdAt ?hasLocalCopy WHERE {{
+    pattern = f"""
     ?event a hilo:Event ;
            hilo:eventId ?eventId ;
            hilo:sourceNode ?sourceNode ;
@@ -241,6 +301,16 @@ SELECT ?eventId ?sourceNode ?eventType ?subject ?createdAt ?hasLocalCopy WHERE {
     OPTIONAL {{ ?event hilo:triplesPayload ?tp . }}
     BIND(BOUND(?tp) AS ?hasLocalCopy)
     {filter_block}
+"""
+    if source_node and source_node != settings.node_id:
+        where = f"GRAPH <{peer_graph(source_node)}> {{ {pattern} }}"
+    else:
+        where = _any_graph(pattern)
+
+    sparql = f"""
+{PREFIXES}
+SELECT ?eventId ?sourceNode ?eventType ?subject ?createdAt ?hasLocalCopy WHERE {{
+    {where}
 }}
 ORDER BY DESC(?createdAt)
 LIMIT {limit}
@@ -270,16 +340,20 @@ def get_event_by_id(event_id: str) -> EventResponse | None:
 
     Presence of hilo:dataUrl in links indicates a peer notification (not locally originated).
     """
-    sparql = f"""
-{PREFIXES}
-SELECT ?sourceNode ?eventType ?subject ?createdAt ?triplesPayload ?dataUrl WHERE {{
-    <http://hilo.semantics.io/events/meta/{event_id}> a hilo:Event ;
+    meta = f"<http://hilo.semantics.io/events/meta/{event_id}>"
+    pattern = f"""
+    {meta} a hilo:Event ;
            hilo:sourceNode ?sourceNode ;
            hilo:eventType ?eventType ;
            hilo:createdAt ?createdAt .
-    OPTIONAL {{ <http://hilo.semantics.io/events/meta/{event_id}> hilo:subject ?subject . }}
-    OPTIONAL {{ <http://hilo.semantics.io/events/meta/{event_id}> hilo:triplesPayload ?triplesPayload . }}
-    OPTIONAL {{ <http://hilo.semantics.io/events/meta/{event_id}> hilo:dataUrl ?dataUrl . }}
+    OPTIONAL {{ {meta} hilo:subject ?subject . }}
+    OPTIONAL {{ {meta} hilo:triplesPayload ?triplesPayload . }}
+    OPTIONAL {{ {meta} hilo:dataUrl ?dataUrl . }}
+"""
+    sparql = f"""
+{PREFIXES}
+SELECT ?sourceNode ?eventType ?subject ?createdAt ?triplesPayload ?dataUrl WHERE {{
+    {_any_graph(pattern)}
 }}
 """
     results = query_data(sparql)
@@ -302,16 +376,21 @@ SELECT ?sourceNode ?eventType ?subject ?createdAt ?triplesPayload ?dataUrl WHERE
     )
 
 
-def import_event_triples(event_id: str, triples: str) -> None:
+def import_event_triples(event_id: str, triples: str, source_node: str | None = None) -> None:
     """Import RDF triples for a peer notification into the local triple store.
 
+    With source_node, the triples and the payload marker go into that peer's named
+    graph (next to the notification), so dropping the graph removes them too.
+
     Write order (critical):
       1. insert_turtle — idempotent; safe to retry
       2. SPARQL UPDATE metadata — only after triples confirmed stored
     If (2) fails, event stays as 'received' and user can retry cleanly.
     """
+    graph = peer_graph(source_node) if source_node else None
+
     # Step 1: Insert the actual RDF triples first (idempotent on retry)
-    insert_turtle(triples)
+    insert_turtle(triples, graph=graph)
 
     # Step 2: Add hilo:triplesPayload to the existing event metadata subject
     triples_escaped = (
@@ -321,10 +400,96 @@ def import_event_triples(event_id: str, triples: str) -> None:
         .replace("\n", "\\n")
         .replace("\r", "\\r")
     )
+    marker = f'<http://hilo.semantics.io/events/meta/{event_id}> hilo:triplesPayload "{triples_escaped}" .'
+    if graph:
+        marker = f"GRAPH <{graph}> {{ {marker} }}"
     sparql = f"""
 PREFIX hilo: <http://hilo.semantics.io/ontology/>
 INSERT DATA {{
-    <http://hilo.semantics.io/events/meta/{event_id}> hilo:triplesPayload "{triples_escaped}" .
+    {marker}
 }}
 """
     _sparql_update(sparql)
+
+
+def drop_peer_graph(source_node: str) -> None:
+    """Purge everything received from a peer — notifications and imported triples — in one DROP."""
+    _sparql_update(f"DROP SILENT GRAPH <{peer_graph(source_node)}>")
+    logger.info("Dropped named graph for peer %s", source_node)
+
+
+def _term_counts(pattern: str, limit: int) -> list[tuple[str, int]]:
+    """(?term, count) for the most frequent IRIs bound to ?term by pattern."""
+    sparql = f"""
+{PREFIXES}
+SELECT ?term (COUNT(*) AS ?count) WHERE {{
+    {_any_graph(pattern + " FILTER(isIRI(?term))")}
+}}
+GROUP BY ?term
+ORDER BY DESC(?count) ?term
+LIMIT {limit}
+"""
+    results = query_data(sparql)
+    return [
+        (b["term"]["value"], int(b["count"]["value"]))
+        for b in results.get("results", {}).get("bindings", [])
+    ]
+
+
+def top_classes(limit: int) -> list[tuple[str, int]]:
+    """The most common rdf:type values across all graphs, with instance counts."""
+    return _term_counts("?s a ?term .", limit)
+
+
+def top_predicates(limit: int) -> list[tuple[str, int]]:
+    """The most common predicates other than rdf:type across all graphs, with triple counts."""
+    return _term_counts("?s ?term ?o . FILTER(?term != rdf:type)", limit)
+
+
+# ── Migration of pre-partitioning peer data ───────────────────────────────────
+
+def legacy_peer_events() -> list[dict]:
+    """Peer notifications stored in the default graph, before peer data had named graphs.
+
+    [{"meta": <metadata subject IRI>, "source_node": ..., "payload": imported Turtle or None}]
+    """
+    sparql = f"""
+{PREFIXES}
+SELECT ?meta ?sourceNode ?payload WHERE {{
+    ?meta a hilo:Event ;
+          hilo:sourceNode ?sourceNode ;
+          hilo:dataUrl ?dataUrl .
+    OPTIONAL {{ ?meta hilo:triplesPayload ?payload . }}
+    FILTER NOT EXISTS {{ GRAPH ?g {{ ?meta a hilo:Event . }} }}
+}}
+"""
+    results = query_data(sparql)
+    return [
+        {
+            "meta": b["meta"]["value"],
+            "source_node": b["sourceNode"]["value"],
+            "payload": b.get("payload", {}).get("value"),
+        }
+        for b in results.get("results", {}).get("bindings", [])
+    ]
+
+
+def move_legacy_event(meta: str, source_node: str, payload: str | None) -> None:
+    """Move one legacy peer notification, and the triples imported for it, into the peer's graph.
+
+    The imported triples are deleted from the default graph before they are
+    inserted into the named graph, so a store whose deletes without a GRAPH clause
+    reach every graph (RDF4J / GraphDB) cannot remove the new copy. Safe to re-run.
+    """
+    graph = peer_graph(source_node)
+    if payload:
+        _sparql_update(_turtle_update("DELETE", payload))
+        insert_turtle(payload, graph=graph)
+    _sparql_update(f"""
+DELETE {{ <{meta}> ?p ?o }}
+INSERT {{ GRAPH <{graph}> {{ <{meta}> ?p ?o }} }}
+WHERE {{
+    <{meta}> ?p ?o .
+    FILTER NOT EXISTS {{ GRAPH ?g {{ <{meta}> ?p ?o }} }}
+}}
+""")
@@ -0,0 +1,117 @@
+"""
+Background dependency probes behind /health, /health/live and /health/ready.
+
+Probing the triple store and RabbitMQ on every health request means orchestrator
+probes add real load (an HTTP round trip plus a full AMQP handshake each time)
+and time out exactly when the node is under pressure. Instead one thread probes
+every dependency in parallel every health_probe_interval seconds, and the health
+endpoints answer from the cached results.
+
+Each dependency's state: status ("ok" or "error: ..."), latency_ms of the last
+probe, last_checked, last_success and consecutive_failures.
+
+With several worker processes only the leader probes (services/leader.py) and
+shares its results; the other workers answer from those. A worker only probes
+itself when nothing has been shared yet.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from config import settings
+from services import graphdb, leader, queue
+
+logger = logging.getLogger(__name__)
+
+# Looked up at call time so tests can patch services.graphdb.check_health etc.
+PROBES: dict[str, Callable[[], str]] = {
+    "graphdb": lambda: graphdb.check_health(),
+    "queue": lambda: queue.check_health(),
+}
+
+_state: dict[str, dict] = {}
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+_executor = ThreadPoolExecutor(max_workers=len(PROBES), thread_name_prefix="health-probe")
+
+
+def _probe(name: str, check: Callable[[], str]) -> None:
+    started = time.perf_counter()
+    now = datetime.now(timezone.utc)
+    try:
+        status = check()
+        ok = True
+    except Exception as exc:
+        status = f"error: {exc}"
+        ok = False
+    latency_ms = round((time.perf_counter() - started) * 1000, 1)
+    with _lock:
+        previous = _state.get(name, {})
+        _state[name] = {
+            "status": status,
+            "latency_ms": latency_ms,
+            "last_checked": now.isoformat(),
+            "last_success": now.isoformat() if ok else previous.get("last_success"),
+            "consecutive_failures": 0 if ok else previous.get("consecutive_failures", 0) + 1,
+        }
+    if not ok:
+        logger.warning("Health probe %s failed (%.0f ms): %s", name, latency_ms, status)
+
+
+def probe_all() -> None:
+    """Probe every dependency in parallel and wait for all of them."""
+    futures = [_executor.submit(_probe, name, check) for name, check in PROBES.items()]
+    for f in futures:
+        f.result()
+    if settings.workers > 1:
+        with _lock:
+            state = {name: dict(dep) for name, dep in _state.items()}
+        leader.share("health", state)
+
+
+def _run() -> None:
+    while not _stop.is_set():
+        try:
+            probe_all()
+        except Exception as exc:
+            logger.warning("Health probe round failed: %s", exc)
+        _stop.wait(settings.health_probe_interval)
+
+
+def start() -> None:
+    """Start the probe thread (idempotent). Called from the app lifespan."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="health-probes", daemon=True)
+    _thread.start()
+
+
+def stop() -> None:
+    _stop.set()
+
+
+def snapshot() -> dict[str, dict]:
+    """Cached state per dependency. Probes synchronously the first time (no cache yet)."""
+    if not leader.is_leader():
+        shared = leader.shared("health")
+        if shared and all(name in shared for name in PROBES):
+            return {name: shared[name] for name in PROBES}
+    with _lock:
+        missing = any(name not in _state for name in PROBES)
+    if missing:
+        probe_all()
+    with _lock:
+        return {name: dict(_state[name]) for name in PROBES}
+
+
+def is_stale(dep: dict) -> bool:
+    """True if the dependency has not been probed for three intervals (the prober is stuck)."""
+    checked = datetime.fromisoformat(dep["last_checked"])
+    age = (datetime.now(timezone.utc) - checked).total_seconds()
+    return age > 3 * settings.health_probe_interval
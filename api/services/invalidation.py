@@ -0,0 +1,78 @@
+"""
+Cross-process cache invalidation for multi-worker serving (settings.workers > 1).
+
+Each worker process keeps its own in-memory caches (verified JWTs, event ETags,
+the dedup filter's recent ids); nothing is shared. When one worker changes the
+state a cache was built from, it calls notify(topic), which replaces a small stamp
+file next to the SQLite database. Before trusting a cache, every worker calls
+stale(topic): one os.stat of the stamp, compared with what the process saw last.
+If it changed, the caller drops the cache and rebuilds it from the source of truth.
+
+Topics:
+  peer_keys — a connection changed (jwt_service public keys, verified and issued tokens)
+  events    — events were stored, imported or purged (event_etags)
+  dedup     — a peer's received ids were forgotten (notification_dedup)
+
+The stamp is written to a temp file and renamed into place, so every notify()
+gives it a new inode and a change is never missed for equal mtimes. The process
+that notifies also sees its own stamp change and drops its cache once more;
+that is cheap and keeps stale() free of races.
+
+With a single worker both functions are no-ops.
+"""
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_UNSEEN = object()
+_seen: dict[str, object] = {}
+_lock = threading.Lock()
+
+
+def _stamp_path(topic: str) -> Path:
+    return Path(settings.db_path).parent / "invalidation" / topic
+
+
+def _read_stamp(topic: str) -> Optional[tuple[int, int]]:
+    try:
+        st = os.stat(_stamp_path(topic))
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+def notify(topic: str) -> None:
+    """Tell every worker process that caches built for topic are stale."""
+    if settings.workers <= 1:
+        return
+    path = _stamp_path(topic)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{topic}.")
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.warning("Could not publish %s invalidation: %s", topic, exc)
+
+
+def stale(topic: str) -> bool:
+    """True if topic was notified (by any process) since this process last asked.
+
+    The first call in a process is always True: a cache filled before it cannot
+    be known to be current.
+    """
+    if settings.workers <= 1:
+        return False
+    stamp = _read_stamp(topic)
+    with _lock:
+        previous = _seen.get(topic, _UNSEEN)
+        _seen[topic] = stamp
+    return previous is _UNSEEN or previous != stamp
@@ -1,14 +1,43 @@
 """
-JWT service — sign and verify RS256 tokens for inter-node authentication.
+JWT service — sign and verify RS256 / EdDSA tokens for inter-node authentication.
 
-Sign: this node signs tokens with its private RSA key.
+Sign: this node signs tokens with its private RSA or Ed25519 key.
 Verify: peer tokens are verified against the peer's stored public key.
 
+Algorithms:
+  A node always has an RSA-2048 key (RS256 — all protocol version 2 peers know it)
+  and, when "EdDSA" is in settings.jwt_algorithms, an Ed25519 key next to it.
+  Both are advertised in /.well-known/hilo-node. When a connection is made each
+  side picks the first algorithm in SUPPORTED_ALGORITHMS that both nodes support
+  (select_peer_key) and stores the peer's key for it. Since both sides pick the
+  same way, the stored key's type is the connection's algorithm in both directions:
+  tokens for a peer are signed with the algorithm of that peer's stored key, and a
+  token is only accepted in the algorithm of the issuer's stored key.
+
+Caches (sign_token):
+  - the parsed private key, reloaded only when the key file changes (mtime/size/inode)
+  - issued tokens per audience, reused until jwt_reuse_margin_seconds before exp
+
+Caches (require_jwt):
+  - parsed public keys per peer, so SQLite and PEM parsing are skipped
+  - verified tokens by SHA-256 digest until their exp, so a peer's repeated
+    requests with the same token skip signature verification entirely
+  Both are dropped for a peer by forget_peer(), which services/connections.py
+  calls on every connection state change (accept, reject, delete, ...).
+
+With several worker processes (settings.workers > 1), forget_peer() also notifies
+the other workers through services/invalidation.py; they drop all of these caches
+(except the private key, which has its own file check) before their next use.
+
 Upgrade path to V4 (EU Wallet VCs):
   Change verify_token to resolve the public key from a DID document
   instead of SQLite. JWT format, signing, and API contract stay identical.
 """
+import hashlib
 import logging
+import os
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
@@ -16,39 +45,122 @@ import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+import metrics
 from config import settings
+from services import invalidation
 
 logger = logging.getLogger(__name__)
 
 _bearer = HTTPBearer(auto_error=False)
 
+_cache_lock = threading.Lock()
+# peer_node_id → parsed public key object
+_public_keys: dict[str, object] = {}
+# sha256(token) → verified payload (its exp bounds the entry's lifetime)
+_verified: dict[str, dict] = {}
+
+SUPPORTED_ALGORITHMS = ("EdDSA", "RS256")  # preference order — must be the same on every node
+
+_signing_lock = threading.Lock()
+# algorithm → ((path, st_mtime_ns, st_size, st_ino) of the key file, parsed private key)
+_signing_keys: dict[str, tuple[tuple, object]] = {}
+# audience → (token, expires_at)
+_issued: dict[str, tuple[str, datetime]] = {}
+
+
+def local_algorithms() -> list[str]:
+    """Algorithms this node offers, in preference order."""
+    return [alg for alg in SUPPORTED_ALGORITHMS if alg in settings.jwt_algorithms]
 
-def _load_private_key():
-    """Load RSA private key from disk. Called once per request (file is cached by OS)."""
-    from cryptography.hazmat.primitives.serialization import load_pem_private_key
 
-    with open(settings.private_key_path, "rb") as f:
-        return load_pem_private_key(f.read(), password=None)
+def key_path(algorithm: str) -> str:
+    """Private key file for an algorithm; the public key is next to it with a .pub suffix."""
+    return settings.private_key_path if algorithm == "RS256" else settings.private_key_path + ".ed25519"
 
 
-def _load_public_key_pem() -> str:
-    """Return this node's public key as PEM string."""
-    pub_path = settings.private_key_path + ".pub"
-    with open(pub_path, "r") as f:
+def algorithm_of(key) -> str:
+    """JWT algorithm for a parsed public or private key."""
+    from cryptography.hazmat.primitives.asymmetric import ed25519
+
+    if isinstance(key, (ed25519.Ed25519PublicKey, ed25519.Ed25519PrivateKey)):
+        return "EdDSA"
+    return "RS256"
+
+
+def select_peer_key(
+    peer_algorithms: list[str], peer_public_keys: dict[str, str], legacy_public_key: Optional[str],
+) -> Optional[tuple[str, str]]:
+    """(algorithm, PEM) of the peer key to store for a new connection, or None if there is no common algorithm.
+
+    legacy_public_key is the RSA key in the version 2 public_key field.
+    """
+    for alg in local_algorithms():
+        if alg not in peer_algorithms:
+            continue
+        pem = peer_public_keys.get(alg) or (legacy_public_key if alg == "RS256" else None)
+        if pem:
+            return alg, pem
+    return None
+
+
+def _load_private_key(algorithm: str = "RS256"):
+    """Parsed private key, re-read from disk only when the key file has changed.
+
+    A changed key file also drops every issued token, since they were signed with the old key.
+    """
+    from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+    path = key_path(algorithm)
+    st = os.stat(path)
+    stamp = (path, st.st_mtime_ns, st.st_size, st.st_ino)
+    with _signing_lock:
+        cached = _signing_keys.get(algorithm)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+    with open(path, "rb") as f:
+        key = load_pem_private_key(f.read(), password=None)
+    with _signing_lock:
+        if cached is not None:
+            logger.info("Private key at %s changed — reloaded", path)
+        _signing_keys[algorithm] = (stamp, key)
+        _issued.clear()
+    return key
+
+
+def load_public_key_pem(algorithm: str = "RS256") -> str:
+    """Return this node's public key for an algorithm as PEM string."""
+    with open(key_path(algorithm) + ".pub", "r") as f:
         return f.read()
 
 
-def sign_token(audience: str) -> tuple[str, datetime]:
-    """Sign a fresh RS256 JWT for the given audience (peer_node_id).
+def _signing_algorithm(audience: str) -> str:
+    """The connection's algorithm: the type of the key stored for the peer (RS256 if none)."""
+    peer_key = _peer_public_key(audience)
+    return algorithm_of(peer_key) if peer_key is not None else "RS256"
+
+
+def sign_token(audience: str, fresh: bool = False) -> tuple[str, datetime]:
+    """JWT for the given audience (peer_node_id), in the connection's algorithm.
+
+    A token issued earlier for the same audience is reused until it is within
+    jwt_reuse_margin_seconds of expiring. fresh=True always signs a new one
+    (e.g. after the peer rejected the reused token).
 
     Returns (token_string, expires_at).
     """
-    private_key = _load_private_key()
+    _sync_with_other_workers()
+    algorithm = _signing_algorithm(audience)
+    private_key = _load_private_key(algorithm)
     aud = audience
     issuer = settings.node_id
     expiry_minutes = settings.jwt_expiry_minutes
 
     now = datetime.now(timezone.utc)
+    if not fresh:
+        with _signing_lock:
+            cached = _issued.get(aud)
+        if cached and (cached[1] - now).total_seconds() > settings.jwt_reuse_margin_seconds:
+            return cached
     expires_at = now + timedelta(minutes=expiry_minutes)
 
     payload = {
@@ -58,27 +170,103 @@ def sign_token(audience: str) -> tuple[str, datetime]:
         "exp": expires_at,
     }
 
-    token = jwt.encode(payload, private_key, algorithm="RS256")
+    token = jwt.encode(payload, private_key, algorithm=algorithm)
+    with _signing_lock:
+        _issued[aud] = (token, expires_at)
     return token, expires_at
 
 
-def verify_token(token: str, peer_public_key_pem: str) -> dict:
-    """Verify an RS256 JWT against the peer's public key.
+def verify_token(token: str, peer_public_key) -> dict:
+    """Verify a JWT against the peer's public key (PEM string or parsed key).
+
+    Only the key's own algorithm is accepted (RS256 for RSA, EdDSA for Ed25519).
 
     Raises jwt.PyJWTError on any failure (expired, bad sig, wrong aud).
     Returns the decoded payload on success.
     """
-    from cryptography.hazmat.primitives.serialization import load_pem_public_key
+    if isinstance(peer_public_key, str):
+        from cryptography.hazmat.primitives.serialization import load_pem_public_key
 
-    public_key = load_pem_public_key(peer_public_key_pem.encode())
+        public_key = load_pem_public_key(peer_public_key.encode())
+    else:
+        public_key = peer_public_key
     audience = settings.jwt_audience or settings.node_id
 
-    return jwt.decode(
-        token,
-        public_key,
-        algorithms=["RS256"],
-        audience=audience,
-    )
+    with metrics.timed("jwt", "verify"):
+        return jwt.decode(
+            token,
+            public_key,
+            algorithms=[algorithm_of(public_key)],
+            audience=audience,
+        )
+
+
+# ── Verification caches ───────────────────────────────────────────────────────
+
+def _sync_with_other_workers() -> None:
+    """Drop every cached key and token if another worker process changed a connection."""
+    if invalidation.stale("peer_keys"):
+        with _cache_lock:
+            _public_keys.clear()
+            _verified.clear()
+        with _signing_lock:
+            _issued.clear()
+
+
+def _peer_public_key(peer_node_id: str):
+    """Parsed public key of an active peer, or None. Cached until forget_peer()."""
+    with _cache_lock:
+        key = _public_keys.get(peer_node_id)
+    if key is not None:
+        return key
+
+    from cryptography.hazmat.primitives.serialization import load_pem_public_key
+    from services.connections import get_peer_public_key
+
+    pem = get_peer_public_key(peer_node_id)
+    if not pem:
+        return None
+    key = load_pem_public_key(pem.encode())
+    with _cache_lock:
+        _public_keys[peer_node_id] = key
+    return key
+
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _cached_payload(digest: str) -> Optional[dict]:
+    with _cache_lock:
+        payload = _verified.get(digest)
+        if payload is not None and payload["exp"] <= time.time():
+            del _verified[digest]
+            return None
+    return payload
+
+
+def _remember(digest: str, payload: dict) -> None:
+    if "exp" not in payload:  # no lifetime to bound the entry by
+        return
+    with _cache_lock:
+        if len(_verified) >= settings.jwt_verified_cache_size:
+            now = time.time()
+            for d in [d for d, p in _verified.items() if p["exp"] <= now]:
+                del _verified[d]
+            while len(_verified) >= settings.jwt_verified_cache_size:
+                del _verified[next(iter(_verified))]  # oldest first
+        _verified[digest] = payload
+
+
+def forget_peer(peer_node_id: str) -> None:
+    """Drop the peer's cached public key, every verified token it issued and our token for it."""
+    with _cache_lock:
+        _public_keys.pop(peer_node_id, None)
+        for d in [d for d, p in _verified.items() if p.get("iss") == peer_node_id]:
+            del _verified[d]
+    with _signing_lock:
+        _issued.pop(peer_node_id, None)
+    invalidation.notify("peer_keys")
 
 
 def require_jwt(
@@ -88,7 +276,7 @@ def require_jwt(
 
     Accepts:
       - HILO_INTERNAL_KEY bearer token (local UI bypass)
-      - Valid RS256 JWT signed by a known connected peer
+      - Valid RS256/EdDSA JWT signed by a known connected peer
 
     Raises 401 on missing/invalid/expired token.
     """
@@ -105,9 +293,14 @@ def require_jwt(
     if token == settings.internal_key:
         return {"sub": "internal", "iss": settings.node_id}
 
-    # RS256 JWT — look up issuer's public key from active connections
-    from services.connections import get_peer_public_key
+    # Already verified and not yet expired — skip SQLite and crypto
+    _sync_with_other_workers()
+    digest = _digest(token)
+    payload = _cached_payload(digest)
+    if payload is not None:
+        return dict(payload)
 
+    # Peer JWT — look up issuer's public key from active connections
     try:
         # Decode without verification first to extract issuer
         unverified = jwt.decode(token, options={"verify_signature": False})
@@ -115,11 +308,13 @@ def require_jwt(
         if not peer_node_id:
             raise ValueError("Missing iss claim")
 
-        peer_pub_key = get_peer_public_key(peer_node_id)
-        if not peer_pub_key:
+        peer_pub_key = _peer_public_key(peer_node_id)
+        if peer_pub_key is None:
             raise ValueError(f"No public key for peer {peer_node_id!r}")
 
-        return verify_token(token, peer_pub_key)
+        payload = verify_token(token, peer_pub_key)
+        _remember(digest, payload)
+        return dict(payload)
 
     except jwt.ExpiredSignatureError:
         raise HTTPException(
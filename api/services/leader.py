@@ -0,0 +1,140 @@
+"""
+One worker process runs the periodic pollers when the API has several (settings.workers > 1).
+
+The queue stats sampler, the health probes, the graph summary refresh and the
+idle-peer RTT probes each poll something on a timer. Run in every worker they
+would multiply the load on the RabbitMQ management API, the triple store and the
+peers by the number of workers. Instead the worker holding an exclusive flock on
+pollers.lock (next to the SQLite database) runs them — the leader. The other
+workers retry the lock every leader_retry_seconds, so when the leader exits or
+is replaced by uvicorn, another worker takes over.
+
+The leader saves what the pollers produce with share(); the other workers read
+it with shared(). RTT state stays per process: every worker still measures its
+own calls to peers, only the probes of idle peers run once.
+
+With a single worker this process always leads and nothing is shared.
+
+Schema:
+  poller_results (
+    name TEXT PRIMARY KEY,  -- queue_stats | health | graph_summary
+    value TEXT,             -- JSON
+    updated_at TEXT
+  )
+"""
+import fcntl
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from config import settings
+from services import sqlite_pool
+
+logger = logging.getLogger(__name__)
+
+_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS poller_results (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+_lock_file = None  # open while this process is the leader
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def _conn():
+    return sqlite_pool.connect(_DB_SCHEMA)
+
+
+def _lock_path() -> Path:
+    return Path(settings.db_path).parent / "pollers.lock"
+
+
+def is_leader() -> bool:
+    """True if this process runs the pollers (always, with a single worker)."""
+    return settings.workers <= 1 or _lock_file is not None
+
+
+def _try_acquire() -> bool:
+    global _lock_file
+    path = _lock_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = open(path, "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return False
+    _lock_file = lock_file
+    return True
+
+
+def _run(on_elected: Callable[[], None]) -> None:
+    while not _stop.is_set():
+        try:
+            if _try_acquire():
+                logger.info("This worker (pid %d) runs the periodic pollers", os.getpid())
+                on_elected()
+                return
+        except OSError as exc:
+            logger.warning("Pollers lock unavailable: %s", exc)
+        _stop.wait(settings.leader_retry_seconds)
+
+
+def start(on_elected: Callable[[], None]) -> None:
+    """Call on_elected() once this process leads. Called from the app lifespan.
+
+    With a single worker it is called right away; otherwise a thread waits for the lock.
+    """
+    global _thread
+    if settings.workers <= 1:
+        on_elected()
+        return
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, args=(on_elected,), name="pollers-leader", daemon=True)
+    _thread.start()
+
+
+def stop() -> None:
+    """Stop waiting for the lock and release it. Stop the pollers first."""
+    global _lock_file
+    _stop.set()
+    if _lock_file is not None:
+        _lock_file.close()  # closing the file releases the flock
+        _lock_file = None
+
+
+def share(name: str, value: Any) -> None:
+    """Save a poller's latest result for the other workers (no-op with a single worker)."""
+    if settings.workers <= 1:
+        return
+    try:
+        with _conn() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO poller_results (name, value, updated_at) VALUES (?, ?, ?)",
+                (name, json.dumps(value, default=str), datetime.now(timezone.utc).isoformat()),
+            )
+            db.commit()
+    except sqlite3.Error as exc:
+        logger.warning("Could not share %s with the other workers: %s", name, exc)
+
+
+def shared(name: str) -> Optional[Any]:
+    """The leader's latest result for name, or None if there is none yet."""
+    try:
+        with _conn() as db:
+            row = db.execute("SELECT value FROM poller_results WHERE name = ?", (name,)).fetchone()
+    except sqlite3.Error as exc:
+        logger.warning("Could not read %s shared by the leader: %s", name, exc)
+        return None
+    return json.loads(row["value"]) if row else None
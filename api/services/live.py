@@ -0,0 +1,223 @@
+"""
+Server-Sent Events hub behind GET /live.
+
+One process-wide producer, any number of viewers: routes publish to the hub when
+something changes, and every open stream receives the message. The UI no longer
+polls events, connections and queue stats every 10 seconds per tab.
+
+Topics:
+  hello          — sent first on every (re)connect; clients reload their state on it
+  event          — a new event was stored or a peer notification received (EventResponse)
+  event_updated  — an event's state changed, e.g. imported ({"id", "has_local_copy"})
+  events_purged  — a peer's events were dropped on disconnect ({"source_node"})
+  connection     — a connection changed state ({"peer_node_id", "status"}; "deleted" on removal)
+  queue_stats    — queue stats changed (the same body as GET /queue/stats)
+
+Queue stats come from the background sampler (services/queue_sampler.py) and are
+published only when they differ from the previous sample.
+
+Publishers are sync route handlers running on the threadpool; each subscriber is
+an asyncio.Queue on the event loop, fed through call_soon_threadsafe. A subscriber
+that falls more than live_max_backlog messages behind is disconnected — the
+browser's EventSource reconnects and the hello message makes it reload.
+
+With several worker processes (settings.workers > 1) a stream only sees its own
+worker's publishes, so every publish (queue_stats too: only the leader samples,
+see services/leader.py) is also written to the live_relay SQLite table. A relay thread per worker
+reads the other workers' rows every live_relay_poll_seconds and hands them to its
+own streams. Rows older than _RELAY_RETENTION_SECONDS are pruned.
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import AsyncIterator, Optional
+
+from config import settings
+from services import queue_sampler, sqlite_pool
+
+logger = logging.getLogger(__name__)
+
+_CLOSE = object()  # sentinel: the subscriber overflowed and must reconnect
+
+
+class _Subscriber:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.live_max_backlog)
+
+    def offer(self, message) -> None:
+        """Runs on the subscriber's loop."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_CLOSE)
+
+
+_subscribers: set[_Subscriber] = set()
+_lock = threading.Lock()
+_last_queue_stats: Optional[dict] = None
+
+
+def _format(topic: str, data) -> str:
+    return f"event: {topic}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def publish(topic: str, data) -> None:
+    """Send a message to every open stream. Never blocks and never raises."""
+    relayed = settings.workers > 1
+    if not relayed and subscriber_count() == 0:
+        return
+    message = _format(topic, data)
+    if relayed:
+        _relay(message)
+    _fan_out(message)
+
+
+def _fan_out(message: str) -> None:
+    with _lock:
+        subscribers = list(_subscribers)
+    for sub in subscribers:
+        try:
+            sub.loop.call_soon_threadsafe(sub.offer, message)
+        except RuntimeError:  # loop closed — the stream is going away
+            pass
+
+
+def subscriber_count() -> int:
+    with _lock:
+        return len(_subscribers)
+
+
+# ── Queue stats ───────────────────────────────────────────────────────────────
+
+def _on_queue_stats(snapshot: dict) -> None:
+    """Listener on services/queue_sampler.py — forward only samples that changed."""
+    global _last_queue_stats
+    stats = {k: v for k, v in snapshot.items() if k != "sampled_at"}
+    if stats == _last_queue_stats:
+        return
+    _last_queue_stats = stats
+    publish("queue_stats", snapshot)
+
+
+queue_sampler.add_listener(_on_queue_stats)
+
+
+# ── Cross-worker relay ────────────────────────────────────────────────────────
+
+_RELAY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS live_relay (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin INTEGER NOT NULL,
+    message TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+_RELAY_RETENTION_SECONDS = 60
+
+_relay_thread: Optional[threading.Thread] = None
+_relay_stop = threading.Event()
+
+
+def _relay_conn():
+    return sqlite_pool.connect(_RELAY_SCHEMA)
+
+
+def _relay(message: str) -> None:
+    try:
+        with _relay_conn() as db:
+            db.execute(
+                "INSERT INTO live_relay (origin, message, created_at) VALUES (?, ?, ?)",
+                (os.getpid(), message, time.time()),
+            )
+            db.commit()
+    except sqlite3.Error as exc:
+        logger.warning("Live: could not relay message to other workers: %s", exc)
+
+
+def relay_once(after_id: int) -> int:
+    """Hand other workers' messages newer than after_id to this worker's streams.
+
+    Returns the id to continue from.
+    """
+    with _relay_conn() as db:
+        rows = db.execute(
+            "SELECT id, origin, message FROM live_relay WHERE id > ? ORDER BY id", (after_id,)
+        ).fetchall()
+    for row in rows:
+        if row["origin"] != os.getpid():
+            _fan_out(row["message"])
+    return rows[-1]["id"] if rows else after_id
+
+
+def _prune() -> None:
+    with _relay_conn() as db:
+        db.execute("DELETE FROM live_relay WHERE created_at < ?", (time.time() - _RELAY_RETENTION_SECONDS,))
+        db.commit()
+
+
+def _run_relay() -> None:
+    try:
+        with _relay_conn() as db:
+            last_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM live_relay").fetchone()[0]
+    except sqlite3.Error as exc:
+        logger.warning("Live: relay disabled, could not open live_relay: %s", exc)
+        return
+    last_pruned = time.monotonic()
+    while not _relay_stop.wait(settings.live_relay_poll_seconds):
+        try:
+            last_id = relay_once(last_id)
+            if time.monotonic() - last_pruned > _RELAY_RETENTION_SECONDS:
+                _prune()
+                last_pruned = time.monotonic()
+        except sqlite3.Error as exc:
+            logger.warning("Live: relay round failed: %s", exc)
+
+
+def start() -> None:
+    """Start the relay thread when running with several workers (idempotent)."""
+    global _relay_thread
+    if settings.workers <= 1 or (_relay_thread is not None and _relay_thread.is_alive()):
+        return
+    _relay_stop.clear()
+    _relay_thread = threading.Thread(target=_run_relay, name="live-relay", daemon=True)
+    _relay_thread.start()
+
+
+def stop() -> None:
+    _relay_stop.set()
+
+
+# ── Streams ───────────────────────────────────────────────────────────────────
+
+async def stream(is_disconnected) -> AsyncIterator[str]:
+    """Yield SSE frames until the client disconnects (or overflows its backlog)."""
+    sub = _Subscriber(asyncio.get_running_loop())
+    with _lock:
+        _subscribers.add(sub)
+    try:
+        yield f"retry: {settings.live_retry_ms}\n" + _format("hello", {"node_id": settings.node_id})
+        latest = queue_sampler.latest()
+        if latest is not None:
+            yield _format("queue_stats", latest)
+        while True:
+            try:
+                message = await asyncio.wait_for(sub.queue.get(), timeout=settings.live_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    return
+                yield ": keep-alive\n\n"  # comment frame — keeps tunnels and proxies from idling out
+                continue
+            if message is _CLOSE:
+                logger.info("Live: subscriber fell behind — closing so it reconnects")
+                return
+            yield message
+    finally:
+        with _lock:
+            _subscribers.discard(sub)
@@ -2,12 +2,31 @@
 
 Uses Claude Sonnet 4.6 via the Anthropic SDK. The API key is read from
 settings.anthropic_api_key (mapped from HILO_ANTHROPIC_API_KEY in the container).
+
+The SDK takes about a second to import, so it is imported on the first question
+rather than when the API starts. One client is kept for the process, so its
+connection pool (and TLS session) is reused across questions; it is rebuilt only
+if the API key setting changes.
+
+The system prompt is sent as two blocks, each marked with cache_control so the
+provider caches the prompt prefix (cheaper input tokens, faster first token):
+  1. _SYSTEM_PROMPT — static, cached across every question
+  2. the graph summary (services/graph_summary.py) — changes only when a periodic
+     refresh finds different classes, predicates or (rounded) counts
+The question itself follows as the only uncached part.
 """
+import hashlib
+import logging
 import re
-
-import anthropic
+import threading
+from typing import Optional
 
 from config import settings
+from services import graph_summary
+
+logger = logging.getLogger(__name__)
+
+MODEL = "claude-sonnet-4-6"
 
 # ─── System prompt ────────────────────────────────────────────────────────────
 
@@ -128,6 +147,37 @@ ORDER BY DESC(?count)
 LIMIT 50
 """
 
+# Cached translations (services/translation_cache.py) are only valid for the model and
+# prompt that produced them. The graph summary is left out on purpose: it changes with
+# the data, and translations still expire after translation_cache_ttl_seconds.
+PROMPT_VERSION = hashlib.sha256(f"{MODEL}\n{_SYSTEM_PROMPT}".encode()).hexdigest()[:12]
+
+_client = None
+_client_key: Optional[str] = None
+_client_lock = threading.Lock()
+
+
+def _get_client():
+    """Shared anthropic.Anthropic client for the configured API key."""
+    global _client, _client_key
+    with _client_lock:
+        if _client is None or _client_key != settings.anthropic_api_key:
+            import anthropic
+
+            _client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
+            _client_key = settings.anthropic_api_key
+        return _client
+
+
+def _system_blocks() -> list[dict]:
+    """System prompt blocks, each ending a cached prefix."""
+    blocks = [{"type": "text", "text": _SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
+    summary = graph_summary.text()
+    if summary:
+        blocks.append({"type": "text", "text": summary, "cache_control": {"type": "ephemeral"}})
+    return blocks
+
+
 # ─── Public function ──────────────────────────────────────────────────────────
 
 def translate_to_sparql(question: str) -> str:
@@ -137,15 +187,21 @@ def translate_to_sparql(question: str) -> str:
         ValueError: if the LLM response is not a SELECT query.
         anthropic.APIError: if the Anthropic API call fails.
     """
-    client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-
-    message = client.messages.create(
-        model="claude-sonnet-4-6",
+    message = _get_client().messages.create(
+        model=MODEL,
         max_tokens=600,
         timeout=30.0,
-        system=_SYSTEM_PROMPT,
+        system=_system_blocks(),
         messages=[{"role": "user", "content": question}],
     )
+    usage = getattr(message, "usage", None)
+    if usage is not None:
+        logger.debug(
+            "Ask AI prompt: %s tokens read from cache, %s written, %s uncached",
+            getattr(usage, "cache_read_input_tokens", None),
+            getattr(usage, "cache_creation_input_tokens", None),
+            getattr(usage, "input_tokens", None),
+        )
 
     raw = message.content[0].text.strip()
 
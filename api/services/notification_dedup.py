@@ -0,0 +1,278 @@
+"""
+Duplicate detection for incoming peer notifications.
+
+Source-node retries mean the same EventNotification often arrives several times.
+Three layers answer "have we stored this event_id already?" without touching the
+triple store:
+
+  1. Exact set of the most recent event_ids (LRU, in memory)
+  2. Bloom filter over every event_id seen — a miss proves the id is new
+  3. SQLite table received_notifications — settles Bloom false positives and
+     survives restarts (the Bloom filter is rebuilt from it on first use)
+
+Retries arrive within minutes, so ids are kept for dedup_retention_days and at
+most dedup_max_rows of them; older rows are pruned on load and then hourly. The
+Bloom filter is sized from the pruned row count (~1% false positives with room to
+double) and loaded in batches of _LOAD_BATCH rows. Once it holds more ids than it
+was sized for, it is rebuilt from SQLite on the next check.
+
+With several worker processes (settings.workers > 1), each has its own layers 1
+and 2, and an id stored by another worker is in neither. A Bloom miss then falls
+through to SQLite instead of proving the id new, and forget_source() tells the
+other workers (services/invalidation.py) to rebuild their layers.
+
+Schema:
+  received_notifications (
+    id INTEGER PRIMARY KEY,  -- insertion order, for warming the recent set
+    event_id TEXT UNIQUE,
+    source_node TEXT,
+    received_at TEXT
+  )
+  + index on source_node (forget_source)
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from config import settings
+from services import invalidation, sqlite_pool
+
+logger = logging.getLogger(__name__)
+
+_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS received_notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT UNIQUE NOT NULL,
+    source_node TEXT NOT NULL,
+    received_at TEXT NOT NULL
+);
+"""
+
+_LOAD_BATCH = 10_000  # rows per query when warming the in-memory layers
+_PRUNE_INTERVAL = 3600.0  # seconds between retention passes while running
+_BITS_PER_ID = 10  # ~1% false positives with 7 hashes
+_MIN_BLOOM_IDS = 100_000
+
+
+def _conn():
+    return sqlite_pool.connect()
+
+
+def _bloom_capacity(stored: int) -> int:
+    """Ids to size the Bloom filter for: room for the (pruned) stored ids to double."""
+    return max(_MIN_BLOOM_IDS, 2 * stored)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings. No false negatives; false positives at ~1%
+    once it holds size_bits / 10 items."""
+
+    def __init__(self, size_bits: int = 1 << 23, hashes: int = 7):
+        self._size = size_bits
+        self._hashes = hashes
+        self._bits = bytearray((size_bits + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self._size for i in range(self._hashes))
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class DuplicateFilter:
+    """Bloom filter + recent-ID LRU + SQLite, with hit counters. Thread-safe."""
+
+    def __init__(self, recent_size: int = 10_000, bloom_bits: Optional[int] = None):
+        self._lock = threading.Lock()
+        self._bloom_bits = bloom_bits  # fixed size; None sizes it from the stored ids
+        self._bloom_capacity = (bloom_bits or _BITS_PER_ID * _MIN_BLOOM_IDS) // _BITS_PER_ID
+        self._bloom = BloomFilter(self._bloom_capacity * _BITS_PER_ID)
+        self._bloom_count = 0
+        self._recent: OrderedDict[str, None] = OrderedDict()
+        self._recent_size = recent_size
+        self._loaded = False
+        self._last_prune = 0.0
+        self.received = 0
+        self.duplicates = 0
+
+    def _prune(self, db) -> int:
+        """Delete ids past dedup_retention_days, then the oldest beyond dedup_max_rows."""
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=settings.dedup_retention_days)).isoformat()
+        pruned = db.execute("DELETE FROM received_notifications WHERE received_at < ?", (cutoff,)).rowcount
+        pruned += db.execute(
+            """DELETE FROM received_notifications WHERE id <= (
+                   SELECT id FROM received_notifications ORDER BY id DESC LIMIT 1 OFFSET ?
+               )""",
+            (settings.dedup_max_rows,),
+        ).rowcount
+        db.commit()
+        self._last_prune = time.monotonic()
+        if pruned:
+            logger.info("Dedup: pruned %d stored notification ids", pruned)
+        return pruned
+
+    def _ensure_loaded(self) -> None:
+        """Create the table, prune it and warm the Bloom filter and recent set from it (once)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with _conn() as db:
+                db.execute(_DB_SCHEMA)
+                columns = {r[1] for r in db.execute("PRAGMA table_info(received_notifications)")}
+                if "source_node" not in columns:
+                    db.execute("ALTER TABLE received_notifications ADD COLUMN source_node TEXT NOT NULL DEFAULT ''")
+                db.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_received_notifications_source ON received_notifications (source_node)"
+                )
+                db.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_received_notifications_received ON received_notifications (received_at)"
+                )
+                db.commit()
+                self._prune(db)
+                stored = db.execute("SELECT COUNT(*) FROM received_notifications").fetchone()[0]
+                if self._bloom_bits is None:
+                    self._bloom_capacity = _bloom_capacity(stored)
+                self._bloom = BloomFilter(self._bloom_capacity * _BITS_PER_ID)
+                self._bloom_count = 0
+                last_id = 0
+                while True:
+                    rows = db.execute(
+                        "SELECT id, event_id FROM received_notifications WHERE id > ? ORDER BY id LIMIT ?",
+                        (last_id, _LOAD_BATCH),
+                    ).fetchall()
+                    if not rows:
+                        break
+                    for _, event_id in rows:
+                        self._add(event_id)
+                    last_id = rows[-1][0]
+        except sqlite3.Error as exc:
+            logger.warning("Dedup: could not load received_notifications (%s) — memory-only until restart", exc)
+            return
+        logger.info(
+            "Dedup: warmed from %d stored notification ids (Bloom filter sized for %d)",
+            self._bloom_count, self._bloom_capacity,
+        )
+
+    def _add(self, event_id: str) -> None:
+        """Add to the Bloom filter and the recent set. Caller holds the lock."""
+        self._bloom.add(event_id)
+        self._bloom_count += 1
+        self._recent[event_id] = None
+        self._recent.move_to_end(event_id)
+        while len(self._recent) > self._recent_size:
+            self._recent.popitem(last=False)
+
+    def _persisted(self, event_id: str) -> bool:
+        try:
+            with _conn() as db:
+                row = db.execute(
+                    "SELECT 1 FROM received_notifications WHERE event_id = ?", (event_id,)
+                ).fetchone()
+            return row is not None
+        except sqlite3.Error as exc:
+            logger.warning("Dedup: persistent check failed for %s: %s", event_id, exc)
+            return False
+
+    def check(self, event_id: str) -> bool:
+        """Count an arrival and return True if event_id has already been stored."""
+        if invalidation.stale("dedup"):
+            self._reset()
+        with self._lock:
+            self._ensure_loaded()
+            self.received += 1
+            if event_id in self._recent:
+                self._recent.move_to_end(event_id)
+                self.duplicates += 1
+                return True
+            maybe_seen = event_id in self._bloom
+        if not maybe_seen and settings.workers <= 1:
+            # With several workers another process may have stored it; only SQLite knows
+            return False
+        seen = self._persisted(event_id)
+        if seen:
+            with self._lock:
+                self.duplicates += 1
+        return seen
+
+    def remember(self, event_id: str, source_node: str) -> None:
+        """Record event_id as stored. Call only after the triple-store write succeeded."""
+        with self._lock:
+            self._ensure_loaded()
+            self._add(event_id)
+            if self._bloom_bits is None and self._bloom_count > self._bloom_capacity:
+                # Past its sizing the false-positive rate climbs; rebuild (bigger) from SQLite
+                self._loaded = False
+            prune = time.monotonic() - self._last_prune > _PRUNE_INTERVAL
+            if prune:
+                self._last_prune = time.monotonic()
+        try:
+            with _conn() as db:
+                db.execute(
+                    "INSERT OR IGNORE INTO received_notifications (event_id, source_node, received_at) VALUES (?, ?, ?)",
+                    (event_id, source_node, datetime.now(timezone.utc).isoformat()),
+                )
+                db.commit()
+                if prune:
+                    self._prune(db)
+        except sqlite3.Error as exc:
+            logger.warning("Dedup: could not persist %s: %s", event_id, exc)
+
+    def forget_source(self, source_node: str) -> None:
+        """Drop every id received from source_node (after its graph was purged).
+
+        A Bloom filter cannot delete, so the in-memory layers are rebuilt from SQLite.
+        """
+        try:
+            with _conn() as db:
+                db.execute("DELETE FROM received_notifications WHERE source_node = ?", (source_node,))
+                db.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Dedup: could not forget ids from %s: %s", source_node, exc)
+        self._reset()
+        invalidation.notify("dedup")
+
+    def _reset(self) -> None:
+        with self._lock:
+            self._recent.clear()
+            self._loaded = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            rate = self.duplicates / self.received if self.received else 0.0
+            return {
+                "received": self.received,
+                "duplicates": self.duplicates,
+                "duplicate_rate": round(rate, 4),
+            }
+
+
+_filter = DuplicateFilter()
+
+
+def is_duplicate(event_id: str) -> bool:
+    return _filter.check(event_id)
+
+
+def mark_stored(event_id: str, source_node: str) -> None:
+    _filter.remember(event_id, source_node)
+
+
+def forget_source(source_node: str) -> None:
+    _filter.forget_source(source_node)
+
+
+def get_stats() -> dict:
+    return _filter.stats()
@@ -0,0 +1,133 @@
+"""
+On-disk cache of peer event payloads — the JSON a source node returns from GET /events/{id}.
+
+Payloads are cached, not imported: nothing is written to the triple store, so the
+Events page can show a peer event's triples instantly (and after the source goes
+offline) while "Store locally" remains an explicit operator action.
+
+Layout: {payload_cache_dir}/{source_node}/{event_id}.json — one directory per peer,
+so purging a peer is a single rmtree. When the cache grows past payload_cache_max_mb
+the least recently written files are evicted.
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+from urllib.parse import quote
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_total_bytes: Optional[int] = None  # lazily computed on first write
+
+
+def _root() -> Path:
+    return Path(settings.payload_cache_dir)
+
+
+def _path(source_node: str, event_id: str) -> Path:
+    return _root() / quote(source_node, safe="") / f"{quote(event_id, safe='')}.json"
+
+
+def _files() -> list[Path]:
+    root = _root()
+    return [p for p in root.glob("*/*.json")] if root.exists() else []
+
+
+def _entries() -> list[tuple[float, int, Path]]:
+    """(mtime, size, path) of every cached file, skipping files deleted meanwhile."""
+    entries = []
+    for p in _files():
+        try:
+            st = p.stat()
+        except FileNotFoundError:  # evicted or purged by another thread or worker
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+    return entries
+
+
+def get(source_node: str, event_id: str) -> Optional[dict]:
+    """Return the cached payload for event_id, or None on a miss (or an unreadable file)."""
+    path = _path(source_node, event_id)
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.warning("Payload cache: unreadable entry %s (%s) — ignoring", path, exc)
+        return None
+
+
+def contains(source_node: str, event_id: str) -> bool:
+    return _path(source_node, event_id).exists()
+
+
+def put(source_node: str, event_id: str, payload: dict) -> None:
+    """Write a payload atomically (temp file + rename), then evict if over budget.
+
+    Each write gets its own temp file, so concurrent prefetches of the same event
+    (threads or worker processes) never write into one file; the last rename wins.
+    """
+    global _total_bytes
+    path = _path(source_node, event_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(payload).encode()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        try:
+            previous = path.stat().st_size
+        except FileNotFoundError:
+            previous = 0
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    with _lock:
+        if _total_bytes is None:
+            _total_bytes = sum(size for _, size, _ in _entries())
+        else:
+            _total_bytes += len(data) - previous
+        if _total_bytes > settings.payload_cache_max_mb * 1024 * 1024:
+            _evict()
+
+
+def _evict() -> None:
+    """Drop the oldest files until the cache is at 90% of its budget. Caller holds _lock."""
+    global _total_bytes
+    target = int(settings.payload_cache_max_mb * 1024 * 1024 * 0.9)
+    entries = sorted(_entries())
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    for _, size, p in entries:
+        if total <= target:
+            break
+        p.unlink(missing_ok=True)
+        total -= size
+        evicted += 1
+    _total_bytes = total
+    logger.info("Payload cache: evicted %d entries (%d bytes remain)", evicted, total)
+
+
+def drop_source(source_node: str) -> None:
+    """Remove every cached payload from source_node (used when its data is purged)."""
+    global _total_bytes
+    shutil.rmtree(_root() / quote(source_node, safe=""), ignore_errors=True)
+    with _lock:
+        _total_bytes = None
+
+
+def stats() -> dict:
+    entries = _entries()
+    return {
+        "entries": len(entries),
+        "bytes": sum(size for _, size, _ in entries),
+        "max_bytes": settings.payload_cache_max_mb * 1024 * 1024,
+    }
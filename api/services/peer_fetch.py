@@ -0,0 +1,155 @@
+"""
+Server-side retrieval of peer event data from a notification's data_url.
+
+The API fetches payloads itself rather than the browser fetching from the peer and
+uploading the triples back, so the payload crosses the WAN once and never passes
+through the browser.
+
+  fetch_event_payload — GET data_url with a JWT signed for the source node
+  import_from_source  — payload (from the payload cache, or fetched) → import_event_triples
+  import_many         — import_from_source for many event ids, a few at a time
+
+sign_token reuses a peer's token until shortly before it expires, so a bulk
+import signs one token per peer rather than one per event.
+
+A data_url arrives in a notification or event, so anyone who can send one could
+point it elsewhere and collect the token signed for the source node. Before any
+signed request, check_data_url requires an active connection with the source node
+and a data_url under that connection's registered peer_base_url.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import httpx
+
+from config import settings
+from models.connections import ConnectionStatus
+from services import connections, graphdb, payload_cache, peer_rtt
+from services.jwt_service import sign_token
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> httpx.Client:
+    """Shared client so repeated fetches from one peer reuse the TLS connection."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(timeout=10)
+        return _client
+
+
+class UntrustedDataUrl(Exception):
+    """data_url is not served by an actively connected source node."""
+
+
+def check_data_url(source_node: str, data_url: str) -> None:
+    """Raise UntrustedDataUrl unless data_url lies under source_node's registered base URL."""
+    conn = connections.get_connection_by_peer(source_node)
+    if conn is None or conn.status != ConnectionStatus.active:
+        raise UntrustedDataUrl(f"No active connection with {source_node}")
+    # Compare up to a path boundary, so http://node-b:8000 does not admit http://node-b:8000.evil
+    base = conn.peer_base_url.rstrip("/") + "/"
+    if not data_url.startswith(base):
+        raise UntrustedDataUrl(f"Data URL {data_url} is not served by {source_node} ({conn.peer_base_url})")
+
+
+def fetch_event_payload(source_node: str, data_url: str) -> dict:
+    """GET the full event from its source node. Raises httpx errors on failure,
+    UntrustedDataUrl (before anything is signed) if data_url fails check_data_url.
+
+    A 401 (e.g. the peer rotated keys or clocks drifted) retries once with a
+    freshly signed token instead of the reused one.
+    """
+    check_data_url(source_node, data_url)
+    client = _get_client()
+    for attempt in (1, 2):
+        token, _ = sign_token(audience=source_node, fresh=attempt > 1)
+        with peer_rtt.call(source_node, "fetch") as timeout:
+            resp = client.get(
+                data_url,
+                headers={"Accept": "application/json", "Authorization": f"Bearer {token}"},
+                timeout=timeout,
+            )
+        if resp.status_code == 401 and attempt == 1:
+            continue
+        resp.raise_for_status()
+        return resp.json()
+
+
+class PeerImportError(Exception):
+    """An event could not be imported from its source. status is the HTTP status for the route."""
+
+    def __init__(self, status: int, detail: str):
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+def get_payload(event_id: str, source_node: str, data_url: str) -> tuple[dict, bool]:
+    """(payload, was_cached) — from the payload cache if present, else fetched and cached."""
+    cached = payload_cache.get(source_node, event_id)
+    if cached is not None:
+        return cached, True
+    payload = fetch_event_payload(source_node, data_url)
+    try:
+        payload_cache.put(source_node, event_id, payload)
+    except OSError as exc:
+        logger.warning("Could not cache payload for %s: %s", event_id, exc)
+    return payload, False
+
+
+def import_from_source(event_id: str) -> dict:
+    """Fetch a peer event's triples server-side and import them into the peer's graph.
+
+    Same checks as POST /events/{id}/import (404 → 400 → 409), then 422 if the
+    data link is not served by an actively connected source node (check_data_url)
+    and 502 if the source node cannot be reached. Raises PeerImportError.
+    """
+    event = graphdb.get_event_by_id(event_id)
+    if event is None:
+        raise PeerImportError(404, "Event not found")
+    data_url = event.links.get("data")
+    if not data_url:
+        raise PeerImportError(400, "This event was originated locally — import is only valid for peer notifications")
+    if event.has_local_copy:
+        raise PeerImportError(409, "Event already imported")
+
+    try:
+        payload, cached = get_payload(event_id, event.source_node, data_url)
+    except UntrustedDataUrl as exc:
+        logger.warning("Refusing to fetch %s: %s", event_id, exc)
+        raise PeerImportError(422, str(exc))
+    except httpx.HTTPError as exc:
+        raise PeerImportError(502, f"Could not fetch event from {event.source_node}: {exc}")
+    triples = payload.get("triples")
+    if not triples:
+        raise PeerImportError(502, f"{event.source_node} returned no triples for this event")
+
+    graphdb.import_event_triples(event_id, triples, source_node=event.source_node)
+    logger.info("Imported event %s from %s (%s)", event_id, event.source_node, "cached" if cached else "fetched")
+    return {"status": "imported", "id": event_id, "cached": cached}
+
+
+def _import_one(event_id: str) -> dict:
+    try:
+        return import_from_source(event_id)
+    except PeerImportError as exc:
+        status = "already_imported" if exc.status == 409 else "error"
+        return {"status": status, "id": event_id, "error": exc.detail}
+    except Exception as exc:
+        logger.error("Import of %s failed: %s", event_id, exc)
+        return {"status": "error", "id": event_id, "error": str(exc)}
+
+
+def import_many(event_ids: list[str]) -> list[dict]:
+    """import_from_source for each id, import_concurrency at a time. Results in request order."""
+    unique = list(dict.fromkeys(event_ids))
+    with ThreadPoolExecutor(max_workers=settings.import_concurrency, thread_name_prefix="import") as pool:
+        results = dict(zip(unique, pool.map(_import_one, unique)))
+    return [results[event_id] for event_id in event_ids]
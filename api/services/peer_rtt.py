@@ -0,0 +1,198 @@
+"""
+Per-peer round-trip times and error history, and the timeouts derived from them.
+
+Peers range from a LAN neighbour answering in milliseconds to a node behind a slow
+tunnel, so one hard-coded timeout is either too short for the slow peer or far
+too long for the fast one. Every outbound call to a peer is measured with
+call(), and a background thread lightly probes GET /.well-known/hilo-node on
+active peers that have had no other traffic for peer_probe_interval seconds.
+
+The estimate follows TCP's retransmission timer (RFC 6298):
+  srtt   — smoothed RTT,   srtt   ← 7/8·srtt + 1/8·rtt
+  rttvar — RTT variation,  rttvar ← 3/4·rttvar + 1/4·|srtt − rtt|
+  rto    — srtt + 4·rttvar
+Only calls that got a response update srtt; a timeout doubles a backoff factor
+instead (Karn's algorithm), which any later response resets.
+
+  timeout_for(peer)          — rto × backoff × _TIMEOUT_FACTOR, clamped to
+                               [peer_timeout_min_seconds, peer_timeout_max_seconds];
+                               peer_timeout_default_seconds before the first sample
+  retry_delay(peer, attempt) — rto × 2^(attempt−1), clamped to [0.5 s, 30 s]
+
+The last peer_rtt_history_size calls per peer are kept for GET /connections/{peer}/rtt.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterator, Optional
+
+import httpx
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_TIMEOUT_FACTOR = 3  # HTTP response times have heavier tails than TCP segments
+_MAX_BACKOFF = 8
+
+
+class PeerLink:
+    def __init__(self):
+        self.srtt: Optional[float] = None
+        self.rttvar: Optional[float] = None
+        self.backoff = 1
+        self.last_activity = 0.0  # time.monotonic() of the last call
+        self.history: deque = deque(maxlen=settings.peer_rtt_history_size)
+
+    @property
+    def rto(self) -> Optional[float]:
+        return None if self.srtt is None else self.srtt + 4 * self.rttvar
+
+    def record(self, rtt: float, source: str, error: Optional[str] = None, timed_out: bool = False) -> None:
+        if error is None:
+            if self.srtt is None:
+                self.srtt, self.rttvar = rtt, rtt / 2
+            else:
+                self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+                self.srtt = 0.875 * self.srtt + 0.125 * rtt
+            self.backoff = 1
+        elif timed_out:
+            self.backoff = min(self.backoff * 2, _MAX_BACKOFF)
+        self.last_activity = time.monotonic()
+        self.history.append({
+            "at": datetime.now(timezone.utc).isoformat(),
+            "source": source,
+            "rtt_ms": round(rtt * 1000, 1),
+            "ok": error is None,
+            "error": error,
+        })
+
+    def timeout(self) -> float:
+        if self.rto is None:
+            return settings.peer_timeout_default_seconds
+        value = self.rto * self.backoff * _TIMEOUT_FACTOR
+        return min(max(value, settings.peer_timeout_min_seconds), settings.peer_timeout_max_seconds)
+
+    def retry_delay(self, attempt: int) -> float:
+        base = self.rto if self.rto is not None else 1.0
+        return min(max(base * 2 ** (attempt - 1), 0.5), 30.0)
+
+    def snapshot(self, limit: Optional[int] = None) -> dict:
+        history = list(self.history)
+        errors = sum(1 for h in history if not h["ok"])
+        ok_rtts = sorted(h["rtt_ms"] for h in history if h["ok"])
+        return {
+            "samples": len(history),
+            "srtt_ms": None if self.srtt is None else round(self.srtt * 1000, 1),
+            "rttvar_ms": None if self.rttvar is None else round(self.rttvar * 1000, 1),
+            "p95_ms": ok_rtts[int(0.95 * (len(ok_rtts) - 1))] if ok_rtts else None,
+            "error_rate": round(errors / len(history), 3) if history else None,
+            "timeout_seconds": round(self.timeout(), 2),
+            "backoff": self.backoff,
+            "history": history[-limit:] if limit else history,
+        }
+
+
+_links: dict[str, PeerLink] = {}
+_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def _link(peer_node_id: str) -> PeerLink:
+    link = _links.get(peer_node_id)
+    if link is None:
+        link = _links[peer_node_id] = PeerLink()
+    return link
+
+
+def timeout_for(peer_node_id: str) -> float:
+    with _lock:
+        return _link(peer_node_id).timeout()
+
+
+def retry_delay(peer_node_id: str, attempt: int) -> float:
+    with _lock:
+        return _link(peer_node_id).retry_delay(attempt)
+
+
+def record(peer_node_id: str, rtt: float, source: str, error: Optional[str] = None, timed_out: bool = False) -> None:
+    with _lock:
+        _link(peer_node_id).record(rtt, source, error, timed_out)
+
+
+@contextmanager
+def call(peer_node_id: str, source: str) -> Iterator[float]:
+    """Measure one outbound call to a peer. Yields the timeout to use for it.
+
+    Any response counts as a round trip (an HTTP error status still measured the
+    link); exceptions are recorded as errors and re-raised.
+    """
+    started = time.perf_counter()
+    try:
+        yield timeout_for(peer_node_id)
+    except Exception as exc:
+        record(
+            peer_node_id, time.perf_counter() - started, source,
+            error=str(exc) or type(exc).__name__, timed_out=isinstance(exc, httpx.TimeoutException),
+        )
+        raise
+    record(peer_node_id, time.perf_counter() - started, source)
+
+
+def snapshot(peer_node_id: str, limit: Optional[int] = None) -> dict:
+    with _lock:
+        return _link(peer_node_id).snapshot(limit)
+
+
+def forget(peer_node_id: str) -> None:
+    with _lock:
+        _links.pop(peer_node_id, None)
+
+
+# ── Probes ────────────────────────────────────────────────────────────────────
+
+def probe(peer_node_id: str, peer_base_url: str) -> None:
+    """GET the peer's /.well-known/hilo-node once, recording the round trip."""
+    try:
+        with call(peer_node_id, "probe") as timeout:
+            httpx.get(f"{peer_base_url}/.well-known/hilo-node", timeout=timeout)
+    except Exception as exc:
+        logger.debug("RTT probe of %s failed: %s", peer_node_id, exc)
+
+
+def probe_idle_peers() -> None:
+    """Probe every active peer that has had no traffic for peer_probe_interval seconds."""
+    from services.connections import get_active_peers
+
+    cutoff = time.monotonic() - settings.peer_probe_interval
+    for peer in get_active_peers():
+        with _lock:
+            idle = _link(peer.peer_node_id).last_activity < cutoff
+        if idle:
+            probe(peer.peer_node_id, peer.peer_base_url)
+
+
+def _run() -> None:
+    while not _stop.wait(settings.peer_probe_interval):
+        try:
+            probe_idle_peers()
+        except Exception as exc:
+            logger.warning("RTT probe round failed: %s", exc)
+
+
+def start() -> None:
+    """Start the probe thread (idempotent). Called from the app lifespan."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="peer-rtt-probes", daemon=True)
+    _thread.start()
+
+
+def stop() -> None:
+    _stop.set()
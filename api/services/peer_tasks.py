@@ -0,0 +1,333 @@
+"""
+Persisted background tasks for outbound peer lifecycle calls.
+
+Accepting a connection (POST {peer}/connections/accepted) and disconnecting
+(POST {peer}/connections/{node_id}/disconnected) used to call the peer inline,
+so an unreachable peer held the operator's request for up to ~20 s of timeouts
+and backoff sleeps. The endpoints now record a task here and return at once; a
+single worker thread POSTs due tasks and retries failures with exponential
+backoff (peer_task_backoff_seconds, doubling, capped at peer_task_backoff_max_seconds,
+and never shorter than the peer's RTT-based retry delay) up to peer_task_max_attempts.
+Request timeouts come from services/peer_rtt.py.
+
+Tasks survive restarts: anything left "running" by a crash is picked up again. With several
+worker processes (settings.workers > 1) every worker runs this thread; a due task is
+claimed atomically, one at a time just before it is sent, so exactly one of them sends it.
+A task that runs out of attempts is marked failed and the kind's failure hook
+runs (services/connections.py marks a connection accept_pending that way).
+cancel() withdraws a peer's outstanding tasks of one kind, e.g. acceptance callbacks
+once the connection is deleted; an attempt already in flight is not retried.
+
+Schema:
+  peer_tasks (
+    id INTEGER PRIMARY KEY,
+    kind TEXT,            -- acceptance_callback | disconnect_notice
+    peer_node_id TEXT,
+    url TEXT,             -- the peer endpoint to POST to
+    payload TEXT,         -- JSON body, or NULL
+    status TEXT,          -- pending | running | done | failed | cancelled
+    attempts INTEGER,
+    next_run_at TEXT,
+    last_error TEXT,
+    created_at TEXT,
+    updated_at TEXT
+  )
+  + index on (status, next_run_at)
+"""
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+import httpx
+
+from config import settings
+from models.connections import PeerTask
+from services import peer_rtt, sqlite_pool
+
+logger = logging.getLogger(__name__)
+
+_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS peer_tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    peer_node_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    payload TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_run_at TEXT NOT NULL,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_peer_tasks_due ON peer_tasks (status, next_run_at);
+"""
+
+_failure_hooks: dict[str, Callable[[str], None]] = {}
+_wake = threading.Event()
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _conn():
+    return sqlite_pool.connect(_DB_SCHEMA)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _row_to_task(row: sqlite3.Row) -> PeerTask:
+    return PeerTask(
+        id=row["id"],
+        kind=row["kind"],
+        peer_node_id=row["peer_node_id"],
+        url=row["url"],
+        status=row["status"],
+        attempts=row["attempts"],
+        max_attempts=settings.peer_task_max_attempts,
+        next_run_at=datetime.fromisoformat(row["next_run_at"]),
+        last_error=row["last_error"],
+        created_at=datetime.fromisoformat(row["created_at"]),
+        updated_at=datetime.fromisoformat(row["updated_at"]),
+    )
+
+
+def on_failed(kind: str, hook: Callable[[str], None]) -> None:
+    """Register hook(peer_node_id), called when a task of this kind runs out of attempts."""
+    _failure_hooks[kind] = hook
+
+
+# ── Queue ─────────────────────────────────────────────────────────────────────
+
+def enqueue(kind: str, peer_node_id: str, url: str, payload: Optional[dict] = None) -> PeerTask:
+    """Record a POST to url for the worker and wake it. Returns immediately."""
+    now = _now().isoformat()
+    with _conn() as db:
+        cur = db.execute(
+            """INSERT INTO peer_tasks
+               (kind, peer_node_id, url, payload, status, attempts, next_run_at, created_at, updated_at)
+               VALUES (?, ?, ?, ?, 'pending', 0, ?, ?, ?)""",
+            (kind, peer_node_id, url, json.dumps(payload) if payload is not None else None, now, now, now),
+        )
+        db.commit()
+        row = db.execute("SELECT * FROM peer_tasks WHERE id = ?", (cur.lastrowid,)).fetchone()
+    _wake.set()
+    return _row_to_task(row)
+
+
+def enqueue_once(kind: str, peer_node_id: str, url: str, payload: Optional[dict] = None) -> PeerTask:
+    """Like enqueue(), but reuse the peer's outstanding task of this kind if there is one.
+
+    A pending task is made due now; a running one is left to finish.
+    """
+    now = _now().isoformat()
+    with _conn() as db:
+        row = db.execute(
+            """SELECT id, status FROM peer_tasks
+               WHERE kind = ? AND peer_node_id = ? AND status IN ('pending', 'running')
+               ORDER BY id LIMIT 1""",
+            (kind, peer_node_id),
+        ).fetchone()
+        if row is not None and row["status"] == "pending":
+            db.execute(
+                "UPDATE peer_tasks SET next_run_at = ?, updated_at = ? WHERE id = ? AND status = 'pending'",
+                (now, now, row["id"]),
+            )
+            db.commit()
+    if row is None:
+        return enqueue(kind, peer_node_id, url, payload)
+    _wake.set()
+    return get_task(row["id"])
+
+
+def cancel(kind: str, peer_node_id: str) -> int:
+    """Cancel the peer's pending and running tasks of this kind. Returns how many."""
+    with _conn() as db:
+        cur = db.execute(
+            """UPDATE peer_tasks SET status = 'cancelled', updated_at = ?
+               WHERE kind = ? AND peer_node_id = ? AND status IN ('pending', 'running')""",
+            (_now().isoformat(), kind, peer_node_id),
+        )
+        db.commit()
+    if cur.rowcount:
+        logger.info("Peer tasks: cancelled %d %s task(s) for %s", cur.rowcount, kind, peer_node_id)
+    return cur.rowcount
+
+
+def list_tasks(status: Optional[str] = None, peer_node_id: Optional[str] = None, limit: int = 100) -> list[PeerTask]:
+    """Most recent first."""
+    sql = "SELECT * FROM peer_tasks WHERE 1 = 1"
+    params: list = []
+    if status:
+        sql += " AND status = ?"
+        params.append(status)
+    if peer_node_id:
+        sql += " AND peer_node_id = ?"
+        params.append(peer_node_id)
+    sql += " ORDER BY id DESC LIMIT ?"
+    params.append(limit)
+    with _conn() as db:
+        rows = db.execute(sql, params).fetchall()
+    return [_row_to_task(r) for r in rows]
+
+
+def get_task(task_id: int) -> Optional[PeerTask]:
+    with _conn() as db:
+        row = db.execute("SELECT * FROM peer_tasks WHERE id = ?", (task_id,)).fetchone()
+    return _row_to_task(row) if row else None
+
+
+# ── Worker ────────────────────────────────────────────────────────────────────
+
+def _backoff(peer_node_id: str, attempts: int) -> timedelta:
+    seconds = max(settings.peer_task_backoff_seconds * 2 ** (attempts - 1), peer_rtt.retry_delay(peer_node_id, attempts))
+    return timedelta(seconds=min(seconds, settings.peer_task_backoff_max_seconds))
+
+
+def _claim_next(due_by: datetime) -> Optional[sqlite3.Row]:
+    """Mark the earliest task due by due_by running and return it, or None.
+
+    One UPDATE ... RETURNING, so with several worker processes each due task is
+    claimed by exactly one of them. Claiming one task at a time, right before it
+    runs, keeps updated_at fresh: a task waiting behind slow peers is still pending,
+    not "running" for long enough that _recover() in another worker resets it.
+    """
+    with _conn() as db:
+        row = db.execute(
+            """UPDATE peer_tasks SET status = 'running', updated_at = ?
+               WHERE id = (SELECT id FROM peer_tasks WHERE status = 'pending' AND next_run_at <= ?
+                           ORDER BY next_run_at LIMIT 1)
+               RETURNING *""",
+            (_now().isoformat(), due_by.isoformat()),
+        ).fetchone()
+        db.commit()
+    return row
+
+
+def _finish(row: sqlite3.Row, error: Optional[str]) -> None:
+    attempts = row["attempts"] + 1
+    now = _now()
+    if error is None:
+        status, next_run_at = "done", now
+    elif attempts >= settings.peer_task_max_attempts:
+        status, next_run_at = "failed", now
+    else:
+        status, next_run_at = "pending", now + _backoff(row["peer_node_id"], attempts)
+    with _conn() as db:
+        cur = db.execute(
+            """UPDATE peer_tasks SET status = ?, attempts = ?, next_run_at = ?, last_error = ?, updated_at = ?
+               WHERE id = ? AND status = 'running'""",
+            (status, attempts, next_run_at.isoformat(), error, now.isoformat(), row["id"]),
+        )
+        db.commit()
+
+    if not cur.rowcount:
+        logger.info("Peer task %s %d to %s was cancelled while running", row["kind"], row["id"], row["peer_node_id"])
+    elif status == "done":
+        logger.info("Peer task %s %d to %s succeeded", row["kind"], row["id"], row["peer_node_id"])
+    elif status == "pending":
+        logger.warning(
+            "Peer task %s %d to %s failed (attempt %d/%d): %s — retrying at %s",
+            row["kind"], row["id"], row["peer_node_id"], attempts, settings.peer_task_max_attempts,
+            error, next_run_at.isoformat(),
+        )
+    else:
+        logger.error(
+            "Peer task %s %d to %s failed after %d attempts: %s",
+            row["kind"], row["id"], row["peer_node_id"], attempts, error,
+        )
+        hook = _failure_hooks.get(row["kind"])
+        if hook is not None:
+            try:
+                hook(row["peer_node_id"])
+            except Exception as exc:
+                logger.warning("Peer task failure hook for %s failed: %s", row["kind"], exc)
+
+
+def _run_one(row: sqlite3.Row) -> None:
+    payload = json.loads(row["payload"]) if row["payload"] else None
+    try:
+        with peer_rtt.call(row["peer_node_id"], row["kind"]) as timeout:
+            resp = httpx.post(row["url"], json=payload, timeout=timeout)
+        error = None if resp.is_success else f"HTTP {resp.status_code}"
+    except Exception as exc:
+        error = str(exc) or type(exc).__name__
+    _finish(row, error)
+
+
+def run_due() -> int:
+    """Run every task that is due now, earliest first. Returns how many ran."""
+    now = _now()  # retries scheduled while running are left for the next round
+    ran = 0
+    while not _stop.is_set():
+        row = _claim_next(now)
+        if row is None:
+            break
+        _run_one(row)
+        ran += 1
+    return ran
+
+
+def _seconds_until_next() -> float:
+    with _conn() as db:
+        row = db.execute("SELECT MIN(next_run_at) FROM peer_tasks WHERE status = 'pending'").fetchone()
+    if row[0] is None:
+        return settings.peer_task_poll_seconds
+    wait = (datetime.fromisoformat(row[0]) - _now()).total_seconds()
+    return max(0.0, min(wait, settings.peer_task_poll_seconds))
+
+
+def _recover() -> None:
+    """Tasks left running by a crash or restart are retried.
+
+    With one worker process, every task still running at startup is such a task.
+    With several, another worker may be running it right now, so only tasks running
+    for longer than any attempt can take (2 × peer_timeout_max_seconds) are reset,
+    and every worker checks on each round.
+    """
+    sql, params = "UPDATE peer_tasks SET status = 'pending' WHERE status = 'running'", ()
+    if settings.workers > 1:
+        sql += " AND updated_at < ?"
+        params = ((_now() - timedelta(seconds=2 * settings.peer_timeout_max_seconds)).isoformat(),)
+    with _conn() as db:
+        cur = db.execute(sql, params)
+        db.commit()
+    if cur.rowcount:
+        logger.info("Peer tasks: resuming %d interrupted task(s)", cur.rowcount)
+
+
+def _run() -> None:
+    try:
+        _recover()
+    except sqlite3.Error as exc:
+        logger.warning("Peer tasks: could not recover interrupted tasks: %s", exc)
+    while not _stop.is_set():
+        try:
+            if settings.workers > 1:
+                _recover()
+            run_due()
+            wait = _seconds_until_next()
+        except Exception as exc:
+            logger.warning("Peer tasks: worker round failed: %s", exc)
+            wait = settings.peer_task_poll_seconds
+        _wake.wait(wait)
+        _wake.clear()
+
+
+def start() -> None:
+    """Start the worker thread (idempotent). Called from the app lifespan."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="peer-tasks", daemon=True)
+    _thread.start()
+
+
+def stop() -> None:
+    _stop.set()
+    _wake.set()
@@ -0,0 +1,177 @@
+"""
+Background prefetch of peer event payloads into the on-disk payload cache.
+
+Operators define rules (event_type and/or source_node). When a notification
+arriving on /bridge/receive matches a rule, its payload is fetched from the
+source node's data_url (services/peer_fetch.py) and written to services/payload_cache.py. Nothing is imported into the
+triple store.
+
+Only notifications from an actively connected peer whose data_url lies under that
+connection's peer_base_url are fetched (peer_fetch.check_data_url); others are
+skipped and logged, since the fetch carries a token signed for the source node.
+
+Fetches run on a small thread pool (prefetch_concurrency threads). At most
+prefetch_max_pending fetches are queued; notifications beyond that are skipped
+and counted, and can still be fetched on demand from the Events page.
+
+Schema:
+  prefetch_rules (
+    id INTEGER PRIMARY KEY,
+    event_type TEXT,    -- NULL matches any type
+    source_node TEXT,   -- NULL matches any peer
+    created_at TEXT
+  )
+"""
+import logging
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional
+
+from config import settings
+from models.events import EventNotification
+from models.prefetch import PrefetchRule, PrefetchRuleCreate
+from services import payload_cache, peer_fetch, sqlite_pool
+
+logger = logging.getLogger(__name__)
+
+_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS prefetch_rules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type TEXT,
+    source_node TEXT,
+    created_at TEXT NOT NULL
+);
+"""
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_pending: Optional[threading.BoundedSemaphore] = None  # sized from settings on first use
+_in_flight: set[str] = set()
+_stats = {"scheduled": 0, "fetched": 0, "failed": 0, "skipped_full": 0, "skipped_cached": 0, "skipped_untrusted": 0}
+_stats_lock = threading.Lock()
+
+
+def _conn():
+    return sqlite_pool.connect(_DB_SCHEMA)
+
+
+def _row_to_rule(row: sqlite3.Row) -> PrefetchRule:
+    return PrefetchRule(
+        id=row["id"],
+        event_type=row["event_type"],
+        source_node=row["source_node"],
+        created_at=datetime.fromisoformat(row["created_at"]),
+    )
+
+
+# ── Rules ─────────────────────────────────────────────────────────────────────
+
+def list_rules() -> list[PrefetchRule]:
+    with _conn() as db:
+        rows = db.execute("SELECT * FROM prefetch_rules ORDER BY id").fetchall()
+    return [_row_to_rule(r) for r in rows]
+
+
+def add_rule(rule: PrefetchRuleCreate) -> PrefetchRule:
+    now = datetime.now(timezone.utc).isoformat()
+    with _conn() as db:
+        cur = db.execute(
+            "INSERT INTO prefetch_rules (event_type, source_node, created_at) VALUES (?, ?, ?)",
+            (rule.event_type, rule.source_node, now),
+        )
+        db.commit()
+        row = db.execute("SELECT * FROM prefetch_rules WHERE id = ?", (cur.lastrowid,)).fetchone()
+    return _row_to_rule(row)
+
+
+def delete_rule(rule_id: int) -> bool:
+    with _conn() as db:
+        cur = db.execute("DELETE FROM prefetch_rules WHERE id = ?", (rule_id,))
+        db.commit()
+    return cur.rowcount > 0
+
+
+def matches(rule: PrefetchRule, notification: EventNotification) -> bool:
+    if rule.event_type and rule.event_type != notification.event_type:
+        return False
+    if rule.source_node and rule.source_node != notification.source_node:
+        return False
+    return True
+
+
+# ── Fetching ──────────────────────────────────────────────────────────────────
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _prefetch(notification: EventNotification) -> None:
+    try:
+        payload = peer_fetch.fetch_event_payload(notification.source_node, notification.data_url)
+        payload_cache.put(notification.source_node, notification.event_id, payload)
+        _count("fetched")
+        logger.debug("Prefetch: cached payload for %s from %s", notification.event_id, notification.source_node)
+    except Exception as exc:
+        _count("failed")
+        logger.warning("Prefetch: could not fetch %s from %s: %s", notification.event_id, notification.source_node, exc)
+    finally:
+        with _stats_lock:
+            _in_flight.discard(notification.event_id)
+        _pending.release()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _pending
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=settings.prefetch_concurrency, thread_name_prefix="prefetch")
+            _pending = threading.BoundedSemaphore(settings.prefetch_max_pending)
+        return _executor
+
+
+def schedule(notification: EventNotification) -> bool:
+    """Queue a background prefetch if a rule matches. Returns True if a fetch was queued.
+
+    Never raises and never blocks — called from the /bridge/receive request path.
+    """
+    try:
+        rules = list_rules()
+    except sqlite3.Error as exc:
+        logger.warning("Prefetch: could not read rules: %s", exc)
+        return False
+    if not any(matches(r, notification) for r in rules):
+        return False
+    if payload_cache.contains(notification.source_node, notification.event_id):
+        _count("skipped_cached")
+        return False
+    try:
+        peer_fetch.check_data_url(notification.source_node, notification.data_url)
+    except peer_fetch.UntrustedDataUrl as exc:
+        _count("skipped_untrusted")
+        logger.warning("Prefetch: skipping %s: %s", notification.event_id, exc)
+        return False
+    except sqlite3.Error as exc:
+        logger.warning("Prefetch: could not read connection for %s: %s", notification.source_node, exc)
+        return False
+
+    executor = _get_executor()
+    with _stats_lock:
+        if notification.event_id in _in_flight:
+            return False
+        if not _pending.acquire(blocking=False):
+            _stats["skipped_full"] += 1
+            logger.info("Prefetch: backlog full, skipping %s", notification.event_id)
+            return False
+        _in_flight.add(notification.event_id)
+        _stats["scheduled"] += 1
+    executor.submit(_prefetch, notification)
+    return True
+
+
+def get_stats() -> dict:
+    with _stats_lock:
+        counters = dict(_stats, in_flight=len(_in_flight))
+    return {**counters, "cache": payload_cache.stats()}
@@ -1,7 +1,6 @@
 import logging
 
-import pika
-
+import metrics
 from config import settings
 from models.events import EventNotification, EventResponse
 
@@ -12,18 +11,63 @@ DLX_EXCHANGE = "hilo.events.dlx"
 DLX_QUEUE = "hilo.events.dead"
 
 
-def _get_connection() -> pika.BlockingConnection:
+def _get_connection():
+    """A new BlockingConnection. pika is imported here, on the first AMQP call, not at startup."""
+    import pika
+
     params = pika.URLParameters(settings.rabbitmq_url)
-    return pika.BlockingConnection(params)
+    with metrics.timed("amqp", "connect"):
+        return pika.BlockingConnection(params)
 
 
-def ensure_infrastructure(channel: pika.adapters.blocking_connection.BlockingChannel) -> None:
+def ensure_infrastructure(channel) -> None:
     channel.exchange_declare(exchange=EXCHANGE_NAME, exchange_type="topic", durable=True)
     channel.exchange_declare(exchange=DLX_EXCHANGE, exchange_type="fanout", durable=True)
     channel.queue_declare(queue=DLX_QUEUE, durable=True)
     channel.queue_bind(queue=DLX_QUEUE, exchange=DLX_EXCHANGE)
 
 
+def peer_queue_name(peer_node_id: str) -> str:
+    """Durable delivery queue for one peer — must match queue/consumer.py."""
+    return f"hilo.events.{settings.node_id}.peer.{peer_node_id}"
+
+
+def declare_peer_queue(peer_node_id: str) -> None:
+    """Create (idempotently) the delivery queue for a newly active peer connection."""
+    conn = _get_connection()
+    try:
+        channel = conn.channel()
+        ensure_infrastructure(channel)
+        queue = peer_queue_name(peer_node_id)
+        channel.queue_declare(
+            queue=queue,
+            durable=True,
+            arguments={"x-dead-letter-exchange": DLX_EXCHANGE},
+        )
+        channel.queue_bind(
+            queue=queue,
+            exchange=EXCHANGE_NAME,
+            routing_key=f"events.{settings.node_id}.peer.{peer_node_id}",
+        )
+        logger.info("Declared delivery queue %s", queue)
+    finally:
+        conn.close()
+
+
+def delete_peer_queue(peer_node_id: str) -> None:
+    """Delete a peer's delivery queue. Undelivered notifications for that peer are dropped —
+    the peer is no longer connected. The consumer's worker for it stops when the broker
+    cancels its subscription."""
+    conn = _get_connection()
+    try:
+        channel = conn.channel()
+        queue = peer_queue_name(peer_node_id)
+        channel.queue_delete(queue=queue)
+        logger.info("Deleted delivery queue %s", queue)
+    finally:
+        conn.close()
+
+
 def check_health() -> str:
     try:
         conn = _get_connection()
@@ -36,21 +80,24 @@ def check_health() -> str:
 def publish_notification(notification: EventNotification) -> None:
     """Publish a lightweight EventNotification to the queue.
     The consumer will forward this to connected peers."""
+    import pika
+
     conn = _get_connection()
     try:
         channel = conn.channel()
         ensure_infrastructure(channel)
         routing_key = f"events.{settings.node_id}"
         body = notification.model_dump_json()
-        channel.basic_publish(
-            exchange=EXCHANGE_NAME,
-            routing_key=routing_key,
-            body=body,
-            properties=pika.BasicProperties(
-                delivery_mode=2,  # persistent
-                content_type="application/json",
-            ),
-        )
+        with metrics.timed("amqp", "publish"):
+            channel.basic_publish(
+                exchange=EXCHANGE_NAME,
+                routing_key=routing_key,
+                body=body,
+                properties=pika.BasicProperties(
+                    delivery_mode=2,  # persistent
+                    content_type="application/json",
+                ),
+            )
         logger.info("Published notification for event %s to %s", notification.event_id, routing_key)
     finally:
         conn.close()
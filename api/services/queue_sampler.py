@@ -0,0 +1,153 @@
+"""
+Background sampler for queue stats.
+
+One thread polls the RabbitMQ management API (and the consumer's circuit
+breakers) every queue_stats_interval seconds. GET /queue/stats serves the latest
+snapshot from memory instead of making management API calls per request.
+The last queue_stats_history_size samples are kept in a ring buffer for
+GET /queue/stats/history.
+
+Listeners (services/live.py) are called with each new snapshot.
+
+Until the first sample is taken — or when the sampler is not running, as in
+tests — latest() returns None and callers read the management API directly.
+
+With several worker processes only the leader samples (services/leader.py). It
+shares each snapshot and appends the history point to the queue_stats_history
+table; the other workers' latest() and history() read from there.
+"""
+import json
+import logging
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from config import settings
+from services import consumer_status, leader, rabbitmq_management, sqlite_pool
+
+logger = logging.getLogger(__name__)
+
+_latest: Optional[dict] = None
+_history: deque = deque(maxlen=settings.queue_stats_history_size)
+_lock = threading.Lock()
+_listeners: list[Callable[[dict], None]] = []
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue_stats_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    point TEXT NOT NULL
+);
+"""
+
+
+def _conn():
+    return sqlite_pool.connect(_DB_SCHEMA)
+
+
+def read_now() -> dict:
+    """Query the management API and the consumer directly (what one sample does)."""
+    return {
+        **rabbitmq_management.get_queue_stats(),
+        "circuit_breakers": consumer_status.get_circuit_breakers(),
+    }
+
+
+def _history_point(stats: dict, at: datetime) -> dict:
+    """The numeric subset of a snapshot kept in the ring buffer."""
+    return {
+        "at": at.isoformat(),
+        "messages_ready": stats.get("messages_ready"),
+        "messages_unacked": stats.get("messages_unacked"),
+        "dead_letters": stats.get("dead_letters"),
+        "throughput_per_minute": stats.get("throughput_per_minute"),
+        "consumers": stats.get("consumers"),
+        "queues": {q["name"]: q["messages_ready"] for q in stats.get("queues") or []},
+    }
+
+
+def sample() -> dict:
+    """Take one sample, store it and notify listeners. Returns the snapshot."""
+    global _latest
+    stats = read_now()
+    at = datetime.now(timezone.utc)
+    point = _history_point(stats, at)
+    with _lock:
+        _latest = {**stats, "sampled_at": at.isoformat()}
+        _history.append(point)
+        snapshot = _latest
+    if settings.workers > 1:
+        _share(snapshot, point)
+    for listener in list(_listeners):
+        try:
+            listener(snapshot)
+        except Exception as exc:
+            logger.warning("Queue sampler listener failed: %s", exc)
+    return snapshot
+
+
+def _share(snapshot: dict, point: dict) -> None:
+    """Make a sample visible to the other workers; the table keeps queue_stats_history_size points."""
+    leader.share("queue_stats", snapshot)
+    try:
+        with _conn() as db:
+            cur = db.execute("INSERT INTO queue_stats_history (point) VALUES (?)", (json.dumps(point),))
+            db.execute(
+                "DELETE FROM queue_stats_history WHERE id <= ?",
+                (cur.lastrowid - settings.queue_stats_history_size,),
+            )
+            db.commit()
+    except sqlite3.Error as exc:
+        logger.warning("Could not share queue stats history: %s", exc)
+
+
+def _run() -> None:
+    while not _stop.is_set():
+        try:
+            sample()
+        except Exception as exc:
+            logger.warning("Queue stats sample failed: %s", exc)
+        _stop.wait(settings.queue_stats_interval)
+
+
+def start() -> None:
+    """Start the sampler thread (idempotent). Called from the app lifespan."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="queue-stats-sampler", daemon=True)
+    _thread.start()
+    logger.info("Queue stats sampler started (every %.1fs)", settings.queue_stats_interval)
+
+
+def stop() -> None:
+    _stop.set()
+
+
+def add_listener(listener: Callable[[dict], None]) -> None:
+    _listeners.append(listener)
+
+
+def latest() -> Optional[dict]:
+    if not leader.is_leader():
+        return leader.shared("queue_stats")
+    with _lock:
+        return _latest
+
+
+def history(limit: Optional[int] = None) -> list[dict]:
+    """Samples oldest first; the most recent `limit` if given."""
+    if not leader.is_leader():
+        with _conn() as db:
+            rows = db.execute(
+                "SELECT point FROM queue_stats_history ORDER BY id DESC LIMIT ?",
+                (limit or settings.queue_stats_history_size,),
+            ).fetchall()
+        return [json.loads(r["point"]) for r in reversed(rows)]
+    with _lock:
+        points = list(_history)
+    return points[-limit:] if limit else points
@@ -7,9 +7,14 @@ from config import settings
 
 logger = logging.getLogger(__name__)
 
-MAIN_QUEUE = "hilo.events.node-a"
+QUEUE_PREFIX = "hilo."
 DLQ_NAME = "hilo.events.dead"
 VHOST = "%2F"  # default vhost, URL-encoded
+_QUEUE_COLUMNS = "name,messages_ready,messages_unacknowledged,consumers,message_stats.publish_details"
+
+
+def _dispatch_queue() -> str:
+    return f"hilo.events.{settings.node_id}"
 
 
 def _get(path: str) -> dict | list | None:
@@ -67,17 +72,40 @@ def _connection_timestamps() -> dict[str, str]:
 def get_queue_stats() -> dict:
     """Return queue depth, throughput, dead-letter count, and consumer details.
 
+    Covers every hilo.* queue with one listing call — the dispatch queue and each
+    peer's delivery queue (hilo.events.{node}.peer.{peer}). messages_ready,
+    messages_unacked and consumers are totals over all of them except the dead-letter
+    queue; throughput is the dispatch queue's publish rate (one per event, before
+    fan-out). Per-queue figures are under "queues".
+
     All numeric fields are None when the management API is unreachable so the
     frontend can display '—' with a tooltip rather than an error state.
     """
-    main = _get(f"queues/{VHOST}/{MAIN_QUEUE}")
-    dlq = _get(f"queues/{VHOST}/{DLQ_NAME}")
+    listing = _get(f"queues/{VHOST}?columns={_QUEUE_COLUMNS}")
     consumers_raw = _get(f"consumers/{VHOST}")
     conn_timestamps = _connection_timestamps()
 
+    queues = []
+    if isinstance(listing, list):
+        for q in listing:
+            name = q.get("name", "")
+            if not name.startswith(QUEUE_PREFIX):
+                continue
+            rate = _safe(q, "message_stats", "publish_details", "rate")
+            queues.append({
+                "name": name,
+                "messages_ready": q.get("messages_ready"),
+                "messages_unacked": q.get("messages_unacknowledged"),
+                "consumers": q.get("consumers"),
+                "publish_per_minute": round(rate * 60, 1) if rate is not None else None,
+            })
+        queues.sort(key=lambda q: q["name"])
+
     consumers = []
     if isinstance(consumers_raw, list):
         for c in consumers_raw:
+            if not _safe(c, "queue", "name", default="").startswith(QUEUE_PREFIX):
+                continue
             tag = c.get("consumer_tag", "unknown")
             activity = c.get("activity_status", "unknown")
             status = "active" if activity == "up" else "idle"
@@ -92,15 +120,21 @@ def get_queue_stats() -> dict:
                 ),
             })
 
-    throughput = _safe(main, "message_stats", "publish_details", "rate")
+    live_queues = [q for q in queues if q["name"] != DLQ_NAME]
+    dlq = next((q for q in queues if q["name"] == DLQ_NAME), None)
+    dispatch = next((q for q in queues if q["name"] == _dispatch_queue()), None)
+
+    def total(field: str):
+        if listing is None:
+            return None
+        return sum(q[field] or 0 for q in live_queues)
 
     return {
-        "messages_ready": _safe(main, "messages_ready"),
-        "messages_unacked": _safe(main, "messages_unacknowledged"),
-        "consumers": _safe(main, "consumers"),
-        "dead_letters": _safe(dlq, "messages_ready"),
-        "throughput_per_minute": (
-            round(throughput * 60, 1) if throughput is not None else None
-        ),
+        "messages_ready": total("messages_ready"),
+        "messages_unacked": total("messages_unacked"),
+        "consumers": total("consumers"),
+        "dead_letters": dlq["messages_ready"] if dlq else (0 if listing is not None else None),
+        "throughput_per_minute": dispatch["publish_per_minute"] if dispatch else None,
         "consumer_details": consumers,
+        "queues": queues,
     }
@@ -0,0 +1,79 @@
+"""
+Per-thread pooled SQLite connections to settings.db_path.
+
+Every service that keeps state in the node's SQLite file (connections,
+notification_dedup, prefetch, ...) gets its connection here instead of opening
+and closing one per call. Each thread keeps one connection open, so Python's
+prepared-statement cache (sqlite_cached_statements per connection) actually
+gets reused across calls.
+
+Each new connection is set up with:
+  journal_mode=WAL   — readers never wait for a writer, and a writer never waits for readers
+  synchronous=NORMAL — durable at every WAL checkpoint; the usual setting with WAL
+  busy_timeout       — concurrent writers wait (sqlite_busy_timeout_ms) instead of failing
+                       with "database is locked"
+
+connect() is re-entrant: a nested connect() on the same thread gets the same
+connection. When the outermost block exits, a transaction that was not committed
+is rolled back, the same as closing a connection without committing.
+
+A connection is reopened if settings.db_path changes (as it does between tests).
+"""
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class _Pooled:
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path, cached_statements=settings.sqlite_cached_statements)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute(f"PRAGMA busy_timeout = {int(settings.sqlite_busy_timeout_ms)}")
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.schemas: set[str] = set()
+        self.depth = 0
+
+
+def _current() -> _Pooled:
+    pooled: Optional[_Pooled] = getattr(_local, "pooled", None)
+    if pooled is not None and pooled.path != settings.db_path and pooled.depth == 0:
+        pooled.db.close()
+        pooled = None
+    if pooled is None:
+        pooled = _Pooled(settings.db_path)
+        _local.pooled = pooled
+    return pooled
+
+
+@contextmanager
+def connect(schema: Optional[str] = None) -> Iterator[sqlite3.Connection]:
+    """This thread's connection. schema (idempotent DDL) is run once per connection."""
+    pooled = _current()
+    if schema is not None and schema not in pooled.schemas:
+        pooled.db.executescript(schema)
+        pooled.schemas.add(schema)
+    pooled.depth += 1
+    try:
+        yield pooled.db
+    finally:
+        pooled.depth -= 1
+        if pooled.depth == 0 and pooled.db.in_transaction:
+            pooled.db.rollback()
+
+
+def close() -> None:
+    """Close this thread's connection, if any."""
+    pooled: Optional[_Pooled] = getattr(_local, "pooled", None)
+    if pooled is not None:
+        pooled.db.close()
+        _local.pooled = None
@@ -0,0 +1,167 @@
+"""
+Persistent cache of natural-language → SPARQL translations for POST /data/ask.
+
+Each translation costs a round trip to the LLM of several seconds, and users ask
+the same questions again and again. Translations whose query ran successfully are
+stored in SQLite under a normalised form of the question:
+
+  - lower-cased, except text in quotes ("Submitted" stays a distinct filter value)
+  - punctuation dropped and whitespace collapsed
+  - filler words dropped ("show me all the orders?" → "orders"); words that change
+    a query's meaning (not, no, without, per, by, before, after, who, which, what,
+    numbers, ...) are kept
+
+Entries expire after translation_cache_ttl_seconds, and only match while the
+model and system prompt are unchanged (llm.PROMPT_VERSION).
+DELETE /data/ask/cache purges one question or everything.
+
+Hit rate: every lookup adds one to the hits or misses counter in a single stats
+row, so replaced entries and questions whose translation failed are counted too.
+The counters are shared by every worker process and reset by a full purge.
+
+Schema:
+  sparql_translations (
+    question_key TEXT PRIMARY KEY,  -- normalised question
+    question TEXT,                  -- as first asked
+    sparql TEXT,
+    prompt_version TEXT,
+    created_at TEXT,
+    hits INTEGER,
+    last_hit_at TEXT
+  )
+  sparql_translation_stats (
+    id INTEGER PRIMARY KEY,         -- always 1
+    hits INTEGER,
+    misses INTEGER
+  )
+"""
+import logging
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from config import settings
+from models.data import TranslationCacheStats
+from services import sqlite_pool
+
+logger = logging.getLogger(__name__)
+
+_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sparql_translations (
+    question_key TEXT PRIMARY KEY,
+    question TEXT NOT NULL,
+    sparql TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    last_hit_at TEXT
+);
+CREATE TABLE IF NOT EXISTS sparql_translation_stats (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO sparql_translation_stats (id) VALUES (1);
+"""
+
+_STOP_WORDS = frozenset("""
+    a an the me us my our please show list give find get display tell
+    whose is are was were there be can could would will you i to do does
+    any all every of in on for that this these those some
+""".split())
+
+_QUOTED = re.compile(r"""("[^"]*"|'[^']*')""")
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def _conn():
+    return sqlite_pool.connect(_DB_SCHEMA)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def normalize(question: str) -> str:
+    """Cache key for a question: case, whitespace, punctuation and filler words removed."""
+    parts = []
+    for i, segment in enumerate(_QUOTED.split(question)):
+        if i % 2:  # quoted literal — keep as written
+            parts.append(segment)
+            continue
+        words = _PUNCTUATION.sub(" ", segment.lower()).split()
+        parts.extend(w for w in words if w not in _STOP_WORDS)
+    return " ".join(parts)
+
+
+def get(question: str, prompt_version: str) -> Optional[str]:
+    """Cached SPARQL for the question, or None. Counts a hit or a miss."""
+    key = normalize(question)
+    cutoff = (_now() - timedelta(seconds=settings.translation_cache_ttl_seconds)).isoformat()
+    try:
+        with _conn() as db:
+            row = db.execute(
+                """SELECT sparql FROM sparql_translations
+                   WHERE question_key = ? AND prompt_version = ? AND created_at >= ?""",
+                (key, prompt_version, cutoff),
+            ).fetchone()
+            if row is None:
+                db.execute("UPDATE sparql_translation_stats SET misses = misses + 1")
+            else:
+                db.execute("UPDATE sparql_translation_stats SET hits = hits + 1")
+                db.execute(
+                    "UPDATE sparql_translations SET hits = hits + 1, last_hit_at = ? WHERE question_key = ?",
+                    (_now().isoformat(), key),
+                )
+            db.commit()
+    except sqlite3.Error as exc:
+        logger.warning("Translation cache: lookup failed: %s", exc)
+        return None
+    return row["sparql"] if row else None
+
+
+def put(question: str, sparql: str, prompt_version: str) -> None:
+    """Store a translation whose query ran successfully (replacing an expired or outdated one)."""
+    try:
+        with _conn() as db:
+            db.execute(
+                """INSERT OR REPLACE INTO sparql_translations
+                   (question_key, question, sparql, prompt_version, created_at, hits, last_hit_at)
+                   VALUES (?, ?, ?, ?, ?, 0, NULL)""",
+                (normalize(question), question, sparql, prompt_version, _now().isoformat()),
+            )
+            db.commit()
+    except sqlite3.Error as exc:
+        logger.warning("Translation cache: could not store translation: %s", exc)
+
+
+def purge(question: Optional[str] = None) -> int:
+    """Delete the entry for one question, or every entry. Returns how many were deleted."""
+    with _conn() as db:
+        if question is None:
+            cur = db.execute("DELETE FROM sparql_translations")
+            db.execute("UPDATE sparql_translation_stats SET hits = 0, misses = 0")
+        else:
+            cur = db.execute("DELETE FROM sparql_translations WHERE question_key = ?", (normalize(question),))
+        db.commit()
+    logger.info("Translation cache: purged %d entr%s", cur.rowcount, "y" if cur.rowcount == 1 else "ies")
+    return cur.rowcount
+
+
+def stats() -> Optional[TranslationCacheStats]:
+    """Hits, misses and hit rate since the last full purge, or None if the cache is unavailable."""
+    try:
+        with _conn() as db:
+            entries = db.execute("SELECT COUNT(*) FROM sparql_translations").fetchone()[0]
+            hits, misses = db.execute("SELECT hits, misses FROM sparql_translation_stats").fetchone()
+    except sqlite3.Error as exc:
+        logger.warning("Translation cache: could not read stats: %s", exc)
+        return None
+    total = hits + misses
+    return TranslationCacheStats(
+        entries=entries,
+        hits=hits,
+        misses=misses,
+        hit_rate=round(hits / total, 4) if total else 0.0,
+    )
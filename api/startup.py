@@ -1,9 +1,20 @@
 """
-Generate RSA-2048 key pair on first boot if not already present.
+Generate the node's key pairs on first boot if not already present.
 Called from main.py lifespan on startup.
+
+  RSA-2048 at settings.private_key_path          — RS256, always (protocol version 2 peers)
+  Ed25519  at settings.private_key_path.ed25519  — EdDSA, if enabled in settings.jwt_algorithms
+
+Every worker process runs this on startup. Generation holds an exclusive lock on
+<key path>.lock, so when several workers boot at once exactly one generates each
+key and the others wait for it, then find the key present.
 """
+import fcntl
 import logging
 import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
 
 from config import settings
 
@@ -11,49 +22,106 @@ logger = logging.getLogger(__name__)
 
 
 def ensure_key_pair() -> None:
-    """Generate RSA-2048 private key at settings.private_key_path if absent."""
-    key_path = settings.private_key_path
-    pub_path = key_path + ".pub"
+    """Generate every missing key pair this node needs."""
+    from services.jwt_service import key_path, local_algorithms
+
+    for algorithm in ["RS256"] + [alg for alg in local_algorithms() if alg != "RS256"]:
+        _ensure(algorithm, key_path(algorithm))
+
+
+def _generate(algorithm: str):
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+    if algorithm == "EdDSA":
+        return ed25519.Ed25519PrivateKey.generate()
+    return rsa.generate_private_key(
+        public_exponent=65537,
+        key_size=2048,
+    )
+
+
+@contextmanager
+def _key_lock(key_path: str) -> Iterator[None]:
+    """Hold an exclusive flock on key_path.lock, waiting up to key_lock_timeout_seconds."""
+    os.makedirs(os.path.dirname(key_path) or ".", exist_ok=True)
+    deadline = time.monotonic() + settings.key_lock_timeout_seconds
+    with open(key_path + ".lock", "a") as lock_file:
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Timed out waiting for {key_path}.lock")
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
 
+
+def _ensure(algorithm: str, key_path: str) -> None:
+    """Generate the private key for algorithm at key_path (public key at key_path.pub) if absent."""
     if os.path.exists(key_path):
-        logger.info("RSA key already exists at %s — skipping generation", key_path)
+        logger.info("%s key already exists at %s — skipping generation", algorithm, key_path)
         return
+    with _key_lock(key_path):
+        if os.path.exists(key_path):  # another worker generated it while we waited
+            logger.info("%s key generated by another worker at %s", algorithm, key_path)
+            return
+        _write_key_pair(algorithm, key_path)
+
+
+def _write_atomically(path: str, data: bytes, mode: int = 0o644) -> None:
+    """Write to a temp file and rename it into place, so no process ever reads a partial key.
+
+    The temp file is created with its final mode, so a private key is never readable
+    by others, not even briefly. A leftover from a crashed boot with the same pid is
+    removed first (we hold the key lock).
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.unlink(tmp)
+    except FileNotFoundError:
+        pass
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, mode)
+    with os.fdopen(fd, "wb") as f:
+        os.fchmod(f.fileno(), mode)  # the umask may have narrowed the public key's mode
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _write_key_pair(algorithm: str, key_path: str) -> None:
+    pub_path = key_path + ".pub"
 
     try:
         from cryptography.hazmat.primitives import serialization
-        from cryptography.hazmat.primitives.asymmetric import rsa
 
-        logger.info("Generating RSA-2048 key pair at %s", key_path)
+        logger.info("Generating %s key pair at %s", algorithm, key_path)
 
-        os.makedirs(os.path.dirname(key_path), exist_ok=True)
+        private_key = _generate(algorithm)
 
-        private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
+        # Public key alongside it for convenience
+        _write_atomically(
+            pub_path,
+            private_key.public_key().public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            ),
+        )
+        # Private key (PEM, no passphrase) last: once key_path exists, the pair is complete
+        _write_atomically(
+            key_path,
+            private_key.private_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption(),
+            ),
+            mode=0o600,
         )
 
-        # Write private key (PEM, no passphrase)
-        with open(key_path, "wb") as f:
-            f.write(
-                private_key.private_bytes(
-                    encoding=serialization.Encoding.PEM,
-                    format=serialization.PrivateFormat.PKCS8,
-                    encryption_algorithm=serialization.NoEncryption(),
-                )
-            )
-        os.chmod(key_path, 0o600)
-
-        # Write public key alongside it for convenience
-        with open(pub_path, "wb") as f:
-            f.write(
-                private_key.public_key().public_bytes(
-                    encoding=serialization.Encoding.PEM,
-                    format=serialization.PublicFormat.SubjectPublicKeyInfo,
-                )
-            )
-
-        logger.info("RSA key pair generated successfully")
+        logger.info("%s key pair generated successfully", algorithm)
 
     except Exception as exc:
-        logger.error("Failed to generate RSA key pair: %s", exc)
+        logger.error("Failed to generate %s key pair: %s", algorithm, exc)
         raise
@@ -1,12 +1,26 @@
-"""Tests for POST /bridge/receive."""
+"""Tests for POST /bridge/receive, /bridge/receive/batch and duplicate detection."""
 from unittest.mock import patch
 
+import pytest
 from fastapi.testclient import TestClient
 
 from main import app
+from services import notification_dedup
 
 client = TestClient(app)
 
+
+@pytest.fixture(autouse=True)
+def fresh_dedup(tmp_path):
+    """Each test starts with an empty duplicate filter backed by a throwaway SQLite file."""
+    from config import settings
+
+    with (
+        patch.object(settings, "db_path", str(tmp_path / "hilo.db")),
+        patch.object(notification_dedup, "_filter", notification_dedup.DuplicateFilter(bloom_bits=1 << 12)),
+    ):
+        yield
+
 VALID_NOTIFICATION = {
     "event_id": "evt-0001",
     "event_type": "order_created",
@@ -14,6 +28,7 @@ VALID_NOTIFICATION = {
     "subject": "http://hilo.semantics.io/events/order-0001",
     "created_at": "2026-03-01T12:00:00",
     "data_url": "http://node-b:8000/events/evt-0001",
+    "receiver": "all",
 }
 
 
@@ -98,3 +113,246 @@ def test_receive_notification_stores_to_graphdb():
     with patch("services.graphdb.store_notification") as mock_store:
         client.post("/bridge/receive", json=VALID_NOTIFICATION)
     mock_store.assert_called_once()
+
+
+# ── POST /bridge/receive/batch ────────────────────────────────────────────────
+
+def _batch(*event_ids: str) -> dict:
+    return {"notifications": [{**VALID_NOTIFICATION, "event_id": e} for e in event_ids]}
+
+
+def test_receive_batch_stores_in_single_update():
+    """A batch is written with one store_notifications call and every item reported received."""
+    with (
+        patch("services.graphdb.store_notifications") as mock_batch,
+        patch("services.graphdb.store_notification") as mock_single,
+    ):
+        response = client.post("/bridge/receive/batch", json=_batch("evt-0001", "evt-0002", "evt-0003"))
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "received"
+    assert [r["event_id"] for r in body["results"]] == ["evt-0001", "evt-0002", "evt-0003"]
+    assert all(r["status"] == "received" for r in body["results"])
+    mock_batch.assert_called_once()
+    assert len(mock_batch.call_args.args[0]) == 3
+    mock_single.assert_not_called()
+
+
+def test_receive_batch_reports_partial_failure_per_notification():
+    """When the batch update fails, items are stored one by one and failures reported individually."""
+    def store_one(notification):
+        if notification.event_id == "evt-0002":
+            raise Exception("bad literal")
+
+    with (
+        patch("services.graphdb.store_notifications", side_effect=Exception("GraphDB rejected update")),
+        patch("services.graphdb.store_notification", side_effect=store_one),
+    ):
+        batch = _batch("evt-0001", "evt-0002", "evt-0003", "evt-0004")
+        batch["notifications"][3]["subject"] = "http://hilo.semantics.io/events/order-0002"
+        response = client.post("/bridge/receive/batch", json=batch)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "partial"
+    # evt-0003 shares evt-0002's subject: not stored, so it cannot overtake evt-0002's resend
+    assert [r["status"] for r in body["results"]] == ["received", "error", "error", "received"]
+    assert "bad literal" in body["results"][1]["error"]
+    assert "earlier notification" in body["results"][2]["error"]
+
+
+def test_receive_batch_empty_returns_422():
+    """An empty batch is rejected."""
+    response = client.post("/bridge/receive/batch", json={"notifications": []})
+    assert response.status_code == 422
+
+
+# ── Duplicate short-circuit ───────────────────────────────────────────────────
+
+def test_duplicate_notification_skips_triple_store():
+    """A second copy of the same event_id is answered without calling GraphDB."""
+    with patch("services.graphdb.store_notification") as mock_store:
+        first = client.post("/bridge/receive", json=VALID_NOTIFICATION)
+        second = client.post("/bridge/receive", json=VALID_NOTIFICATION)
+    assert first.json()["status"] == "received"
+    assert second.status_code == 200
+    assert second.json() == {"status": "duplicate", "event_id": "evt-0001"}
+    mock_store.assert_called_once()
+
+
+def test_failed_store_is_not_remembered():
+    """If GraphDB fails, the retry from the source node is stored rather than treated as a duplicate."""
+    lenient_client = TestClient(app, raise_server_exceptions=False)
+    with patch("services.graphdb.store_notification", side_effect=[Exception("GraphDB down"), None]) as mock_store:
+        assert lenient_client.post("/bridge/receive", json=VALID_NOTIFICATION).status_code == 500
+        assert lenient_client.post("/bridge/receive", json=VALID_NOTIFICATION).json()["status"] == "received"
+    assert mock_store.call_count == 2
+
+
+def test_duplicates_survive_restart_via_sqlite():
+    """A fresh filter (new process) still recognises ids persisted by the previous one."""
+    with patch("services.graphdb.store_notification"):
+        client.post("/bridge/receive", json=VALID_NOTIFICATION)
+    with (
+        patch.object(notification_dedup, "_filter", notification_dedup.DuplicateFilter(bloom_bits=1 << 12)),
+        patch("services.graphdb.store_notification") as mock_store,
+    ):
+        response = client.post("/bridge/receive", json=VALID_NOTIFICATION)
+    assert response.json()["status"] == "duplicate"
+    mock_store.assert_not_called()
+
+
+def test_batch_marks_duplicates_and_stores_only_new():
+    """Duplicates in a batch are reported as such and left out of the single update."""
+    with patch("services.graphdb.store_notification"):
+        client.post("/bridge/receive", json=VALID_NOTIFICATION)
+    with patch("services.graphdb.store_notifications") as mock_batch:
+        response = client.post("/bridge/receive/batch", json=_batch("evt-0001", "evt-0002"))
+    body = response.json()
+    assert body["status"] == "received"
+    assert [r["status"] for r in body["results"]] == ["duplicate", "received"]
+    assert [n.event_id for n in mock_batch.call_args.args[0]] == ["evt-0002"]
+
+
+def test_bridge_stats_counts_duplicate_rate():
+    """GET /bridge/stats reports received, duplicates and the duplicate rate."""
+    with patch("services.graphdb.store_notification"):
+        for _ in range(4):
+            client.post("/bridge/receive", json=VALID_NOTIFICATION)
+    stats = client.get("/bridge/stats").json()
+    assert stats == {"received": 4, "duplicates": 3, "duplicate_rate": 0.75}
+
+
+def test_forget_source_allows_redelivery_after_purge():
+    """After a peer's graph is purged, its event ids are no longer treated as duplicates."""
+    with patch("services.graphdb.store_notification"):
+        client.post("/bridge/receive", json=VALID_NOTIFICATION)
+        notification_dedup.forget_source(VALID_NOTIFICATION["source_node"])
+        response = client.post("/bridge/receive", json=VALID_NOTIFICATION)
+    assert response.json()["status"] == "received"
+
+
+def _store_ids(count: int, received_at: str = "") -> None:
+    from datetime import datetime, timezone
+
+    received_at = received_at or datetime.now(timezone.utc).isoformat()
+    dedup = notification_dedup.DuplicateFilter()
+    dedup.check("warm-up")  # creates the table
+    with notification_dedup._conn() as db:
+        db.executemany(
+            "INSERT INTO received_notifications (event_id, source_node, received_at) VALUES (?, 'node-b', ?)",
+            [(f"evt-{i}", received_at) for i in range(count)],
+        )
+        db.commit()
+
+
+def test_stored_ids_past_retention_are_pruned_on_load():
+    from config import settings
+
+    _store_ids(3, received_at="2020-01-01T00:00:00+00:00")
+    dedup = notification_dedup.DuplicateFilter()
+    with patch.object(settings, "dedup_retention_days", 30):
+        assert dedup.check("evt-0") is False
+    with notification_dedup._conn() as db:
+        assert db.execute("SELECT COUNT(*) FROM received_notifications").fetchone()[0] == 0
+
+
+def test_stored_ids_beyond_max_rows_are_pruned_oldest_first():
+    from config import settings
+
+    _store_ids(25)
+    dedup = notification_dedup.DuplicateFilter(recent_size=5)
+    with (
+        patch.object(settings, "dedup_retention_days", 36500),
+        patch.object(settings, "dedup_max_rows", 10),
+        patch.object(notification_dedup, "_LOAD_BATCH", 4),  # several batches
+    ):
+        assert dedup.check("evt-24") is True   # newest: recent set
+        assert dedup.check("evt-15") is True   # kept: Bloom filter + SQLite
+        assert dedup.check("evt-14") is False  # pruned
+    with notification_dedup._conn() as db:
+        assert db.execute("SELECT COUNT(*) FROM received_notifications").fetchone()[0] == 10
+
+
+def test_bloom_filter_is_sized_from_stored_ids():
+    from config import settings
+
+    with (
+        patch.object(notification_dedup, "_MIN_BLOOM_IDS", 8),
+        patch.object(settings, "dedup_retention_days", 36500),
+    ):
+        _store_ids(20)
+        dedup = notification_dedup.DuplicateFilter()
+        dedup.check("evt-0")
+        assert dedup._bloom_capacity == 40
+        for i in range(21):
+            dedup.remember(f"new-{i}", "node-b")
+        assert dedup._loaded is False  # outgrew its sizing: rebuilt on the next check
+        dedup.check("evt-0")
+        assert dedup._bloom_capacity == 82
+
+
+# ── Per-source-node named graphs ──────────────────────────────────────────────
+
+def test_store_notification_writes_into_peer_graph():
+    """GraphDB: the INSERT DATA is wrapped in GRAPH <peer graph of the source node>."""
+    from config import settings
+    from models.events import EventNotification
+    from services import graphdb
+
+    with (
+        patch.object(settings, "graphdb_backend", "graphdb"),
+        patch("httpx.post") as mock_post,
+    ):
+        mock_post.return_value.raise_for_status.return_value = None
+        graphdb.store_notification(EventNotification(**VALID_NOTIFICATION))
+    update = mock_post.call_args.kwargs["data"]["update"]
+    assert f"GRAPH <{graphdb.peer_graph(VALID_NOTIFICATION['source_node'])}>" in update
+
+
+def test_drop_peer_graph_issues_single_drop():
+    """Purging a peer is one DROP SILENT GRAPH, not a pattern delete."""
+    from services import graphdb
+
+    with patch("services.graphdb._sparql_update") as mock_update:
+        graphdb.drop_peer_graph("node-b")
+    mock_update.assert_called_once_with(f"DROP SILENT GRAPH <{graphdb.peer_graph('node-b')}>")
+
+
+def test_legacy_peer_event_moves_into_peer_graph():
+    """Migration deletes the imported triples from the default graph, re-inserts them in
+    the peer's graph, then moves the metadata."""
+    from config import settings
+    from services import graphdb
+
+    payload = "@prefix ex: <http://example.org/> .\nex:order1 a ex:Order ."
+    meta = "http://hilo.semantics.io/events/meta/evt-0001"
+    graph = graphdb.peer_graph("node-b")
+    with (
+        patch.object(settings, "graphdb_backend", "graphdb"),
+        patch("httpx.post") as mock_post,
+    ):
+        mock_post.return_value.raise_for_status.return_value = None
+        graphdb.move_legacy_event(meta, "node-b", payload)
+    updates = [c.kwargs["data"]["update"] for c in mock_post.call_args_list]
+    assert len(updates) == 3
+    assert "DELETE DATA" in updates[0] and "GRAPH" not in updates[0]
+    assert "INSERT DATA" in updates[1] and f"GRAPH <{graph}>" in updates[1]
+    assert f"INSERT {{ GRAPH <{graph}> {{ <{meta}> ?p ?o }} }}" in updates[2]
+
+
+def test_migration_dry_run_changes_nothing(capsys):
+    import migrate_peer_graphs
+
+    legacy = [
+        {"meta": "http://hilo.semantics.io/events/meta/evt-0001", "source_node": "node-b", "payload": "<a> <b> <c> ."},
+        {"meta": "http://hilo.semantics.io/events/meta/evt-0002", "source_node": "node-b", "payload": None},
+    ]
+    with (
+        patch("services.graphdb.legacy_peer_events", return_value=legacy),
+        patch("services.graphdb.move_legacy_event") as mock_move,
+    ):
+        assert migrate_peer_graphs.main(["--dry-run"]) == 0
+        mock_move.assert_not_called()
+        assert migrate_peer_graphs.main([]) == 0
+    assert "node-b: 2 notification(s), 1 with imported triples" in capsys.readouterr().out
+    assert mock_move.call_count == 2
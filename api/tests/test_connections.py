@@ -2,13 +2,17 @@
 from datetime import datetime, timezone
 from unittest.mock import MagicMock, patch
 
+import pytest
 from fastapi.testclient import TestClient
 
 from main import app
 from models.connections import ConnectionResponse, ConnectionStatus
+from services.jwt_service import require_jwt
 
 client = TestClient(app)
 
+AUTH = {"Authorization": "Bearer dev"}
+
 
 # ── Fixtures ──────────────────────────────────────────────────────────────────
 
@@ -61,6 +65,36 @@ def test_request_connection_success():
     assert response.json()["status"] == "pending_incoming"
 
 
+def test_request_connection_stores_negotiated_key():
+    """A version 3 peer offering EdDSA has its Ed25519 key stored, not the RSA one."""
+    conn = _make_conn()
+    body = {
+        **VALID_REQUEST_BODY,
+        "algorithms": ["EdDSA", "RS256"],
+        "public_keys": {"EdDSA": "-----BEGIN PUBLIC KEY-----\nMCowBQYDK2Vw", "RS256": VALID_REQUEST_BODY["public_key"]},
+    }
+    with (
+        patch("services.connections.get_connection_by_peer", return_value=None),
+        patch("services.connections.create_incoming_request", return_value=conn) as mock_create,
+    ):
+        response = client.post("/connections/request", json=body)
+    assert response.status_code == 201
+    assert mock_create.call_args.kwargs["peer_public_key"] == "-----BEGIN PUBLIC KEY-----\nMCowBQYDK2Vw"
+
+
+def test_request_connection_without_common_algorithm_returns_400():
+    from config import settings
+
+    with (
+        patch.object(settings, "jwt_algorithms", ["EdDSA"]),
+        patch("services.connections.get_connection_by_peer", return_value=None),
+        patch("services.connections.create_incoming_request") as mock_create,
+    ):
+        response = client.post("/connections/request", json=VALID_REQUEST_BODY)
+    assert response.status_code == 400
+    mock_create.assert_not_called()
+
+
 def test_request_connection_logs_info():
     """Incoming connection request emits logger.info."""
     conn = _make_conn()
@@ -329,6 +363,27 @@ def test_connection_accepted_success():
     assert response.json()["status"] == "active"
 
 
+def test_connection_accepted_stores_negotiated_key():
+    pending = _make_conn(status=ConnectionStatus.pending_outgoing, peer_node_id="node-a")
+    active = _make_conn(status=ConnectionStatus.active, peer_node_id="node-a")
+
+    mock_resp = MagicMock()
+    mock_resp.raise_for_status.return_value = None
+    mock_resp.json.return_value = {
+        "public_key": "rsa-pem",
+        "algorithms": ["EdDSA", "RS256"],
+        "public_keys": {"EdDSA": "ed25519-pem", "RS256": "rsa-pem"},
+    }
+
+    with (
+        patch("services.connections.get_connection_by_peer", return_value=pending),
+        patch("httpx.get", return_value=mock_resp),
+        patch("services.connections.mark_active_from_callback", return_value=active) as mock_mark,
+    ):
+        client.post("/connections/accepted", json=VALID_ACCEPTED_BODY)
+    assert mock_mark.call_args.kwargs["peer_public_key"] == "ed25519-pem"
+
+
 def test_connection_accepted_peer_not_found_returns_404():
     """Callback for unknown peer returns 404."""
     with patch("services.connections.get_connection_by_peer", return_value=None):
@@ -390,13 +445,9 @@ def test_disconnect_success():
     """Disconnecting a peer deletes locally and notifies peer."""
     conn = _make_conn(status=ConnectionStatus.active)
 
-    mock_resp = MagicMock()
-    mock_resp.is_success = True
-    mock_resp.status_code = 200
-
     with (
         patch("services.connections.get_connection_by_peer", return_value=conn),
-        patch("httpx.post", return_value=mock_resp),
+        patch("services.peer_tasks.enqueue"),
         patch("services.connections.delete_connection"),
     ):
         response = client.post("/connections/node-b/disconnect")
@@ -411,37 +462,118 @@ def test_disconnect_not_found_returns_404():
     assert response.status_code == 404
 
 
-def test_disconnect_peer_notify_failure_still_deletes():
-    """If peer notify fails, local deletion still proceeds."""
+def test_disconnect_queues_peer_notice_and_deletes():
+    """The peer is notified by a background task; the local delete does not wait for it."""
     conn = _make_conn(status=ConnectionStatus.active)
 
     with (
         patch("services.connections.get_connection_by_peer", return_value=conn),
-        patch("httpx.post", side_effect=Exception("peer unreachable")),
+        patch("services.peer_tasks.enqueue") as mock_enqueue,
+        patch("httpx.post") as mock_post,
         patch("services.connections.delete_connection") as mock_delete,
     ):
         response = client.post("/connections/node-b/disconnect")
     assert response.status_code == 200
+    mock_enqueue.assert_called_once_with(
+        "disconnect_notice", "node-b", "http://node-b:8000/connections/node-a/disconnected",
+    )
+    mock_post.assert_not_called()
     mock_delete.assert_called_once_with("node-b")
 
 
-def test_disconnect_peer_returns_error_logs_warning():
-    """Non-success from peer notify emits logger.warning but still succeeds."""
+def test_disconnect_with_purge_drops_peer_graph():
+    """purge=true drops the peer's named graph and forgets its dedup ids."""
     conn = _make_conn(status=ConnectionStatus.active)
 
-    mock_resp = MagicMock()
-    mock_resp.is_success = False
-    mock_resp.status_code = 503
+    with (
+        patch("services.connections.get_connection_by_peer", return_value=conn),
+        patch("services.peer_tasks.enqueue"),
+        patch("services.connections.delete_connection"),
+        patch("services.graphdb.drop_peer_graph") as mock_drop,
+        patch("services.notification_dedup.forget_source") as mock_forget,
+        patch("services.payload_cache.drop_source") as mock_drop_cache,
+    ):
+        response = client.post("/connections/node-b/disconnect?purge=true", headers=AUTH)
+    assert response.status_code == 200
+    assert response.json() == {"status": "disconnected", "peer": "node-b", "purged": True}
+    mock_drop.assert_called_once_with("node-b")
+    mock_forget.assert_called_once_with("node-b")
+    mock_drop_cache.assert_called_once_with("node-b")
+
+
+def test_disconnect_without_purge_keeps_peer_graph():
+    """Plain disconnect leaves the peer's data in place."""
+    conn = _make_conn(status=ConnectionStatus.active)
 
     with (
         patch("services.connections.get_connection_by_peer", return_value=conn),
-        patch("httpx.post", return_value=mock_resp),
+        patch("services.peer_tasks.enqueue"),
         patch("services.connections.delete_connection"),
-        patch("routes.connections.logger") as mock_logger,
+        patch("services.graphdb.drop_peer_graph") as mock_drop,
     ):
         response = client.post("/connections/node-b/disconnect")
     assert response.status_code == 200
-    mock_logger.warning.assert_called()
+    mock_drop.assert_not_called()
+
+
+def test_disconnect_purge_failure_returns_502():
+    """If the graph drop fails the connection is still gone, but the caller is told."""
+    conn = _make_conn(status=ConnectionStatus.active)
+
+    with (
+        patch("services.connections.get_connection_by_peer", return_value=conn),
+        patch("services.peer_tasks.enqueue"),
+        patch("services.connections.delete_connection") as mock_delete,
+        patch("services.graphdb.drop_peer_graph", side_effect=Exception("store down")),
+    ):
+        response = client.post("/connections/node-b/disconnect?purge=true", headers=AUTH)
+    assert response.status_code == 502
+    mock_delete.assert_called_once_with("node-b")
+
+
+def test_purge_without_connection_drops_peer_data():
+    """After the peer disconnected first there is no row, but its data can still be purged."""
+    with (
+        patch("services.connections.get_connection_by_peer", return_value=None),
+        patch("services.graphdb.drop_peer_graph") as mock_drop,
+        patch("services.notification_dedup.forget_source") as mock_forget,
+        patch("services.payload_cache.drop_source") as mock_drop_cache,
+    ):
+        assert client.post("/connections/node-b/disconnect?purge=true", headers=AUTH).status_code == 404
+        response = client.post("/connections/node-b/purge", headers=AUTH)
+    assert response.status_code == 200
+    assert response.json() == {"status": "purged", "peer": "node-b"}
+    mock_drop.assert_called_once_with("node-b")
+    mock_forget.assert_called_once_with("node-b")
+    mock_drop_cache.assert_called_once_with("node-b")
+
+
+def test_purge_failure_returns_502():
+    with patch("services.graphdb.drop_peer_graph", side_effect=Exception("store down")):
+        response = client.post("/connections/node-b/purge", headers=AUTH)
+    assert response.status_code == 502
+
+
+def test_purge_requires_internal_key():
+    """Purging destroys data: anonymous callers get 401, peers 403, and nothing is dropped."""
+    conn = _make_conn(status=ConnectionStatus.active)
+    peer = {"sub": "node-b", "iss": "node-b"}
+    with (
+        patch("services.connections.get_connection_by_peer", return_value=conn),
+        patch("services.connections.delete_connection") as mock_delete,
+        patch("services.graphdb.drop_peer_graph") as mock_drop,
+    ):
+        assert client.post("/connections/node-b/purge").status_code == 401
+        assert client.post("/connections/node-b/disconnect?purge=true").status_code == 401
+        with patch("routes.connections.require_jwt", return_value=peer):
+            assert client.post("/connections/node-b/disconnect?purge=true", headers=AUTH).status_code == 403
+        app.dependency_overrides[require_jwt] = lambda: peer
+        try:
+            assert client.post("/connections/node-b/purge", headers=AUTH).status_code == 403
+        finally:
+            app.dependency_overrides.pop(require_jwt, None)
+    mock_delete.assert_not_called()
+    mock_drop.assert_not_called()
 
 
 # ── POST /connections/{node_id}/disconnected ──────────────────────────────────
@@ -466,3 +598,68 @@ def test_peer_disconnected_no_auth_required():
     with patch("services.connections.delete_connection"):
         response = client.post("/connections/node-b/disconnected")
     assert response.status_code == 200
+
+
+# ── Delivery queue lifecycle (service layer) ──────────────────────────────────
+
+@pytest.fixture
+def conn_db(tmp_path):
+    """Point the connections service at a throwaway SQLite file."""
+    from config import settings
+    from services import connections as conn_svc
+
+    with patch.object(settings, "db_path", str(tmp_path / "hilo.db")):
+        conn_svc.init_db()
+        yield conn_svc
+
+
+def test_accept_connection_declares_delivery_queue(conn_db):
+    """Accepting an incoming request creates the peer's delivery queue."""
+    pending = conn_db.create_incoming_request("node-b", "Node B", "http://node-b:8000", "PEM")
+    with (
+        patch("services.queue.declare_peer_queue") as mock_declare,
+        patch("services.connections._send_acceptance_callback"),
+    ):
+        conn_db.accept_connection(pending.id)
+    mock_declare.assert_called_once_with("node-b")
+
+
+def test_delete_connection_deletes_delivery_queue(conn_db):
+    """Deleting a connection removes the peer's delivery queue."""
+    conn_db.create_incoming_request("node-b", "Node B", "http://node-b:8000", "PEM")
+    with patch("services.queue.delete_peer_queue") as mock_delete:
+        assert conn_db.delete_connection("node-b") is True
+    mock_delete.assert_called_once_with("node-b")
+
+
+def test_delete_connection_survives_queue_failure(conn_db):
+    """An unreachable broker does not block the local delete."""
+    conn_db.create_incoming_request("node-b", "Node B", "http://node-b:8000", "PEM")
+    with patch("services.queue.delete_peer_queue", side_effect=Exception("broker down")):
+        assert conn_db.delete_connection("node-b") is True
+    assert conn_db.get_connection_by_peer("node-b") is None
+
+
+# ── GET /.well-known/hilo-node ────────────────────────────────────────────────
+
+def test_well_known_advertises_algorithms_and_keys(tmp_path):
+    from config import settings
+    from startup import ensure_key_pair
+
+    with patch.object(settings, "private_key_path", str(tmp_path / "node.key")):
+        ensure_key_pair()
+        response = client.get("/.well-known/hilo-node")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["algorithms"] == ["EdDSA", "RS256"]
+    assert body["public_keys"]["RS256"] == body["public_key"]
+    assert body["public_keys"]["EdDSA"].startswith("-----BEGIN PUBLIC KEY-----")
+    assert body["version"] == "3"
+
+
+def test_well_known_before_key_generation_returns_503(tmp_path):
+    from config import settings
+
+    with patch.object(settings, "private_key_path", str(tmp_path / "node.key")):
+        response = client.get("/.well-known/hilo-node")
+    assert response.status_code == 503
@@ -1,13 +1,22 @@
 """Tests for POST /data/ask endpoint."""
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
+from config import settings
 from main import app
+from services import llm, translation_cache
 
 client = TestClient(app)
 
+
+@pytest.fixture(autouse=True)
+def tmp_db(tmp_path):
+    with patch.object(settings, "db_path", str(tmp_path / "hilo.db")):
+        yield
+
 # ── Fixtures ──────────────────────────────────────────────────────────────────
 
 VALID_SPARQL = (
@@ -89,3 +98,97 @@ def test_ask_non_select_query_returns_200_with_error_field():
     assert body["results"] is None
     assert body["error"] is not None
     assert "SELECT" in body["error"]
+
+
+# ── Translation cache ─────────────────────────────────────────────────────────
+
+def _ask(question: str, translate: MagicMock, results=FIXTURE_RESULTS) -> dict:
+    graph = patch("routes.data.graphdb.query_data", return_value=results)
+    if isinstance(results, Exception):
+        graph = patch("routes.data.graphdb.query_data", side_effect=results)
+    with (
+        patch("routes.data.settings") as mock_settings,
+        patch("routes.data.llm.translate_to_sparql", translate),
+        graph,
+    ):
+        mock_settings.anthropic_api_key = "sk-test"
+        response = client.post("/data/ask", json={"question": question})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_normalize_ignores_case_punctuation_and_filler_words():
+    assert translation_cache.normalize("Show me all the orders?") == "orders"
+    assert translation_cache.normalize("  orders  ") == "orders"
+    assert translation_cache.normalize("What orders are NOT shipped?") == "what orders not shipped"
+    assert translation_cache.normalize("who shipped order 7") != translation_cache.normalize("which shipped order 7")
+    assert translation_cache.normalize("documents with status 'Submitted'") == "documents with status 'Submitted'"
+    assert translation_cache.normalize("latest 5 events") != translation_cache.normalize("latest 10 events")
+
+
+def test_repeated_question_is_answered_from_cache():
+    translate = MagicMock(return_value=VALID_SPARQL)
+    first = _ask("Show me all events", translate)
+    second = _ask("show me events!", translate)
+
+    assert translate.call_count == 1
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["sparql"] == VALID_SPARQL
+    assert second["results"] == FIXTURE_RESULTS
+    assert second["cache"] == {"entries": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_failed_query_is_not_cached():
+    translate = MagicMock(return_value=VALID_SPARQL)
+    _ask("show me events", translate, results=Exception("GraphDB down"))
+    body = _ask("show me events", translate)
+    assert translate.call_count == 2
+    assert body["cached"] is False
+
+
+def test_every_lookup_is_counted():
+    """Failed translations count as misses, and replacing an entry keeps the hits counted so far."""
+    _ask("show me events", MagicMock(side_effect=Exception("Anthropic API unreachable")))
+    translate = MagicMock(return_value=VALID_SPARQL)
+    _ask("show me events", translate)
+    _ask("show me events", translate)
+    translation_cache.put("show me events", VALID_SPARQL, llm.PROMPT_VERSION)
+    stats = translation_cache.stats()
+    assert (stats.entries, stats.hits, stats.misses) == (1, 1, 2)
+
+
+def test_expired_or_outdated_translations_are_not_used():
+    translation_cache.put("show me events", VALID_SPARQL, llm.PROMPT_VERSION)
+    assert translation_cache.get("show me events", "other-prompt") is None
+    with patch.object(settings, "translation_cache_ttl_seconds", -1):
+        assert translation_cache.get("show me events", llm.PROMPT_VERSION) is None
+    assert translation_cache.get("show me events", llm.PROMPT_VERSION) == VALID_SPARQL
+
+
+def test_purge_one_question_or_everything():
+    translation_cache.put("show me events", VALID_SPARQL, llm.PROMPT_VERSION)
+    translation_cache.put("show me orders", VALID_SPARQL, llm.PROMPT_VERSION)
+
+    response = client.delete("/data/ask/cache", params={"question": "Events?"})
+    assert response.json() == {"purged": 1}
+    assert translation_cache.get("show me events", llm.PROMPT_VERSION) is None
+
+    response = client.delete("/data/ask/cache")
+    assert response.json() == {"purged": 1}
+    assert translation_cache.stats().entries == 0
+
+
+def test_llm_client_is_reused_across_questions():
+    reply = SimpleNamespace(content=[SimpleNamespace(text=VALID_SPARQL)])
+    fake_anthropic = MagicMock()
+    fake_anthropic.Anthropic.return_value.messages.create.return_value = reply
+    with (
+        patch.dict("sys.modules", {"anthropic": fake_anthropic}),
+        patch.object(settings, "anthropic_api_key", "sk-test"),
+        patch.object(llm, "_client", None),
+        patch.object(llm, "_client_key", None),
+    ):
+        llm.translate_to_sparql("show me events")
+        llm.translate_to_sparql("show me orders")
+    assert fake_anthropic.Anthropic.call_count == 1
@@ -2,6 +2,8 @@
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 
+import pytest
+
 from fastapi.testclient import TestClient
 
 from main import app
@@ -73,7 +75,7 @@ def test_list_events_limit():
     with patch("services.graphdb.get_events", return_value=MOCK_EVENTS[:1]) as mock:
         response = client.get("/events?limit=1", headers=AUTH)
     assert response.status_code == 200
-    mock.assert_called_once_with(since=None, event_type=None, limit=1)
+    mock.assert_called_once_with(since=None, event_type=None, limit=1, source_node=None)
 
 
 def test_list_events_event_type_filter():
@@ -82,7 +84,7 @@ def test_list_events_event_type_filter():
     with patch("services.graphdb.get_events", return_value=filtered) as mock:
         response = client.get("/events?event_type=order_created", headers=AUTH)
     assert response.status_code == 200
-    mock.assert_called_once_with(since=None, event_type="order_created", limit=50)
+    mock.assert_called_once_with(since=None, event_type="order_created", limit=50, source_node=None)
     data = response.json()
     assert all(e["event_type"] == "order_created" for e in data)
 
@@ -92,7 +94,15 @@ def test_list_events_limit_and_type_combined():
     with patch("services.graphdb.get_events", return_value=[]) as mock:
         response = client.get("/events?limit=10&event_type=shipment_update", headers=AUTH)
     assert response.status_code == 200
-    mock.assert_called_once_with(since=None, event_type="shipment_update", limit=10)
+    mock.assert_called_once_with(since=None, event_type="shipment_update", limit=10, source_node=None)
+
+
+def test_list_events_source_node_filter():
+    """source_node is passed through so the service can scope to the peer's graph."""
+    with patch("services.graphdb.get_events", return_value=[]) as mock:
+        response = client.get("/events?source_node=node-b", headers=AUTH)
+    assert response.status_code == 200
+    mock.assert_called_once_with(since=None, event_type=None, limit=50, source_node="node-b")
 
 
 def test_list_events_limit_out_of_range():
@@ -289,11 +299,12 @@ def test_import_event_success():
     _bypass_jwt()
     with (
         patch("services.graphdb.get_event_by_id", return_value=_make_peer_event()),
-        patch("services.graphdb.import_event_triples"),
+        patch("services.graphdb.import_event_triples") as mock_import,
     ):
         response = client.post("/events/evt-0001/import", json=VALID_IMPORT_PAYLOAD)
     assert response.status_code == 200
     assert response.json() == {"status": "imported", "id": "evt-0001"}
+    assert mock_import.call_args.kwargs["source_node"] == "node-b"
     _restore_jwt()
 
 
@@ -406,3 +417,284 @@ def test_create_event_receiver_all_does_not_query_db():
     assert response.status_code == 201
     mock_conn.assert_not_called()
     _restore_jwt()
+
+
+# ── POST /events/{id}/import-from-source ──────────────────────────────────────
+
+PEER_PAYLOAD = {"id": "evt-0001", "triples": "@prefix ex: <http://example.org/> .\nex:thing a ex:Thing ."}
+
+
+@pytest.fixture
+def empty_payload_cache(tmp_path):
+    from config import settings
+    from services import payload_cache
+
+    with (
+        patch.object(settings, "payload_cache_dir", str(tmp_path / "cache")),
+        patch.object(payload_cache, "_total_bytes", None),
+    ):
+        yield payload_cache
+
+
+def test_import_from_source_fetches_and_imports(empty_payload_cache):
+    """The API fetches the triples itself and imports them into the peer's graph."""
+    _bypass_jwt()
+    with (
+        patch("services.graphdb.get_event_by_id", return_value=_make_peer_event()),
+        patch("services.peer_fetch.fetch_event_payload", return_value=PEER_PAYLOAD) as mock_fetch,
+        patch("services.graphdb.import_event_triples") as mock_import,
+    ):
+        response = client.post("/events/evt-0001/import-from-source")
+    _restore_jwt()
+    assert response.status_code == 200
+    assert response.json() == {"status": "imported", "id": "evt-0001", "cached": False}
+    mock_fetch.assert_called_once_with("node-b", "http://node-b:8000/events/evt-0001")
+    mock_import.assert_called_once_with("evt-0001", PEER_PAYLOAD["triples"], source_node="node-b")
+
+
+def test_import_from_source_uses_payload_cache(empty_payload_cache):
+    """A prefetched (or previously viewed) payload is imported without contacting the peer."""
+    empty_payload_cache.put("node-b", "evt-0001", PEER_PAYLOAD)
+    _bypass_jwt()
+    with (
+        patch("services.graphdb.get_event_by_id", return_value=_make_peer_event()),
+        patch("services.peer_fetch.fetch_event_payload") as mock_fetch,
+        patch("services.graphdb.import_event_triples"),
+    ):
+        response = client.post("/events/evt-0001/import-from-source")
+    _restore_jwt()
+    assert response.json()["cached"] is True
+    mock_fetch.assert_not_called()
+
+
+def test_import_from_source_already_imported_returns_409(empty_payload_cache):
+    _bypass_jwt()
+    with patch("services.graphdb.get_event_by_id", return_value=_make_peer_event(has_local_copy=True)):
+        response = client.post("/events/evt-0001/import-from-source")
+    _restore_jwt()
+    assert response.status_code == 409
+
+
+def test_import_from_source_unreachable_peer_returns_502(empty_payload_cache):
+    import httpx
+
+    _bypass_jwt()
+    with (
+        patch("services.graphdb.get_event_by_id", return_value=_make_peer_event()),
+        patch("services.peer_fetch.fetch_event_payload", side_effect=httpx.ConnectError("down")),
+        patch("services.graphdb.import_event_triples") as mock_import,
+    ):
+        response = client.post("/events/evt-0001/import-from-source")
+    _restore_jwt()
+    assert response.status_code == 502
+    mock_import.assert_not_called()
+
+
+def test_import_from_source_rejects_peer_jwt_returns_403():
+    app.dependency_overrides[require_jwt] = lambda: {"sub": "node-b", "iss": "node-b"}
+    response = client.post("/events/evt-0001/import-from-source")
+    _restore_jwt()
+    assert response.status_code == 403
+
+
+def test_bulk_import_from_source_reports_per_event(empty_payload_cache):
+    """Bulk import returns one result per id, in request order."""
+    events = {
+        "evt-0001": _make_peer_event(),
+        "evt-0002": _make_peer_event(has_local_copy=True),
+    }
+    _bypass_jwt()
+    with (
+        patch("services.graphdb.get_event_by_id", side_effect=lambda event_id: events.get(event_id)),
+        patch("services.peer_fetch.fetch_event_payload", return_value=PEER_PAYLOAD),
+        patch("services.graphdb.import_event_triples"),
+    ):
+        response = client.post(
+            "/events/import-from-source",
+            json={"event_ids": ["evt-0001", "evt-0002", "evt-9999"]},
+        )
+    _restore_jwt()
+    assert response.status_code == 200
+    assert [(r["id"], r["status"]) for r in response.json()["results"]] == [
+        ("evt-0001", "imported"),
+        ("evt-0002", "already_imported"),
+        ("evt-9999", "error"),
+    ]
+
+
+@pytest.fixture
+def connected_peer():
+    """node-b is an active peer at http://node-b:8000."""
+    from datetime import timezone
+
+    from models.connections import ConnectionResponse, ConnectionStatus
+
+    now = datetime.now(timezone.utc)
+    conn = ConnectionResponse(
+        id="conn-0001",
+        peer_node_id="node-b",
+        peer_name="Node B",
+        peer_base_url="http://node-b:8000",
+        peer_public_key="-----BEGIN PUBLIC KEY-----",
+        status=ConnectionStatus.active,
+        initiated_by="us",
+        created_at=now,
+        updated_at=now,
+    )
+    with patch("services.connections.get_connection_by_peer", return_value=conn) as mock_get:
+        yield mock_get
+
+
+def test_import_from_source_refuses_foreign_data_url(empty_payload_cache, connected_peer):
+    """A data link outside node-b's base URL is not followed with a token signed for node-b."""
+    from services import peer_fetch
+
+    event = _make_peer_event()
+    event.links["data"] = "http://attacker:8000/events/evt-0001"
+    _bypass_jwt()
+    with (
+        patch("services.graphdb.get_event_by_id", return_value=event),
+        patch("services.peer_fetch.sign_token") as mock_sign,
+        patch.object(peer_fetch, "_get_client") as mock_client,
+    ):
+        response = client.post("/events/evt-0001/import-from-source")
+    _restore_jwt()
+    assert response.status_code == 422
+    mock_sign.assert_not_called()
+    mock_client.return_value.get.assert_not_called()
+
+
+def test_import_from_source_refuses_unconnected_source(empty_payload_cache, connected_peer):
+    connected_peer.return_value = None
+    _bypass_jwt()
+    with (
+        patch("services.graphdb.get_event_by_id", return_value=_make_peer_event()),
+        patch("services.peer_fetch.sign_token") as mock_sign,
+    ):
+        response = client.post("/events/evt-0001/import-from-source")
+    _restore_jwt()
+    assert response.status_code == 422
+    assert "No active connection" in response.json()["detail"]
+    mock_sign.assert_not_called()
+
+
+def test_peer_token_rejected_is_resigned_once(empty_payload_cache, connected_peer):
+    """A 401 from the peer retries once with a freshly signed token."""
+    from datetime import timedelta, timezone
+
+    from services import peer_fetch
+
+    expires = datetime.now(timezone.utc) + timedelta(minutes=5)
+    rejected = MagicMock(status_code=401)
+    ok = MagicMock(status_code=200)
+    ok.json.return_value = PEER_PAYLOAD
+    with (
+        patch("services.peer_fetch.sign_token", return_value=("tok", expires)) as mock_sign,
+        patch.object(peer_fetch, "_get_client") as mock_client,
+    ):
+        mock_client.return_value.get.side_effect = [rejected, ok]
+        assert peer_fetch.fetch_event_payload("node-b", "http://node-b:8000/events/evt-0001") == PEER_PAYLOAD
+    assert [c.kwargs["fresh"] for c in mock_sign.call_args_list] == [False, True]
+
+
+# ── ETags / conditional GET ───────────────────────────────────────────────────
+
+def test_get_event_returns_etag_and_cache_headers():
+    with patch("services.graphdb.get_event_by_id", return_value=_make_peer_event()):
+        response = client.get("/events/evt-0001", headers=AUTH)
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["cache-control"] == "private, no-cache"
+    assert response.headers["vary"] == "Authorization"
+
+
+def test_get_local_event_is_immutable():
+    event = _make_event("order_created", 1)
+    with patch("services.graphdb.get_event_by_id", return_value=event):
+        response = client.get("/events/evt-0001", headers=AUTH)
+    assert "immutable" in response.headers["cache-control"]
+
+
+def test_get_event_if_none_match_returns_304_without_querying():
+    """Once served, a matching If-None-Match is answered from memory."""
+    with patch("services.graphdb.get_event_by_id", return_value=_make_peer_event()):
+        etag = client.get("/events/evt-0001", headers=AUTH).headers["etag"]
+    with patch("services.graphdb.get_event_by_id") as mock_get:
+        response = client.get("/events/evt-0001", headers={**AUTH, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    mock_get.assert_not_called()
+
+
+def test_import_changes_event_etag():
+    """has_local_copy flips on import, so the old ETag no longer matches."""
+    _bypass_jwt()
+    with patch("services.graphdb.get_event_by_id", return_value=_make_peer_event()):
+        etag = client.get("/events/evt-0001").headers["etag"]
+    with (
+        patch("services.graphdb.get_event_by_id", return_value=_make_peer_event()),
+        patch("services.graphdb.import_event_triples"),
+    ):
+        client.post("/events/evt-0001/import", json=VALID_IMPORT_PAYLOAD)
+    with patch("services.graphdb.get_event_by_id", return_value=_make_peer_event(has_local_copy=True)):
+        response = client.get("/events/evt-0001", headers={"If-None-Match": etag})
+    _restore_jwt()
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_list_events_if_none_match_returns_304_without_querying():
+    with patch("services.graphdb.get_events", return_value=MOCK_EVENTS):
+        etag = client.get("/events?limit=10", headers=AUTH).headers["etag"]
+    with patch("services.graphdb.get_events") as mock_get:
+        response = client.get("/events?limit=10", headers={**AUTH, "If-None-Match": etag})
+    assert response.status_code == 304
+    mock_get.assert_not_called()
+
+
+def test_list_etag_differs_per_query():
+    with patch("services.graphdb.get_events", return_value=[]):
+        a = client.get("/events?limit=10", headers=AUTH).headers["etag"]
+        b = client.get("/events?limit=20", headers=AUTH).headers["etag"]
+    assert a != b
+
+
+def test_received_notification_invalidates_list_etag():
+    with patch("services.graphdb.get_events", return_value=MOCK_EVENTS):
+        etag = client.get("/events", headers=AUTH).headers["etag"]
+    with (
+        patch("services.notification_dedup.is_duplicate", return_value=False),
+        patch("services.notification_dedup.mark_stored"),
+        patch("services.prefetch.schedule"),
+        patch("services.graphdb.store_notification"),
+    ):
+        client.post("/bridge/receive", json={
+            "event_id": "evt-0042",
+            "event_type": "order_created",
+            "source_node": "node-b",
+            "subject": "http://hilo.semantics.io/events/order-0042",
+            "created_at": "2026-03-01T12:00:00",
+            "data_url": "http://node-b:8000/events/evt-0042",
+            "receiver": "all",
+        })
+    with patch("services.graphdb.get_events", return_value=MOCK_EVENTS) as mock_get:
+        response = client.get("/events", headers={**AUTH, "If-None-Match": etag})
+    assert response.status_code == 200
+    mock_get.assert_called_once()
+
+
+def test_known_etags_are_capped_least_recently_used_first():
+    from config import settings
+    from services import event_etags
+
+    with (
+        patch.object(settings, "event_etag_cache_size", 2),
+        patch.object(event_etags, "_known", event_etags.OrderedDict()),
+    ):
+        for n in (1, 2):
+            event_etags.event_etag(_make_event(n=n))
+        assert event_etags.known_etag("evt-0001") is not None  # now most recently used
+        event_etags.event_etag(_make_event(n=3))
+        assert event_etags.known_etag("evt-0002") is None
+        assert event_etags.known_etag("evt-0001") is not None
+        assert event_etags.known_etag("evt-0003") is not None
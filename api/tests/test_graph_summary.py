@@ -0,0 +1,93 @@
+"""Tests for the graph summary in Ask AI prompts and the prompt-cache markers."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from config import settings
+from services import graph_summary, graphdb, llm
+
+HILO = "http://hilo.semantics.io/ontology/"
+
+VALID_SPARQL = f"SELECT ?order WHERE {{ ?order a <{HILO}PurchaseOrder> }} LIMIT 50"
+
+
+@pytest.fixture(autouse=True)
+def empty_summary():
+    with patch.object(graph_summary, "_text", ""):
+        yield
+
+
+def _stub_client() -> MagicMock:
+    client = MagicMock()
+    client.messages.create.return_value = SimpleNamespace(
+        content=[SimpleNamespace(text=VALID_SPARQL)],
+        usage=SimpleNamespace(input_tokens=12, cache_read_input_tokens=1500, cache_creation_input_tokens=0),
+    )
+    return client
+
+
+# ── Summary ───────────────────────────────────────────────────────────────────
+
+def test_term_counts_are_read_from_sparql_results():
+    results = {"results": {"bindings": [
+        {"term": {"type": "uri", "value": f"{HILO}Event"}, "count": {"type": "literal", "value": "1234"}},
+        {"term": {"type": "uri", "value": f"{HILO}PurchaseOrder"}, "count": {"type": "literal", "value": "87"}},
+    ]}}
+    with patch("services.graphdb.query_data", return_value=results) as query:
+        assert graphdb.top_classes(5) == [(f"{HILO}Event", 1234), (f"{HILO}PurchaseOrder", 87)]
+    sparql = query.call_args.args[0]
+    assert "GROUP BY ?term" in sparql
+    assert "LIMIT 5" in sparql
+
+
+def test_refresh_renders_top_classes_and_predicates():
+    with (
+        patch("services.graphdb.top_classes", return_value=[(f"{HILO}PurchaseOrder", 1234)]),
+        patch("services.graphdb.top_predicates", return_value=[(f"{HILO}orderNumber", 87)]),
+    ):
+        graph_summary.refresh()
+    summary = graph_summary.text()
+    assert f"- <{HILO}PurchaseOrder> (~1200)" in summary
+    assert f"- <{HILO}orderNumber> (87)" in summary
+
+
+def test_small_count_changes_leave_the_summary_unchanged():
+    first = graph_summary.render([(f"{HILO}Event", 1234)], [])
+    assert graph_summary.render([(f"{HILO}Event", 1241)], []) == first
+    assert graph_summary.render([(f"{HILO}Event", 1391)], []) != first
+    assert graph_summary.render([], []) == ""
+
+
+def test_refresh_thread_not_started_without_api_key():
+    with patch.object(settings, "anthropic_api_key", ""), patch.object(graph_summary, "_thread", None):
+        graph_summary.start()
+        assert graph_summary._thread is None
+
+
+# ── Prompt ────────────────────────────────────────────────────────────────────
+
+def test_static_prompt_is_marked_for_prompt_caching():
+    client = _stub_client()
+    with patch("services.llm._get_client", return_value=client):
+        assert llm.translate_to_sparql("show me all orders") == VALID_SPARQL
+
+    kwargs = client.messages.create.call_args.kwargs
+    assert kwargs["system"] == [
+        {"type": "text", "text": llm._SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}},
+    ]
+    assert kwargs["messages"] == [{"role": "user", "content": "show me all orders"}]
+
+
+def test_graph_summary_follows_the_static_prompt():
+    client = _stub_client()
+    with (
+        patch("services.llm._get_client", return_value=client),
+        patch.object(graph_summary, "_text", graph_summary.render([(f"{HILO}PurchaseOrder", 40)], [])),
+    ):
+        llm.translate_to_sparql("show me all orders")
+
+    system = client.messages.create.call_args.kwargs["system"]
+    assert system[0]["text"] == llm._SYSTEM_PROMPT
+    assert f"<{HILO}PurchaseOrder> (40)" in system[1]["text"]
+    assert all(block["cache_control"] == {"type": "ephemeral"} for block in system)
@@ -0,0 +1,107 @@
+"""Tests for /health, /health/live and /health/ready."""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from services import health_probes
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def fresh_probe_state():
+    with patch.object(health_probes, "_state", {}):
+        yield
+
+
+def _healthy():
+    return (
+        patch("services.graphdb.check_health", return_value="ok"),
+        patch("services.queue.check_health", return_value="ok"),
+    )
+
+
+def test_health_reports_each_dependency():
+    g, q = _healthy()
+    with g, q:
+        body = client.get("/health").json()
+    assert body["graphdb"] == "ok"
+    assert body["queue"] == "ok"
+    assert body["status"] == "healthy"
+    assert body["checks"]["graphdb"]["consecutive_failures"] == 0
+    assert body["checks"]["graphdb"]["latency_ms"] >= 0
+
+
+def test_health_degraded_when_a_dependency_fails():
+    with (
+        patch("services.graphdb.check_health", side_effect=RuntimeError("Triple store unreachable")),
+        patch("services.queue.check_health", return_value="ok"),
+    ):
+        response = client.get("/health")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "degraded"
+    assert body["graphdb"] == "error: Triple store unreachable"
+    assert body["checks"]["graphdb"]["last_success"] is None
+
+
+def test_health_is_served_from_cache():
+    """Once probed, requests do not touch the dependencies again."""
+    g, q = _healthy()
+    with g as mock_graphdb, q:
+        client.get("/health")
+        client.get("/health")
+        client.get("/health/ready")
+    assert mock_graphdb.call_count == 1
+
+
+def test_consecutive_failures_accumulate_and_reset():
+    with patch("services.graphdb.check_health", side_effect=RuntimeError("down")), patch("services.queue.check_health"):
+        health_probes.probe_all()
+        health_probes.probe_all()
+    assert health_probes.snapshot()["graphdb"]["consecutive_failures"] == 2
+    g, q = _healthy()
+    with g, q:
+        health_probes.probe_all()
+    assert health_probes.snapshot()["graphdb"]["consecutive_failures"] == 0
+
+
+def test_live_never_probes_dependencies():
+    with patch("services.graphdb.check_health") as mock_graphdb, patch("services.queue.check_health") as mock_queue:
+        response = client.get("/health/live")
+    assert response.status_code == 200
+    mock_graphdb.assert_not_called()
+    mock_queue.assert_not_called()
+
+
+def test_ready_when_all_dependencies_ok():
+    g, q = _healthy()
+    with g, q:
+        response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+
+def test_not_ready_when_a_dependency_fails():
+    with (
+        patch("services.graphdb.check_health", return_value="ok"),
+        patch("services.queue.check_health", side_effect=RuntimeError("RabbitMQ unreachable")),
+    ):
+        response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["checks"]["queue"]["status"] == "error: RabbitMQ unreachable"
+
+
+def test_not_ready_when_probes_are_stale():
+    """A stuck prober must not keep reporting the last good result as ready."""
+    g, q = _healthy()
+    with g, q:
+        health_probes.probe_all()
+    old = (datetime.now(timezone.utc) - timedelta(hours=1)).isoformat()
+    for dep in health_probes._state.values():
+        dep["last_checked"] = old
+    response = client.get("/health/ready")
+    assert response.status_code == 503
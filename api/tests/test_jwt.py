@@ -0,0 +1,236 @@
+"""Tests for sign_token / require_jwt and their caches."""
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from config import settings
+from services import jwt_service
+
+_KEY = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+_PEM = _KEY.public_key().public_bytes(
+    serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+).decode()
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    with (
+        patch.object(jwt_service, "_public_keys", {}),
+        patch.object(jwt_service, "_verified", {}),
+        patch.object(jwt_service, "_signing_keys", {}),
+        patch.object(jwt_service, "_issued", {}),
+    ):
+        yield
+
+
+_ED_KEY = ed25519.Ed25519PrivateKey.generate()
+_ED_PEM = _ED_KEY.public_key().public_bytes(
+    serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+).decode()
+
+
+@pytest.fixture
+def key_file(tmp_path):
+    """This node's RSA and Ed25519 keys; no peer key stored (so RS256)."""
+    path = tmp_path / "node.pem"
+    _write_key(path, _KEY)
+    _write_key(tmp_path / "node.pem.ed25519", _ED_KEY)
+    with (
+        patch.object(settings, "private_key_path", str(path)),
+        patch("services.connections.get_peer_public_key", return_value=None),
+    ):
+        yield path
+
+
+def _write_key(path, key) -> None:
+    path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+    ))
+
+
+def _peer_token(iss: str = "node-b", minutes: int = 5) -> str:
+    now = datetime.now(timezone.utc)
+    return jwt.encode(
+        {"iss": iss, "aud": settings.node_id, "iat": now, "exp": now + timedelta(minutes=minutes)},
+        _KEY,
+        algorithm="RS256",
+    )
+
+
+def _require(token: str) -> dict:
+    return jwt_service.require_jwt(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+
+def test_peer_token_verified_against_stored_key():
+    with patch("services.connections.get_peer_public_key", return_value=_PEM):
+        payload = _require(_peer_token())
+    assert payload["iss"] == "node-b"
+
+
+def test_repeated_token_skips_sqlite_and_crypto():
+    token = _peer_token()
+    with (
+        patch("services.connections.get_peer_public_key", return_value=_PEM) as mock_lookup,
+        patch("services.jwt_service.verify_token", wraps=jwt_service.verify_token) as mock_verify,
+    ):
+        for _ in range(3):
+            _require(token)
+    assert mock_lookup.call_count == 1
+    assert mock_verify.call_count == 1
+
+
+def test_parsed_key_reused_for_new_tokens():
+    with patch("services.connections.get_peer_public_key", return_value=_PEM) as mock_lookup:
+        _require(_peer_token())
+        _require(_peer_token(minutes=6))
+    assert mock_lookup.call_count == 1
+
+
+def test_cache_entry_past_exp_is_dropped_and_reverified():
+    token = _peer_token()
+    with patch("services.connections.get_peer_public_key", return_value=_PEM):
+        _require(token)
+    digest = jwt_service._digest(token)
+    jwt_service._verified[digest]["exp"] = 0
+    with (
+        patch("services.connections.get_peer_public_key", return_value=_PEM),
+        patch("services.jwt_service.verify_token", side_effect=jwt.ExpiredSignatureError) as mock_verify,
+    ):
+        with pytest.raises(HTTPException) as exc:
+            _require(token)
+    assert mock_verify.call_count == 1
+    assert exc.value.status_code == 401
+    assert digest not in jwt_service._verified
+
+
+def test_connection_change_invalidates_peer(tmp_path):
+    """Deleting the connection must stop a cached token from authenticating."""
+    from services import connections
+
+    token = _peer_token()
+    with patch("services.connections.get_peer_public_key", return_value=_PEM):
+        _require(token)
+    with (
+        patch.object(settings, "db_path", str(tmp_path / "hilo.db")),
+        patch("services.live.publish"),
+        patch("services.connections._delete_delivery_queue"),
+    ):
+        connections.init_db()
+        connections.create_incoming_request("node-b", "Node B", "http://node-b:8000", _PEM)
+        connections.delete_connection("node-b")
+        with pytest.raises(HTTPException) as exc:
+            _require(token)
+    assert exc.value.status_code == 401
+    assert "node-b" not in jwt_service._public_keys
+
+
+def test_bad_signature_is_not_cached():
+    other = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    now = datetime.now(timezone.utc)
+    forged = jwt.encode(
+        {"iss": "node-b", "aud": settings.node_id, "exp": now + timedelta(minutes=5)}, other, algorithm="RS256"
+    )
+    with patch("services.connections.get_peer_public_key", return_value=_PEM):
+        with pytest.raises(HTTPException):
+            _require(forged)
+    assert jwt_service._verified == {}
+
+
+def test_cache_size_is_bounded():
+    with (
+        patch.object(settings, "jwt_verified_cache_size", 2),
+        patch("services.connections.get_peer_public_key", return_value=_PEM),
+    ):
+        for minutes in (5, 6, 7):
+            _require(_peer_token(minutes=minutes))
+    assert len(jwt_service._verified) == 2
+
+
+# ── sign_token ────────────────────────────────────────────────────────────────
+
+def test_sign_token_reuses_unexpired_token(key_file):
+    first = jwt_service.sign_token("node-b")
+    assert jwt_service.sign_token("node-b") == first
+    assert jwt_service.sign_token("node-c") != first
+
+
+def test_sign_token_fresh_signs_new_token(key_file):
+    with patch("services.jwt_service.jwt.encode", wraps=jwt.encode) as mock_encode:
+        jwt_service.sign_token("node-b")
+        jwt_service.sign_token("node-b", fresh=True)
+    assert mock_encode.call_count == 2
+
+
+def test_sign_token_refreshes_inside_margin(key_file):
+    token, _ = jwt_service.sign_token("node-b")
+    jwt_service._issued["node-b"] = (token, datetime.now(timezone.utc) + timedelta(seconds=10))
+    assert jwt_service.sign_token("node-b")[1] - datetime.now(timezone.utc) > timedelta(minutes=1)
+
+
+def test_private_key_parsed_once(key_file):
+    with patch(
+        "cryptography.hazmat.primitives.serialization.load_pem_private_key",
+        wraps=serialization.load_pem_private_key,
+    ) as mock_load:
+        jwt_service.sign_token("node-b")
+        jwt_service.sign_token("node-c")
+    assert mock_load.call_count == 1
+
+
+def test_changed_key_file_is_reloaded(key_file):
+    jwt_service.sign_token("node-b")
+    new_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    _write_key(key_file, new_key)
+    stat = os.stat(key_file)
+    os.utime(key_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    token, _ = jwt_service.sign_token("node-b")
+    jwt.decode(token, new_key.public_key(), algorithms=["RS256"], audience="node-b")
+
+
+# ── EdDSA ─────────────────────────────────────────────────────────────────────
+
+def test_eddsa_peer_token_verified():
+    now = datetime.now(timezone.utc)
+    token = jwt.encode(
+        {"iss": "node-b", "aud": settings.node_id, "exp": now + timedelta(minutes=5)}, _ED_KEY, algorithm="EdDSA"
+    )
+    with patch("services.connections.get_peer_public_key", return_value=_ED_PEM):
+        assert _require(token)["iss"] == "node-b"
+
+
+def test_token_in_other_algorithm_than_stored_key_is_rejected():
+    """A peer stored with an Ed25519 key cannot authenticate with an RS256 token."""
+    with patch("services.connections.get_peer_public_key", return_value=_ED_PEM):
+        with pytest.raises(HTTPException) as exc:
+            _require(_peer_token())
+    assert exc.value.status_code == 401
+
+
+def test_sign_token_uses_connection_algorithm(key_file):
+    with patch("services.connections.get_peer_public_key", return_value=_ED_PEM):
+        token, _ = jwt_service.sign_token("node-b")
+    assert jwt.get_unverified_header(token)["alg"] == "EdDSA"
+    jwt.decode(token, _ED_KEY.public_key(), algorithms=["EdDSA"], audience="node-b")
+
+
+def test_select_peer_key_prefers_eddsa():
+    assert jwt_service.select_peer_key(["RS256", "EdDSA"], {"EdDSA": _ED_PEM, "RS256": _PEM}, _PEM) == ("EdDSA", _ED_PEM)
+
+
+def test_select_peer_key_falls_back_to_legacy_rsa_key():
+    """Version 2 peers send only public_key and no algorithms."""
+    assert jwt_service.select_peer_key(["RS256"], {}, _PEM) == ("RS256", _PEM)
+
+
+def test_select_peer_key_respects_local_algorithms():
+    with patch.object(settings, "jwt_algorithms", ["RS256"]):
+        assert jwt_service.select_peer_key(["EdDSA", "RS256"], {"EdDSA": _ED_PEM}, _PEM) == ("RS256", _PEM)
+    with patch.object(settings, "jwt_algorithms", ["EdDSA"]):
+        assert jwt_service.select_peer_key(["RS256"], {}, _PEM) is None
@@ -0,0 +1,143 @@
+"""Tests for the GET /live Server-Sent Events hub."""
+import asyncio
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from main import app
+from services import live
+
+client = TestClient(app)
+
+
+def _frames(raw: list[str]) -> list[tuple[str, dict]]:
+    """(topic, data) for every event frame, skipping retry/comment lines."""
+    out = []
+    for frame in raw:
+        lines = dict(
+            line.split(": ", 1) for line in frame.strip().splitlines() if ": " in line and not line.startswith(":")
+        )
+        if "event" in lines:
+            out.append((lines["event"], json.loads(lines["data"])))
+    return out
+
+
+async def _collect(publish_after_hello, count: int) -> list[str]:
+    """Open a stream, run publish_after_hello once it is registered, return `count` frames."""
+
+    async def never_disconnected():
+        return False
+
+    frames = []
+    gen = live.stream(never_disconnected)
+    frames.append(await gen.__anext__())  # hello — the subscriber is registered now
+    await asyncio.to_thread(publish_after_hello)
+    while len(frames) < count:
+        frames.append(await asyncio.wait_for(gen.__anext__(), timeout=2))
+    await gen.aclose()
+    return frames
+
+
+def test_stream_starts_with_hello():
+    frames = asyncio.run(_collect(lambda: None, 1))
+    assert _frames(frames)[0][0] == "hello"
+
+
+def test_published_message_reaches_open_stream():
+    """A publish from a worker thread (as sync routes do) arrives on the stream."""
+    frames = asyncio.run(_collect(lambda: live.publish("event", {"id": "evt-0001"}), 2))
+    assert _frames(frames)[1] == ("event", {"id": "evt-0001"})
+
+
+def test_stream_unregisters_on_close():
+    asyncio.run(_collect(lambda: None, 1))
+    assert live.subscriber_count() == 0
+
+
+def test_subscriber_that_falls_behind_is_closed():
+    """Overflowing the backlog ends the stream so the browser reconnects and reloads."""
+    from config import settings
+
+    async def run():
+        async def never_disconnected():
+            return False
+
+        gen = live.stream(never_disconnected)
+        await gen.__anext__()
+        for n in range(5):
+            live.publish("event", {"id": n})
+        await asyncio.sleep(0.05)
+        remaining = [frame async for frame in gen]
+        return remaining
+
+    with patch.object(settings, "live_max_backlog", 2):
+        remaining = asyncio.run(run())
+    assert remaining == []
+    assert live.subscriber_count() == 0
+
+
+def test_only_changed_queue_stats_are_published():
+    """The sampler hands every snapshot to the hub; unchanged ones are not re-sent."""
+    snapshot = {"messages_ready": 1, "sampled_at": "2026-03-01T12:00:00+00:00"}
+    with patch.object(live, "_last_queue_stats", None), patch("services.live.publish") as mock_publish:
+        live._on_queue_stats(snapshot)
+        live._on_queue_stats({**snapshot, "sampled_at": "2026-03-01T12:00:05+00:00"})
+        live._on_queue_stats({**snapshot, "messages_ready": 2})
+    assert mock_publish.call_count == 2
+
+
+def test_publish_without_subscribers_is_a_no_op():
+    live.publish("event", {"id": "evt-0001"})
+
+
+def test_live_requires_auth():
+    response = client.get("/live")
+    assert response.status_code == 401
+
+
+def test_live_rejects_peer_jwt():
+    with patch("routes.live.require_jwt", return_value={"sub": "node-b", "iss": "node-b"}):
+        response = client.get("/live?access_token=peer-token")
+    assert response.status_code == 403
+
+
+def test_bridge_receive_publishes_event():
+    with (
+        patch("services.graphdb.store_notification"),
+        patch("services.notification_dedup.is_duplicate", return_value=False),
+        patch("services.notification_dedup.mark_stored"),
+        patch("services.prefetch.schedule"),
+        patch("services.live.publish") as mock_publish,
+    ):
+        client.post("/bridge/receive", json={
+            "event_id": "evt-0042",
+            "event_type": "order_created",
+            "source_node": "node-b",
+            "subject": "http://hilo.semantics.io/events/order-0042",
+            "created_at": datetime(2026, 3, 1, 12, 0, 0).isoformat(),
+            "data_url": "http://node-b:8000/events/evt-0042",
+            "receiver": "all",
+        })
+    topic, data = mock_publish.call_args.args
+    assert topic == "event"
+    assert data["id"] == "evt-0042"
+    assert data["has_local_copy"] is False
+
+
+def test_connection_state_change_is_published(tmp_path):
+    from config import settings
+    from services import connections
+
+    with (
+        patch.object(settings, "db_path", str(tmp_path / "hilo.db")),
+        patch("services.live.publish") as mock_publish,
+    ):
+        connections.init_db()
+        connections.create_incoming_request("node-b", "Node B", "http://node-b:8000", "key")
+        connections.delete_connection("node-b")
+    assert [c.args for c in mock_publish.call_args_list] == [
+        ("connection", {"peer_node_id": "node-b", "status": "pending_incoming"}),
+        ("connection", {"peer_node_id": "node-b", "status": "deleted"}),
+    ]
@@ -0,0 +1,81 @@
+"""Tests for the API's request and dependency metrics and GET /metrics."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+import metrics
+from main import app
+from services import graphdb
+
+client = TestClient(app)
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_request_is_recorded_under_route_template():
+    labels = {"method": "GET", "route": "/health/live", "status": "200"}
+    before = _sample("hilo_api_request_seconds_count", **labels)
+    assert client.get("/health/live").status_code == 200
+    assert _sample("hilo_api_request_seconds_count", **labels) == before + 1
+
+
+def test_path_parameters_are_not_labels():
+    labels = {"method": "GET", "route": "/connections/tasks/{task_id}", "status": "404"}
+    before = _sample("hilo_api_request_seconds_count", **labels)
+    with patch("services.peer_tasks.get_task", return_value=None):
+        client.get("/connections/tasks/41")
+        client.get("/connections/tasks/42")
+    assert _sample("hilo_api_request_seconds_count", **labels) == before + 2
+
+
+def test_unmatched_paths_share_one_label():
+    labels = {"method": "GET", "route": metrics.UNMATCHED_ROUTE, "status": "404"}
+    before = _sample("hilo_api_request_seconds_count", **labels)
+    client.get("/no/such/path")
+    assert _sample("hilo_api_request_seconds_count", **labels) == before + 1
+
+
+def test_dependency_calls_are_timed_and_errors_counted():
+    labels = {"dependency": "triple_store", "operation": "query"}
+    count = _sample("hilo_api_dependency_seconds_count", **labels)
+    errors = _sample("hilo_api_dependency_errors_total", **labels)
+    with patch("httpx.get", return_value=MagicMock(json=lambda: {"results": {"bindings": []}})):
+        graphdb.query_data("SELECT * WHERE { ?s ?p ?o }")
+    with patch("httpx.get", side_effect=httpx.ConnectError("refused")):
+        with pytest.raises(httpx.ConnectError):
+            graphdb.query_data("SELECT * WHERE { ?s ?p ?o }")
+    assert _sample("hilo_api_dependency_seconds_count", **labels) == count + 2
+    assert _sample("hilo_api_dependency_errors_total", **labels) == errors + 1
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    client.get("/health/live")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert 'hilo_api_request_seconds_bucket{le="0.005",method="GET",route="/health/live",status="200"}' in resp.text
+
+
+def test_multiprocess_scrape_sums_every_worker(tmp_path, monkeypatch):
+    """With PROMETHEUS_MULTIPROC_DIR set, a scrape reports what all worker processes observed."""
+    worker = (
+        "import metrics\n"
+        "with metrics.timed('amqp', 'publish'):\n"
+        "    pass\n"
+    )
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], env=env, cwd=Path(metrics.__file__).parent, check=True)
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    body, _ = metrics.render()
+    assert b'hilo_api_dependency_seconds_count{dependency="amqp",operation="publish"} 2.0' in body
@@ -0,0 +1,250 @@
+"""Tests for multi-worker serving: key generation lock, cross-process invalidation, /live relay."""
+import asyncio
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from config import settings
+from models.events import EventResponse
+from services import (
+    event_etags,
+    graph_summary,
+    health_probes,
+    invalidation,
+    jwt_service,
+    leader,
+    live,
+    notification_dedup,
+    peer_tasks,
+    queue_sampler,
+    sqlite_pool,
+)
+
+API_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(autouse=True)
+def two_workers(tmp_path):
+    with (
+        patch.object(settings, "db_path", str(tmp_path / "hilo.db")),
+        patch.object(settings, "workers", 2),
+    ):
+        invalidation._seen.clear()
+        yield
+    invalidation._seen.clear()
+
+
+def _stamp_from_other_worker(topic: str) -> None:
+    """Leaves the same trace as notify() in another process: the stamp file replaced."""
+    invalidation.notify(topic)
+
+
+# ── Invalidation ──────────────────────────────────────────────────────────────
+
+def test_stale_reports_each_notification_once():
+    assert invalidation.stale("peer_keys") is True  # first look: nothing is known yet
+    assert invalidation.stale("peer_keys") is False
+    _stamp_from_other_worker("peer_keys")
+    assert invalidation.stale("peer_keys") is True
+    assert invalidation.stale("peer_keys") is False
+    _stamp_from_other_worker("peer_keys")
+    _stamp_from_other_worker("peer_keys")
+    assert invalidation.stale("peer_keys") is True
+
+
+def test_single_worker_never_touches_the_filesystem(tmp_path):
+    with patch.object(settings, "workers", 1):
+        invalidation.notify("events")
+        assert invalidation.stale("events") is False
+    assert not (tmp_path / "invalidation").exists()
+
+
+def test_jwt_caches_dropped_after_another_worker_changes_a_connection():
+    jwt_service._sync_with_other_workers()
+    jwt_service._public_keys["node-b"] = object()
+    jwt_service._verified["digest"] = {"iss": "node-b", "exp": 2**40}
+    jwt_service._issued["node-b"] = ("token", None)
+    try:
+        _stamp_from_other_worker("peer_keys")
+        jwt_service._sync_with_other_workers()
+        assert jwt_service._public_keys == {}
+        assert jwt_service._verified == {}
+        assert jwt_service._issued == {}
+    finally:
+        jwt_service._public_keys.clear()
+        jwt_service._verified.clear()
+        jwt_service._issued.clear()
+
+
+def test_event_etags_forgotten_after_another_worker_imports():
+    event = EventResponse(
+        id="evt-1", source_node="node-b", event_type="order_created",
+        subject="http://hilo.semantics.io/events/order-0001", triples="",
+    )
+    event_etags.known_etag("evt-1")  # take the first look
+    etag = event_etags.event_etag(event)
+    list_etag = event_etags.list_etag(limit=50)
+    assert event_etags.known_etag("evt-1") == etag
+
+    _stamp_from_other_worker("events")
+    assert event_etags.known_etag("evt-1") is None
+    assert event_etags.list_etag(limit=50) != list_etag
+
+
+def test_dedup_bloom_miss_checks_sqlite_with_several_workers():
+    """An id stored by another worker is in neither in-memory layer, only in SQLite."""
+    dedup = notification_dedup.DuplicateFilter(bloom_bits=1024)
+    dedup.check("evt-warm")  # creates the table
+    with notification_dedup._conn() as db:
+        db.execute(
+            "INSERT INTO received_notifications (event_id, source_node, received_at) VALUES ('evt-1', 'node-b', '')"
+        )
+        db.commit()
+    assert dedup.check("evt-1") is True
+    with patch.object(settings, "workers", 1):
+        assert dedup.check("evt-2") is False
+
+
+# ── Peer tasks ────────────────────────────────────────────────────────────────
+
+def test_due_task_is_claimed_once():
+    peer_tasks.enqueue("disconnect_notice", "node-b", "http://node-b:8000/x")
+    now = datetime.now(timezone.utc)
+    assert peer_tasks._claim_next(now) is not None
+    assert peer_tasks._claim_next(now) is None
+
+
+# ── /live relay ───────────────────────────────────────────────────────────────
+
+def test_relay_delivers_other_workers_messages_only():
+    received = []
+
+    class _Sub:
+        loop = asyncio.new_event_loop()
+
+        def offer(self, message):
+            received.append(message)
+
+    sub = _Sub()
+    with live._lock:
+        live._subscribers.add(sub)
+    try:
+        with live._relay_conn() as db:
+            db.execute(
+                "INSERT INTO live_relay (origin, message, created_at) VALUES (?, ?, 0), (?, ?, 0)",
+                (os.getpid() + 1, "from another worker", os.getpid(), "from this worker"),
+            )
+            db.commit()
+        last_id = live.relay_once(0)
+        sub.loop.run_until_complete(asyncio.sleep(0))
+    finally:
+        with live._lock:
+            live._subscribers.discard(sub)
+        sub.loop.close()
+        sqlite_pool.close()
+    assert received == ["from another worker"]
+    assert last_id == 2
+
+
+def test_publish_writes_every_topic_to_relay():
+    """Queue stats are relayed too: only the leader samples them."""
+    live.publish("connection", {"peer_node_id": "node-b", "status": "active"})
+    live.publish("queue_stats", {"node_queue": {}})
+    with live._relay_conn() as db:
+        rows = db.execute("SELECT message FROM live_relay ORDER BY id").fetchall()
+    assert [r["message"].split("\n")[0] for r in rows] == ["event: connection", "event: queue_stats"]
+
+
+# ── Pollers leader ────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def no_leader():
+    leader.stop()
+    yield
+    leader.stop()
+
+
+def test_one_worker_runs_the_pollers(no_leader):
+    assert leader._try_acquire() is True
+    assert leader.is_leader()
+    held = leader._lock_file
+    leader._lock_file = None  # now look at the lock as a second worker process would
+    try:
+        assert leader._try_acquire() is False
+        assert not leader.is_leader()
+    finally:
+        held.close()
+    assert leader._try_acquire() is True  # the leader exited: the next attempt takes over
+
+
+def test_followers_read_the_leaders_results(no_leader):
+    leader_probes = {"graphdb": lambda: "ok", "queue": lambda: "ok"}
+    try:
+        with (
+            patch("services.leader.is_leader", return_value=True),
+            patch("services.queue_sampler.read_now", return_value={"messages_ready": 3}),
+            patch("services.graphdb.top_classes", return_value=[("http://x/C", 5)]),
+            patch("services.graphdb.top_predicates", return_value=[]),
+            patch.dict(health_probes.PROBES, leader_probes),
+        ):
+            queue_sampler.sample()
+            graph_summary.refresh()
+            health_probes.probe_all()
+
+        assert not leader.is_leader()
+        assert queue_sampler.latest()["messages_ready"] == 3
+        assert queue_sampler.history()[-1]["messages_ready"] == 3
+        assert "<http://x/C> (5)" in graph_summary.text()
+        probe = MagicMock()
+        with patch.dict(health_probes.PROBES, {"graphdb": probe, "queue": probe}):
+            checks = health_probes.snapshot()
+        probe.assert_not_called()
+        assert checks["graphdb"]["status"] == "ok"
+    finally:
+        queue_sampler._latest = None
+        queue_sampler._history.clear()
+        graph_summary._text = ""
+        health_probes._state.clear()
+
+
+# ── Key generation ────────────────────────────────────────────────────────────
+
+def test_concurrent_workers_generate_one_key_pair(tmp_path):
+    """Workers booting at once all end up with the same keys."""
+    key_path = tmp_path / "keys" / "node.key"
+    probe = (
+        "import hashlib, startup; startup.ensure_key_pair(); "
+        f"print(hashlib.sha256(open({str(key_path)!r}, 'rb').read()).hexdigest())"
+    )
+    env = {**os.environ, "HILO_SENTRY_DSN": "", "HILO_PRIVATE_KEY_PATH": str(key_path)}
+    procs = [
+        subprocess.Popen([sys.executable, "-c", probe], cwd=API_DIR, env=env, stdout=subprocess.PIPE, text=True)
+        for _ in range(4)
+    ]
+    digests = {p.communicate()[0].strip() for p in procs}
+    assert all(p.returncode == 0 for p in procs)
+    assert len(digests) == 1
+    assert not list(key_path.parent.glob("*.tmp"))
+
+
+def test_private_key_is_never_readable_by_others(tmp_path):
+    """The temp file is created owner-only, and a leftover from a crashed boot is replaced."""
+    import startup
+
+    key_path = tmp_path / "node.key"
+    leftover = tmp_path / f"node.key.{os.getpid()}.tmp"
+    leftover.write_bytes(b"partial")
+    leftover.chmod(0o644)
+    with patch("os.open", wraps=os.open) as mock_open:
+        startup._write_atomically(str(key_path), b"secret", mode=0o600)
+    path, flags, mode = mock_open.call_args.args
+    assert path == str(leftover)
+    assert flags & os.O_EXCL and mode == 0o600
+    assert key_path.read_bytes() == b"secret"
+    assert key_path.stat().st_mode & 0o777 == 0o600
+    assert not leftover.exists()
@@ -0,0 +1,117 @@
+"""Tests for per-peer RTT tracking and the timeouts derived from it."""
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models.connections import ConnectionResponse, ConnectionStatus
+from services import peer_rtt
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def clean_links():
+    peer_rtt._links.clear()
+    yield
+    peer_rtt._links.clear()
+
+
+def _conn() -> ConnectionResponse:
+    now = datetime.now(timezone.utc)
+    return ConnectionResponse(
+        id="conn-0001",
+        peer_node_id="node-b",
+        peer_name="Node B",
+        peer_base_url="http://node-b:8000",
+        peer_public_key="-----BEGIN PUBLIC KEY-----",
+        status=ConnectionStatus.active,
+        initiated_by="us",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_default_timeout_before_any_sample():
+    assert peer_rtt.timeout_for("node-b") == 10.0
+    assert peer_rtt.snapshot("node-b")["srtt_ms"] is None
+
+
+def test_timeout_follows_smoothed_rtt():
+    peer_rtt.record("node-b", 1.0, "fetch")  # srtt 1 s, rttvar 0.5 s → rto 3 s
+    assert peer_rtt.timeout_for("node-b") == pytest.approx(9.0)
+    peer_rtt.record("node-b", 1.0, "fetch")  # rttvar 0.375 s → rto 2.5 s
+    assert peer_rtt.timeout_for("node-b") == pytest.approx(7.5)
+    assert peer_rtt.retry_delay("node-b", 3) == pytest.approx(10.0)
+
+
+def test_timeout_is_clamped():
+    peer_rtt.record("node-b", 0.005, "probe")
+    assert peer_rtt.timeout_for("node-b") == 2.0
+    peer_rtt.record("node-c", 20.0, "probe")
+    assert peer_rtt.timeout_for("node-c") == 30.0
+
+
+def test_timeouts_back_off_without_touching_srtt():
+    """Karn: a timed-out call has no usable RTT; it doubles the timeout until a response arrives."""
+    peer_rtt.record("node-b", 1.0, "fetch")
+    for _ in range(2):
+        with pytest.raises(httpx.ReadTimeout):
+            with peer_rtt.call("node-b", "fetch"):
+                raise httpx.ReadTimeout("timed out")
+    snap = peer_rtt.snapshot("node-b")
+    assert snap["backoff"] == 4
+    assert snap["srtt_ms"] == 1000.0
+    assert snap["timeout_seconds"] == 30.0  # 9 s × 4, clamped
+    assert snap["error_rate"] == pytest.approx(0.667, abs=0.001)
+
+    with peer_rtt.call("node-b", "fetch"):
+        pass
+    assert peer_rtt.snapshot("node-b")["backoff"] == 1
+
+
+def test_call_yields_timeout_and_records_history():
+    with peer_rtt.call("node-b", "handshake") as timeout:
+        assert timeout == 10.0
+    with pytest.raises(httpx.ConnectError):
+        with peer_rtt.call("node-b", "fetch"):
+            raise httpx.ConnectError("refused")
+    history = peer_rtt.snapshot("node-b")["history"]
+    assert [(h["source"], h["ok"]) for h in history] == [("handshake", True), ("fetch", False)]
+    assert history[1]["error"] == "refused"
+    assert peer_rtt.snapshot("node-b")["backoff"] == 1  # only timeouts back off
+
+
+def test_probe_idle_peers_skips_recently_used():
+    peer_rtt.record("node-b", 0.1, "fetch")
+    idle = MagicMock(peer_node_id="node-c", peer_base_url="http://node-c:8000")
+    busy = MagicMock(peer_node_id="node-b", peer_base_url="http://node-b:8000")
+    with (
+        patch("services.connections.get_active_peers", return_value=[busy, idle]),
+        patch("httpx.get", return_value=MagicMock(status_code=200)) as mock_get,
+    ):
+        peer_rtt.probe_idle_peers()
+    assert [c.args[0] for c in mock_get.call_args_list] == ["http://node-c:8000/.well-known/hilo-node"]
+    assert peer_rtt.snapshot("node-c")["history"][0]["source"] == "probe"
+
+
+def test_rtt_endpoint_combines_api_and_consumer_views():
+    peer_rtt.record("node-b", 0.2, "fetch")
+    consumer = [{"peer_base_url": "http://node-b:8000", "srtt_ms": 180.0}]
+    with (
+        patch("services.connections.get_connection_by_peer", return_value=_conn()),
+        patch("services.consumer_status.get_peer_rtt", return_value=consumer),
+    ):
+        resp = client.get("/connections/node-b/rtt")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["api"]["srtt_ms"] == 200.0
+    assert body["consumer"] == consumer[0]
+
+
+def test_rtt_endpoint_unknown_peer_returns_404():
+    with patch("services.connections.get_connection_by_peer", return_value=None):
+        assert client.get("/connections/node-x/rtt").status_code == 404
@@ -0,0 +1,195 @@
+"""Tests for the persisted background tasks behind acceptance callbacks and disconnect notices."""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import settings
+from main import app
+from services import peer_tasks
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def tasks_db(tmp_path):
+    with patch.object(settings, "db_path", str(tmp_path / "hilo.db")):
+        yield
+
+
+def _ok():
+    return MagicMock(is_success=True, status_code=200)
+
+
+def _make_due(task_id: int) -> None:
+    past = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+    with peer_tasks._conn() as db:
+        db.execute("UPDATE peer_tasks SET next_run_at = ? WHERE id = ?", (past, task_id))
+        db.commit()
+
+
+def test_enqueue_records_pending_task():
+    task = peer_tasks.enqueue("disconnect_notice", "node-b", "http://node-b:8000/connections/node-a/disconnected")
+    assert task.status == "pending"
+    assert task.attempts == 0
+    assert peer_tasks.get_task(task.id) == task
+
+
+def test_due_task_is_posted_and_done():
+    task = peer_tasks.enqueue("acceptance_callback", "node-b", "http://node-b:8000/connections/accepted", {"a": 1})
+    with patch("httpx.post", return_value=_ok()) as mock_post:
+        assert peer_tasks.run_due() == 1
+    assert mock_post.call_args.args == ("http://node-b:8000/connections/accepted",)
+    assert mock_post.call_args.kwargs["json"] == {"a": 1}
+    assert peer_tasks.get_task(task.id).status == "done"
+
+
+def test_failed_attempt_is_retried_with_backoff():
+    task = peer_tasks.enqueue("disconnect_notice", "node-b", "http://node-b:8000/x")
+    with patch("httpx.post", side_effect=Exception("unreachable")):
+        peer_tasks.run_due()
+        assert peer_tasks.run_due() == 0  # not due again until the backoff has passed
+    retried = peer_tasks.get_task(task.id)
+    assert retried.status == "pending"
+    assert retried.attempts == 1
+    assert retried.last_error == "unreachable"
+    assert retried.next_run_at > datetime.now(timezone.utc)
+
+
+def test_non_success_status_counts_as_failure():
+    task = peer_tasks.enqueue("disconnect_notice", "node-b", "http://node-b:8000/x")
+    with patch("httpx.post", return_value=MagicMock(is_success=False, status_code=503)):
+        peer_tasks.run_due()
+    assert peer_tasks.get_task(task.id).last_error == "HTTP 503"
+
+
+def test_task_fails_after_max_attempts_and_runs_hook():
+    hook = MagicMock()
+    task = peer_tasks.enqueue("test_kind", "node-b", "http://node-b:8000/x")
+    with (
+        patch.dict(peer_tasks._failure_hooks, {"test_kind": hook}),
+        patch.object(settings, "peer_task_max_attempts", 2),
+        patch("httpx.post", side_effect=Exception("unreachable")),
+    ):
+        peer_tasks.run_due()
+        hook.assert_not_called()
+        _make_due(task.id)
+        peer_tasks.run_due()
+    assert peer_tasks.get_task(task.id).status == "failed"
+    hook.assert_called_once_with("node-b")
+
+
+def test_interrupted_task_is_recovered():
+    task = peer_tasks.enqueue("disconnect_notice", "node-b", "http://node-b:8000/x")
+    peer_tasks._claim_next(datetime.now(timezone.utc))  # claimed, then the process "dies"
+    assert peer_tasks.get_task(task.id).status == "running"
+    peer_tasks._recover()
+    assert peer_tasks.get_task(task.id).status == "pending"
+
+
+def test_tasks_are_claimed_one_at_a_time():
+    """A task waiting behind a slow one is still pending, so another worker cannot reset it."""
+    first = peer_tasks.enqueue("disconnect_notice", "node-b", "http://node-b:8000/x")
+    second = peer_tasks.enqueue("disconnect_notice", "node-c", "http://node-c:8000/x")
+    seen = []
+
+    def post(url, **kwargs):
+        seen.append({t.id: t.status for t in peer_tasks.list_tasks()})
+        return _ok()
+
+    with patch("httpx.post", side_effect=post):
+        assert peer_tasks.run_due() == 2
+    assert seen == [{first.id: "running", second.id: "pending"}, {first.id: "done", second.id: "running"}]
+
+
+def test_accept_returns_without_calling_peer():
+    """Accepting queues the callback instead of POSTing inline."""
+    from services import connections
+
+    connections.init_db()
+    pending = connections.create_incoming_request("node-b", "Node B", "http://node-b:8000", "PEM")
+    with patch("services.queue.declare_peer_queue"), patch("httpx.post") as mock_post:
+        accepted = connections.accept_connection(pending.id)
+    mock_post.assert_not_called()
+    assert accepted.status.value == "active"
+    [task] = peer_tasks.list_tasks(peer_node_id="node-b")
+    assert task.kind == "acceptance_callback"
+
+
+def test_failed_acceptance_marks_connection_accept_pending():
+    from services import connections
+
+    connections.init_db()
+    pending = connections.create_incoming_request("node-b", "Node B", "http://node-b:8000", "PEM")
+    with patch("services.queue.declare_peer_queue"):
+        connections.accept_connection(pending.id)
+    with (
+        patch.object(settings, "peer_task_max_attempts", 1),
+        patch("httpx.post", side_effect=Exception("unreachable")),
+    ):
+        peer_tasks.run_due()
+    assert connections.get_connection_by_peer("node-b").status.value == "accept_pending"
+
+
+def test_deleting_connection_cancels_acceptance_callback():
+    """A callback retried after our disconnect notice would re-activate the peer's side."""
+    from services import connections
+
+    connections.init_db()
+    pending = connections.create_incoming_request("node-b", "Node B", "http://node-b:8000", "PEM")
+    with patch("services.queue.declare_peer_queue"), patch("services.queue.delete_peer_queue"):
+        connections.accept_connection(pending.id)
+        connections.notify_disconnect(connections.get_connection_by_peer("node-b"))
+        connections.delete_connection("node-b")
+    tasks = {t.kind: t.status for t in peer_tasks.list_tasks(peer_node_id="node-b")}
+    assert tasks == {"acceptance_callback": "cancelled", "disconnect_notice": "pending"}
+
+
+def test_cancelled_while_running_is_not_retried():
+    task = peer_tasks.enqueue("acceptance_callback", "node-b", "http://node-b:8000/connections/accepted")
+
+    def post(url, **kwargs):
+        peer_tasks.cancel("acceptance_callback", "node-b")
+        raise Exception("unreachable")
+
+    with patch("httpx.post", side_effect=post):
+        peer_tasks.run_due()
+    assert peer_tasks.get_task(task.id).status == "cancelled"
+
+
+def test_repeated_resend_queues_one_callback():
+    from services import connections
+
+    connections.init_db()
+    pending = connections.create_incoming_request("node-b", "Node B", "http://node-b:8000", "PEM")
+    with patch("services.queue.declare_peer_queue"):
+        connections.accept_connection(pending.id)
+    with (
+        patch.object(settings, "peer_task_max_attempts", 1),
+        patch("httpx.post", side_effect=Exception("unreachable")),
+    ):
+        peer_tasks.run_due()  # → accept_pending
+    for _ in range(3):
+        client.post(f"/connections/{pending.id}/resend")
+        connections._acceptance_failed("node-b")  # back to accept_pending, callback still queued
+    outstanding = peer_tasks.list_tasks(status="pending", peer_node_id="node-b")
+    assert len(outstanding) == 1
+
+
+def test_list_tasks_endpoint_filters_by_status():
+    done = peer_tasks.enqueue("disconnect_notice", "node-b", "http://node-b:8000/x")
+    with patch("httpx.post", return_value=_ok()):
+        peer_tasks.run_due()
+    peer_tasks.enqueue("disconnect_notice", "node-c", "http://node-c:8000/x")
+
+    response = client.get("/connections/tasks?status=done")
+    assert response.status_code == 200
+    assert [t["id"] for t in response.json()] == [done.id]
+    assert len(client.get("/connections/tasks").json()) == 2
+
+
+def test_get_task_endpoint():
+    task = peer_tasks.enqueue("disconnect_notice", "node-b", "http://node-b:8000/x")
+    assert client.get(f"/connections/tasks/{task.id}").json()["kind"] == "disconnect_notice"
+    assert client.get("/connections/tasks/9999").status_code == 404
@@ -0,0 +1,256 @@
+"""Tests for prefetch rules, background payload prefetch, and GET /events/{id}/payload."""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models.connections import ConnectionResponse, ConnectionStatus
+from models.events import EventNotification, EventResponse
+from services import payload_cache, prefetch
+from services.jwt_service import require_jwt
+
+client = TestClient(app)
+
+AUTH = {"Authorization": "Bearer dev"}
+
+
+def _active_connection(peer_node_id: str):
+    """node-b is an active peer at http://node-b:8000; no other peer is connected."""
+    if peer_node_id != "node-b":
+        return None
+    now = datetime.now(timezone.utc)
+    return ConnectionResponse(
+        id="conn-0001",
+        peer_node_id="node-b",
+        peer_name="Node B",
+        peer_base_url="http://node-b:8000",
+        peer_public_key="-----BEGIN PUBLIC KEY-----",
+        status=ConnectionStatus.active,
+        initiated_by="us",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.fixture(autouse=True)
+def isolated_prefetch(tmp_path):
+    """Throwaway rules table and cache directory; a fresh executor and counters per test."""
+    from config import settings
+
+    with (
+        patch("services.connections.get_connection_by_peer", side_effect=_active_connection),
+        patch.object(settings, "db_path", str(tmp_path / "hilo.db")),
+        patch.object(settings, "payload_cache_dir", str(tmp_path / "cache")),
+        patch.object(prefetch, "_executor", None),
+        patch.object(prefetch, "_pending", None),
+        patch.object(prefetch, "_in_flight", set()),
+        patch.object(prefetch, "_stats", dict.fromkeys(prefetch._stats, 0)),
+        patch.object(payload_cache, "_total_bytes", None),
+    ):
+        yield
+        if prefetch._executor is not None:
+            prefetch._executor.shutdown(wait=True)
+
+
+def _notification(
+    event_id: str = "evt-0001",
+    event_type: str = "order_created",
+    source_node: str = "node-b",
+    data_url: str = "",
+):
+    return EventNotification(
+        event_id=event_id,
+        event_type=event_type,
+        source_node=source_node,
+        subject="http://hilo.semantics.io/events/order-0001",
+        created_at=datetime(2026, 3, 1, 12, 0, 0),
+        data_url=data_url or f"http://node-b:8000/events/{event_id}",
+        receiver="all",
+    )
+
+
+def _drain():
+    prefetch._executor.shutdown(wait=True)
+    prefetch._executor = None
+
+
+# ── Rules ─────────────────────────────────────────────────────────────────────
+
+def test_add_list_and_delete_rule():
+    created = client.post("/prefetch/rules", json={"event_type": "order_created"}, headers=AUTH)
+    assert created.status_code == 201
+    rule_id = created.json()["id"]
+
+    rules = client.get("/prefetch/rules", headers=AUTH).json()
+    assert [(r["id"], r["event_type"], r["source_node"]) for r in rules] == [(rule_id, "order_created", None)]
+
+    assert client.delete(f"/prefetch/rules/{rule_id}", headers=AUTH).status_code == 204
+    assert client.get("/prefetch/rules", headers=AUTH).json() == []
+
+
+def test_rule_without_fields_returns_422():
+    response = client.post("/prefetch/rules", json={}, headers=AUTH)
+    assert response.status_code == 422
+
+
+def test_delete_unknown_rule_returns_404():
+    assert client.delete("/prefetch/rules/999", headers=AUTH).status_code == 404
+
+
+def test_rules_reject_peer_jwt_returns_403():
+    app.dependency_overrides[require_jwt] = lambda: {"sub": "node-b", "iss": "node-b"}
+    try:
+        response = client.get("/prefetch/rules")
+    finally:
+        app.dependency_overrides.pop(require_jwt, None)
+    assert response.status_code == 403
+
+
+# ── Background prefetch ───────────────────────────────────────────────────────
+
+def test_matching_notification_is_prefetched_into_cache():
+    """A received notification matching a rule ends up in the payload cache, not the graph."""
+    client.post("/prefetch/rules", json={"source_node": "node-b"}, headers=AUTH)
+    payload = {"id": "evt-0001", "triples": "<a> <b> <c> ."}
+
+    with patch("services.peer_fetch.fetch_event_payload", return_value=payload) as mock_fetch:
+        assert prefetch.schedule(_notification()) is True
+        _drain()
+
+    mock_fetch.assert_called_once_with("node-b", "http://node-b:8000/events/evt-0001")
+    assert payload_cache.get("node-b", "evt-0001") == payload
+    assert prefetch.get_stats()["fetched"] == 1
+
+
+def test_non_matching_notification_is_not_prefetched():
+    client.post("/prefetch/rules", json={"event_type": "shipment_update", "source_node": "node-b"}, headers=AUTH)
+    with patch("services.peer_fetch.fetch_event_payload") as mock_fetch:
+        assert prefetch.schedule(_notification(event_type="order_created")) is False
+    mock_fetch.assert_not_called()
+
+
+def test_already_cached_payload_is_not_fetched_again():
+    client.post("/prefetch/rules", json={"source_node": "node-b"}, headers=AUTH)
+    payload_cache.put("node-b", "evt-0001", {"id": "evt-0001"})
+    with patch("services.peer_fetch.fetch_event_payload") as mock_fetch:
+        assert prefetch.schedule(_notification()) is False
+    mock_fetch.assert_not_called()
+    assert prefetch.get_stats()["skipped_cached"] == 1
+
+
+def test_full_backlog_skips_instead_of_blocking():
+    """With prefetch_max_pending=1, a second notification is skipped while the first is queued."""
+    from config import settings
+
+    client.post("/prefetch/rules", json={"source_node": "node-b"}, headers=AUTH)
+    with (
+        patch.object(settings, "prefetch_max_pending", 1),
+        patch("services.peer_fetch.fetch_event_payload", return_value={}),
+        patch.object(prefetch, "_prefetch"),  # never releases its slot
+    ):
+        assert prefetch.schedule(_notification("evt-0001")) is True
+        assert prefetch.schedule(_notification("evt-0002")) is False
+    assert prefetch.get_stats()["skipped_full"] == 1
+
+
+def test_fetch_failure_is_counted_and_not_cached():
+    client.post("/prefetch/rules", json={"source_node": "node-b"}, headers=AUTH)
+    with patch("services.peer_fetch.fetch_event_payload", side_effect=Exception("peer offline")):
+        prefetch.schedule(_notification())
+        _drain()
+    assert payload_cache.get("node-b", "evt-0001") is None
+    assert prefetch.get_stats()["failed"] == 1
+
+
+def test_foreign_data_url_is_not_fetched():
+    """A notification naming node-b but pointing elsewhere would leak a token signed for node-b."""
+    client.post("/prefetch/rules", json={"source_node": "node-b"}, headers=AUTH)
+    with patch("services.peer_fetch.sign_token") as mock_sign:
+        for url in ("http://attacker:8000/events/evt-0001", "http://node-b:8000.attacker/events/evt-0001"):
+            assert prefetch.schedule(_notification(data_url=url)) is False
+    mock_sign.assert_not_called()
+    assert prefetch.get_stats()["skipped_untrusted"] == 2
+
+
+def test_unknown_source_is_not_fetched():
+    client.post("/prefetch/rules", json={"event_type": "order_created"}, headers=AUTH)
+    with patch("services.peer_fetch.sign_token") as mock_sign:
+        assert prefetch.schedule(_notification(source_node="node-x")) is False
+    mock_sign.assert_not_called()
+    assert prefetch.get_stats()["skipped_untrusted"] == 1
+
+
+def test_bridge_receive_schedules_prefetch():
+    with (
+        patch("services.graphdb.store_notification"),
+        patch("services.prefetch.schedule") as mock_schedule,
+    ):
+        client.post("/bridge/receive", json=_notification().model_dump(mode="json"))
+    mock_schedule.assert_called_once()
+
+
+def test_drop_source_clears_cached_payloads():
+    payload_cache.put("node-b", "evt-0001", {"id": "evt-0001"})
+    payload_cache.put("node-c", "evt-0002", {"id": "evt-0002"})
+    payload_cache.drop_source("node-b")
+    assert payload_cache.get("node-b", "evt-0001") is None
+    assert payload_cache.get("node-c", "evt-0002") == {"id": "evt-0002"}
+
+
+def test_cache_evicts_oldest_when_over_budget():
+    from config import settings
+
+    with patch.object(settings, "payload_cache_max_mb", 1):
+        blob = "x" * 400_000
+        for n in range(4):
+            payload_cache.put("node-b", f"evt-{n}", {"triples": blob})
+    assert payload_cache.stats()["bytes"] <= 1024 * 1024
+    assert payload_cache.get("node-b", "evt-3") is not None
+
+
+def test_concurrent_writes_of_one_event_use_separate_temp_files():
+    """Two prefetches of the same event never share a temp file; one complete payload wins."""
+    payloads = [{"id": "evt-0001", "triples": str(n) * 100_000} for n in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda p: payload_cache.put("node-b", "evt-0001", p), payloads))
+    assert payload_cache.get("node-b", "evt-0001") in payloads
+    assert payload_cache.stats()["entries"] == 1
+    assert not list(payload_cache._root().glob("*/*.tmp"))
+
+
+def test_stats_skip_files_deleted_meanwhile():
+    payload_cache.put("node-b", "evt-0001", {"id": "evt-0001"})
+    gone = payload_cache._root() / "node-b" / "vanished.json"
+    with patch("services.payload_cache._files", return_value=[*payload_cache._files(), gone]):
+        assert payload_cache.stats()["entries"] == 1
+
+
+# ── GET /events/{id}/payload ──────────────────────────────────────────────────
+
+def _peer_event() -> EventResponse:
+    return EventResponse(
+        id="evt-0001",
+        source_node="node-b",
+        event_type="order_created",
+        subject="http://hilo.semantics.io/events/order-0001",
+        triples="",
+        links={"self": "/events/evt-0001", "data": "http://node-b:8000/events/evt-0001"},
+    )
+
+
+def test_cached_payload_hit_returns_payload():
+    payload_cache.put("node-b", "evt-0001", {"id": "evt-0001", "triples": "<a> <b> <c> ."})
+    with patch("services.graphdb.get_event_by_id", return_value=_peer_event()):
+        response = client.get("/events/evt-0001/payload", headers=AUTH)
+    assert response.status_code == 200
+    assert response.json()["triples"] == "<a> <b> <c> ."
+
+
+def test_cached_payload_miss_returns_404():
+    with patch("services.graphdb.get_event_by_id", return_value=_peer_event()):
+        response = client.get("/events/evt-0001/payload", headers=AUTH)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Payload not cached"
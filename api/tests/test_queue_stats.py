@@ -1,9 +1,13 @@
-"""Tests for GET /queue/stats."""
-from unittest.mock import patch
+"""Tests for GET /queue/stats and dead-letter replay."""
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
 
 from fastapi.testclient import TestClient
 
 from main import app
+from models.queue import ReplayReport, ReplayRequest
+from services import dead_letters
 
 client = TestClient(app)
 
@@ -27,7 +31,10 @@ MOCK_STATS = {
 
 def test_queue_stats_success():
     """Returns live stats when management API is reachable."""
-    with patch("services.rabbitmq_management.get_queue_stats", return_value=MOCK_STATS):
+    with (
+        patch("services.rabbitmq_management.get_queue_stats", return_value=MOCK_STATS),
+        patch("services.consumer_status.get_circuit_breakers", return_value=[]),
+    ):
         response = client.get("/queue/stats")
     assert response.status_code == 200
     data = response.json()
@@ -52,18 +59,259 @@ def test_queue_stats_management_unavailable():
         "throughput_per_minute": None,
         "consumer_details": [],
     }
-    with patch("services.rabbitmq_management.get_queue_stats", return_value=null_stats):
+    with (
+        patch("services.rabbitmq_management.get_queue_stats", return_value=null_stats),
+        patch("services.consumer_status.get_circuit_breakers", return_value=None),
+    ):
         response = client.get("/queue/stats")
     assert response.status_code == 200
     data = response.json()
     assert data["messages_ready"] is None
     assert data["consumer_details"] == []
+    assert data["circuit_breakers"] is None
 
 
 def test_queue_stats_with_dead_letters():
     """Dead-letter count is surfaced correctly."""
     stats = {**MOCK_STATS, "dead_letters": 5}
-    with patch("services.rabbitmq_management.get_queue_stats", return_value=stats):
+    with (
+        patch("services.rabbitmq_management.get_queue_stats", return_value=stats),
+        patch("services.consumer_status.get_circuit_breakers", return_value=[]),
+    ):
         response = client.get("/queue/stats")
     assert response.status_code == 200
     assert response.json()["dead_letters"] == 5
+
+
+def test_queue_stats_includes_circuit_breakers():
+    """Per-peer breaker states from the consumer are surfaced alongside queue stats."""
+    breakers = [{
+        "peer_base_url": "http://node-b:8000",
+        "state": "open",
+        "consecutive_failures": 3,
+        "opened_at": "2026-03-11T10:00:00+00:00",
+        "next_probe_in_seconds": 12.5,
+    }]
+    with (
+        patch("services.rabbitmq_management.get_queue_stats", return_value=MOCK_STATS),
+        patch("services.consumer_status.get_circuit_breakers", return_value=breakers),
+    ):
+        response = client.get("/queue/stats")
+    assert response.status_code == 200
+    assert response.json()["circuit_breakers"][0]["state"] == "open"
+
+
+# ── Background sampler and history ───────────────────────────────────────────
+
+def _fresh_sampler():
+    from collections import deque
+
+    from services import queue_sampler
+
+    return (
+        patch.object(queue_sampler, "_latest", None),
+        patch.object(queue_sampler, "_history", deque(maxlen=3)),
+        patch.object(queue_sampler, "_listeners", []),
+    )
+
+
+def test_queue_stats_served_from_latest_sample():
+    """Once the sampler has a snapshot, /queue/stats makes no management API calls."""
+    from services import queue_sampler
+
+    latest, history, listeners = _fresh_sampler()
+    with latest, history, listeners:
+        with (
+            patch("services.rabbitmq_management.get_queue_stats", return_value=MOCK_STATS),
+            patch("services.consumer_status.get_circuit_breakers", return_value=[]),
+        ):
+            queue_sampler.sample()
+        with patch("services.rabbitmq_management.get_queue_stats") as mock_stats:
+            response = client.get("/queue/stats")
+    assert response.status_code == 200
+    assert response.json()["messages_ready"] == 3
+    assert "sampled_at" in response.json()
+    mock_stats.assert_not_called()
+
+
+def test_queue_stats_history_is_a_bounded_ring_buffer():
+    from services import queue_sampler
+
+    latest, history, listeners = _fresh_sampler()
+    with latest, history, listeners:
+        for ready in range(5):
+            with (
+                patch("services.rabbitmq_management.get_queue_stats", return_value={**MOCK_STATS, "messages_ready": ready}),
+                patch("services.consumer_status.get_circuit_breakers", return_value=[]),
+            ):
+                queue_sampler.sample()
+        body = client.get("/queue/stats/history").json()
+        last_two = client.get("/queue/stats/history?limit=2").json()["samples"]
+    assert [p["messages_ready"] for p in body["samples"]] == [2, 3, 4]
+    assert [p["messages_ready"] for p in last_two] == [3, 4]
+    assert body["interval_seconds"] > 0
+
+
+def test_sampler_notifies_listeners():
+    from services import queue_sampler
+
+    latest, history, listeners = _fresh_sampler()
+    seen = []
+    with latest, history, listeners:
+        queue_sampler.add_listener(seen.append)
+        with (
+            patch("services.rabbitmq_management.get_queue_stats", return_value=MOCK_STATS),
+            patch("services.consumer_status.get_circuit_breakers", return_value=None),
+        ):
+            queue_sampler.sample()
+    assert seen[0]["consumers"] == 2
+
+
+def test_management_stats_cover_every_hilo_queue():
+    """Totals span the dispatch queue and every per-peer delivery queue; other queues are ignored."""
+    from config import settings
+    from services import rabbitmq_management
+
+    listing = [
+        {"name": f"hilo.events.{settings.node_id}", "messages_ready": 1, "messages_unacknowledged": 0,
+         "consumers": 1, "message_stats": {"publish_details": {"rate": 0.5}}},
+        {"name": f"hilo.events.{settings.node_id}.peer.node-b", "messages_ready": 7, "messages_unacknowledged": 2,
+         "consumers": 1},
+        {"name": "hilo.events.dead", "messages_ready": 4, "messages_unacknowledged": 0, "consumers": 0},
+        {"name": "other.app.queue", "messages_ready": 100, "messages_unacknowledged": 0, "consumers": 3},
+    ]
+
+    def fake_get(path):
+        if path.startswith("queues/"):
+            return listing
+        return []
+
+    with patch.object(rabbitmq_management, "_get", side_effect=fake_get):
+        stats = rabbitmq_management.get_queue_stats()
+    assert stats["messages_ready"] == 8
+    assert stats["messages_unacked"] == 2
+    assert stats["consumers"] == 2
+    assert stats["dead_letters"] == 4
+    assert stats["throughput_per_minute"] == 30.0
+    assert [q["name"] for q in stats["queues"]] == [
+        "hilo.events.dead",
+        f"hilo.events.{settings.node_id}",
+        f"hilo.events.{settings.node_id}.peer.node-b",
+    ]
+
+
+def test_management_stats_unreachable_are_null():
+    from services import rabbitmq_management
+
+    with patch.object(rabbitmq_management, "_get", return_value=None):
+        stats = rabbitmq_management.get_queue_stats()
+    assert stats["messages_ready"] is None
+    assert stats["dead_letters"] is None
+    assert stats["queues"] == []
+
+
+# ── POST /queue/dead-letters/replay ───────────────────────────────────────────
+
+AUTH = {"Authorization": "Bearer dev"}
+
+
+def _dead_letter(tag: int, event_type: str, receiver: str, routing_key: str = "events.node-a"):
+    method = MagicMock(delivery_tag=tag, routing_key=routing_key)
+    properties = MagicMock(headers={"x-death": [{"time": datetime.now(timezone.utc) - timedelta(minutes=10)}]})
+    body = json.dumps({"event_id": f"evt-{tag}", "event_type": event_type, "receiver": receiver}).encode()
+    return method, properties, body
+
+
+def _fake_broker(messages):
+    """Connection + channel stand-ins serving `messages` from basic_get, then an empty queue."""
+    channel = MagicMock()
+    channel.queue_declare.return_value.method.message_count = len(messages)
+    channel.basic_get.side_effect = list(messages) + [(None, None, None)]
+    conn = MagicMock(is_open=True)
+    conn.channel.return_value = channel
+    return conn, channel
+
+
+def test_replay_republishes_matching_and_requeues_the_rest():
+    """Only messages matching the filters are republished; the others go back to the DLQ."""
+    conn, channel = _fake_broker([
+        _dead_letter(1, "order_created", "all"),
+        _dead_letter(2, "shipment_update", "all"),
+        _dead_letter(3, "shipment_update", "all", routing_key="events.node-a.peer.node-b"),
+    ])
+    with patch("services.queue._get_connection", return_value=conn):
+        report = dead_letters.replay(ReplayRequest(receiver="node-b", rate_per_second=1000))
+
+    assert report.status == "completed"
+    assert (report.scanned, report.matched, report.replayed) == (3, 1, 1)
+    channel.basic_publish.assert_called_once()
+    assert channel.basic_publish.call_args.kwargs["routing_key"] == "events.node-a.peer.node-b"
+    channel.basic_ack.assert_called_once_with(delivery_tag=3)
+    assert sorted(c.kwargs["delivery_tag"] for c in channel.basic_nack.call_args_list) == [1, 2]
+
+
+def test_replay_dry_run_changes_nothing():
+    """A dry run reports matches but publishes and acks nothing."""
+    conn, channel = _fake_broker([_dead_letter(1, "order_created", "all"), _dead_letter(2, "order_created", "all")])
+    with patch("services.queue._get_connection", return_value=conn):
+        report = dead_letters.replay(ReplayRequest(event_type="order_created", dry_run=True))
+
+    assert report.matched == 2
+    assert report.matched_event_ids == ["evt-1", "evt-2"]
+    channel.basic_publish.assert_not_called()
+    channel.basic_ack.assert_not_called()
+
+
+def test_replay_age_filter():
+    """min_age_seconds excludes messages dead-lettered more recently than the threshold."""
+    conn, channel = _fake_broker([_dead_letter(1, "order_created", "all")])
+    with patch("services.queue._get_connection", return_value=conn):
+        report = dead_letters.replay(ReplayRequest(min_age_seconds=3600, dry_run=True))
+    assert report.matched == 0
+
+
+def test_replay_endpoint_dry_run_returns_report():
+    """POST with dry_run returns the final report synchronously."""
+    report = ReplayReport(job_id="job-1", status="completed", dry_run=True, matched=4, started_at=datetime.now(timezone.utc))
+    with patch("services.dead_letters.replay", return_value=report):
+        response = client.post("/queue/dead-letters/replay", json={"dry_run": True}, headers=AUTH)
+    assert response.status_code == 200
+    assert response.json()["matched"] == 4
+
+
+def test_replay_endpoint_starts_background_job():
+    """POST without dry_run starts a background job and returns 202 with its id."""
+    report = ReplayReport(job_id="job-2", dry_run=False, started_at=datetime.now(timezone.utc))
+    with patch("services.dead_letters.start_replay", return_value=report):
+        response = client.post("/queue/dead-letters/replay", json={"rate_per_second": 5}, headers=AUTH)
+    assert response.status_code == 202
+    assert response.json()["job_id"] == "job-2"
+
+
+def test_replay_endpoint_requires_auth():
+    """Replay is an operator action and requires the internal key."""
+    response = client.post("/queue/dead-letters/replay", json={"dry_run": True})
+    assert response.status_code == 401
+
+
+def test_replay_progress_unknown_job_returns_404():
+    response = client.get("/queue/dead-letters/replay/nope", headers=AUTH)
+    assert response.status_code == 404
+
+
+def test_replay_progress_is_read_from_sqlite():
+    """Job progress is saved to SQLite, so a worker other than the one replaying can report it."""
+    conn, _ = _fake_broker([_dead_letter(1, "order_created", "all"), _dead_letter(2, "order_created", "all")])
+    with (
+        patch("services.queue._get_connection", return_value=conn),
+        patch("services.dead_letters.threading.Thread") as mock_thread,
+    ):
+        started = dead_letters.start_replay(ReplayRequest(rate_per_second=1000))
+        assert client.get(f"/queue/dead-letters/replay/{started.job_id}", headers=AUTH).json()["status"] == "running"
+        target, args = mock_thread.call_args.kwargs["target"], mock_thread.call_args.kwargs["args"]
+        target(*args)
+
+    response = client.get(f"/queue/dead-letters/replay/{started.job_id}", headers=AUTH)
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert response.json()["replayed"] == 2
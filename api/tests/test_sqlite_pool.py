@@ -0,0 +1,72 @@
+"""Tests for the per-thread SQLite connection pool."""
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from config import settings
+from services import sqlite_pool
+
+
+@pytest.fixture(autouse=True)
+def db_path(tmp_path):
+    with patch.object(settings, "db_path", str(tmp_path / "hilo.db")):
+        yield tmp_path / "hilo.db"
+    sqlite_pool.close()
+
+
+def test_connection_is_reused_within_a_thread():
+    with sqlite_pool.connect() as first:
+        pass
+    with sqlite_pool.connect() as second:
+        pass
+    assert first is second
+
+
+def test_threads_get_their_own_connection():
+    with sqlite_pool.connect() as mine:
+        pass
+    theirs = []
+
+    def worker():
+        with sqlite_pool.connect() as db:
+            theirs.append(db)
+        sqlite_pool.close()
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert theirs[0] is not mine
+
+
+def test_wal_and_busy_timeout_are_set():
+    with sqlite_pool.connect() as db:
+        assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert db.execute("PRAGMA busy_timeout").fetchone()[0] == settings.sqlite_busy_timeout_ms
+
+
+def test_schema_runs_once_per_connection():
+    schema = "CREATE TABLE t (x INTEGER);"  # not idempotent — a second run would fail
+    with sqlite_pool.connect(schema):
+        pass
+    with sqlite_pool.connect(schema) as db:
+        assert db.execute("SELECT count(*) FROM t").fetchone()[0] == 0
+
+
+def test_uncommitted_write_is_rolled_back_at_outermost_exit():
+    with sqlite_pool.connect("CREATE TABLE IF NOT EXISTS t (x INTEGER);") as db:
+        db.execute("INSERT INTO t VALUES (1)")
+        with sqlite_pool.connect() as nested:
+            assert nested is db
+        assert db.in_transaction  # the nested exit did not roll back
+    with sqlite_pool.connect() as db:
+        assert db.execute("SELECT count(*) FROM t").fetchone()[0] == 0
+
+
+def test_changed_db_path_reopens(tmp_path):
+    with sqlite_pool.connect() as first:
+        pass
+    with patch.object(settings, "db_path", str(tmp_path / "other.db")):
+        with sqlite_pool.connect() as second:
+            pass
+    assert second is not first
@@ -0,0 +1,20 @@
+"""Heavy dependencies stay out of the API's import path; they load on first use."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parent.parent
+
+
+def test_importing_main_does_not_load_heavy_dependencies():
+    probe = "import sys, main; print(','.join(m for m in ('anthropic', 'pika') if m in sys.modules))"
+    out = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=API_DIR,
+        env={**os.environ, "HILO_SENTRY_DSN": ""},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip() == ""
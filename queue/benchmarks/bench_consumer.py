@@ -0,0 +1,116 @@
+"""Throughput benchmark for the subject-partitioned delivery pool.
+
+Runs on_peer_batch against an in-memory broker stand-in (no RabbitMQ needed) with
+a simulated peer round trip, for several worker/prefetch/batch settings. A batch
+costs one round trip, like a POST to /bridge/receive/batch.
+
+Usage (from queue/):
+    python -m benchmarks.bench_consumer [--messages 400] [--latency-ms 10]
+"""
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import consumer
+
+
+class _StandInBroker:
+    """Single-queue broker stand-in: honours prefetch, counts acks, runs callbacks on one thread."""
+
+    def __init__(self, bodies: list[bytes], prefetch: int):
+        self._ready = deque(bodies)
+        self._prefetch = prefetch
+        self._in_flight = 0
+        self._callbacks: deque = deque()
+        self._cond = threading.Condition()
+        self._next_tag = 1
+        self.acked = 0
+        self.nacked = 0
+
+    # connection API used by SubjectPartitionedPool
+    def add_callback_threadsafe(self, callback) -> None:
+        with self._cond:
+            self._callbacks.append(callback)
+            self._cond.notify()
+
+    # channel API used by the handler (via _ThreadsafeChannel)
+    def basic_ack(self, delivery_tag) -> None:
+        self.acked += 1
+        self._in_flight -= 1
+
+    def basic_nack(self, delivery_tag, requeue=False) -> None:
+        self.nacked += 1
+        self._in_flight -= 1
+
+    def run(self, on_message) -> None:
+        """Deliver until every message is settled — the start_consuming stand-in."""
+        properties = SimpleNamespace(headers={consumer.PEER_URL_HEADER: "http://peer:8000"})
+        while self._ready or self._in_flight:
+            while self._ready and self._in_flight < self._prefetch:
+                self._in_flight += 1
+                method = SimpleNamespace(delivery_tag=self._next_tag)
+                self._next_tag += 1
+                on_message(self, method, properties, self._ready.popleft())
+            with self._cond:
+                while not self._callbacks:
+                    self._cond.wait()
+                pending, self._callbacks = self._callbacks, deque()
+            for callback in pending:
+                callback()
+
+
+def _bodies(n: int, subjects: int) -> list[bytes]:
+    return [
+        json.dumps({"event_id": f"evt-{i}", "subject": f"urn:subject:{i % subjects}", "receiver": "all"}).encode()
+        for i in range(n)
+    ]
+
+
+def run(messages: int, latency_ms: float, workers: int, prefetch: int, batch_size: int = 1) -> float:
+    """Return delivered messages per second for one configuration."""
+    def fake_forward(peer_url, notification):
+        time.sleep(latency_ms / 1000)
+        return True
+
+    def fake_forward_batch(peer_url, notifications):
+        time.sleep(latency_ms / 1000)
+        return [True] * len(notifications)
+
+    broker = _StandInBroker(_bodies(messages, subjects=64), prefetch=max(prefetch, workers))
+    pool = consumer.SubjectPartitionedPool(
+        broker, broker, consumer.on_peer_batch, workers, batch_size=batch_size, batch_window=latency_ms / 1000,
+    )
+    with (
+        patch("consumer._forward_to_peer", side_effect=fake_forward),
+        patch("consumer._forward_batch_to_peer", side_effect=fake_forward_batch),
+    ):
+        pool.start()
+        start = time.perf_counter()
+        broker.run(pool.on_message)
+        elapsed = time.perf_counter() - start
+        pool.stop()
+    assert broker.acked == messages, (broker.acked, broker.nacked)
+    return messages / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"{args.messages} messages, {args.latency_ms:g} ms simulated peer round trip")
+    print(f"{'workers':>8} {'prefetch':>9} {'batch':>6} {'msg/s':>10}")
+    for workers, prefetch, batch_size in [
+        (1, 1, 1), (2, 4, 1), (4, 8, 1), (8, 16, 1), (16, 32, 1), (4, 64, 20), (8, 128, 20),
+    ]:
+        rate = run(args.messages, args.latency_ms, workers, prefetch, batch_size)
+        print(f"{workers:>8} {prefetch:>9} {batch_size:>6} {rate:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
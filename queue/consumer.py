@@ -1,12 +1,19 @@
+import functools
 import json
 import logging
 import sys
+import threading
 import time
+import zlib
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from queue import Empty, Queue
 
 import httpx
 import pika
-import sentry_sdk
 
+import metrics
 from config import settings
 
 logging.basicConfig(
@@ -17,11 +24,12 @@ logger = logging.getLogger("hilo.consumer")
 
 _testing = "pytest" in sys.modules
 
-sentry_sdk.init(
-    dsn="" if _testing else "https://7c8ba4f75ecc2bb6f89a4060a2447b96@o4511019058331648.ingest.de.sentry.io/4511019060822096",
-    enable_logs=True,
-)
-sentry_sdk.set_tag("node_id", settings.node_id)
+# Same switch as the API: off under pytest or with HILO_SENTRY_DSN=""
+if settings.sentry_dsn and not _testing:
+    import sentry_sdk
+
+    sentry_sdk.init(dsn=settings.sentry_dsn, enable_logs=True)
+    sentry_sdk.set_tag("node_id", settings.node_id)
 
 EXCHANGE_NAME = "hilo.events"
 DLX_EXCHANGE = "hilo.events.dlx"
@@ -29,6 +37,12 @@ DLX_QUEUE = "hilo.events.dead"
 NODE_QUEUE = f"hilo.events.{settings.node_id}"
 MAX_RETRIES = 5
 FORWARD_RETRIES = 3
+PEER_URL_HEADER = "x-hilo-peer-url"
+POOL_STOP_TIMEOUT = 10.0  # seconds SubjectPartitionedPool.stop() waits for each worker thread
+
+# peer_node_id → running delivery thread. Guarded by _peer_workers_lock.
+_peer_workers: dict[str, threading.Thread] = {}
+_peer_workers_lock = threading.Lock()
 
 
 def get_connection(max_attempts: int = 10, delay: float = 3.0) -> pika.BlockingConnection:
@@ -63,13 +77,39 @@ def ensure_infrastructure(channel: pika.adapters.blocking_connection.BlockingCha
     )
 
 
+def peer_queue_name(peer_node_id: str) -> str:
+    """Durable delivery queue for one peer — must match services/queue.py in the API."""
+    return f"hilo.events.{settings.node_id}.peer.{peer_node_id}"
+
+
+def peer_routing_key(peer_node_id: str) -> str:
+    return f"events.{settings.node_id}.peer.{peer_node_id}"
+
+
+def ensure_peer_queue(channel: pika.adapters.blocking_connection.BlockingChannel, peer_node_id: str) -> None:
+    """Declare and bind the delivery queue for one peer. Idempotent.
+
+    The API declares the queue when a connection becomes active and deletes it on
+    disconnect; declaring here as well means a missed API-side declare never drops
+    a notification on the floor.
+    """
+    queue = peer_queue_name(peer_node_id)
+    channel.queue_declare(
+        queue=queue,
+        durable=True,
+        arguments={"x-dead-letter-exchange": DLX_EXCHANGE},
+    )
+    channel.queue_bind(queue=queue, exchange=EXCHANGE_NAME, routing_key=peer_routing_key(peer_node_id))
+
+
 def _get_active_peers() -> list[dict]:
     """Fetch active connected peers from the API. Returns list of peer dicts."""
     try:
-        resp = httpx.get(
-            f"{settings.api_url}/connections",
-            timeout=5,
-        )
+        with metrics.PEER_LIST_FETCH.time():
+            resp = httpx.get(
+                f"{settings.api_url}/connections",
+                timeout=5,
+            )
         resp.raise_for_status()
         connections = resp.json()
         return [c for c in connections if c.get("status") == "active"]
@@ -78,38 +118,372 @@ def _get_active_peers() -> list[dict]:
         return []
 
 
+# ── Circuit breakers ──────────────────────────────────────────────────────────
+
+class CircuitBreaker:
+    """Per-peer circuit breaker: closed → open after repeated failures → half-open probe.
+
+    While open, forwards fail immediately instead of waiting out HTTP timeouts. Once
+    reset_timeout has passed, the next caller runs a cheap probe (GET
+    /.well-known/hilo-node); success closes the breaker, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, peer_base_url: str, failure_threshold: int, reset_timeout: float, probe=None):
+        self.peer_base_url = peer_base_url
+        self._failure_threshold = max(failure_threshold, 1)
+        self._reset_timeout = reset_timeout
+        self._probe = probe or _probe_peer
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0  # time.monotonic() of the last trip
+        self._opened_wall: datetime | None = None
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow(self) -> bool:
+        """True if a request may go out now. Runs the half-open probe when it is due."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN or time.monotonic() < self._opened_at + self._reset_timeout:
+                return False  # still cooling down, or another thread is probing
+            self._state = self.HALF_OPEN
+
+        ok = False
+        try:
+            ok = self._probe(self.peer_base_url)
+        except Exception as exc:
+            logger.debug("Probe of %s raised: %s", self.peer_base_url, exc)
+
+        with self._lock:
+            if ok:
+                logger.info("Circuit breaker for %s closed — probe succeeded", self.peer_base_url)
+                self._close()
+            else:
+                logger.warning("Circuit breaker for %s re-opened — probe failed", self.peer_base_url)
+                self._trip()
+        return ok
+
+    def wait_until_allowed(self, stop: threading.Event | None = None) -> bool:
+        """Park the calling worker until the breaker lets a request through.
+
+        Returns False instead if stop is set while parked (the worker's pool is shutting down).
+        """
+        logged = False
+        while not self.allow():
+            if not logged:
+                logger.info("Circuit breaker for %s is open — parking deliveries", self.peer_base_url)
+                logged = True
+            with self._lock:
+                remaining = self._opened_at + self._reset_timeout - time.monotonic()
+            delay = min(max(remaining, 0.5), 5.0)
+            if stop is None:
+                time.sleep(delay)
+            elif stop.wait(delay):
+                return False
+        return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._close()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state != self.OPEN and self._failures >= self._failure_threshold:
+                logger.warning(
+                    "Circuit breaker for %s opened after %d consecutive failures",
+                    self.peer_base_url, self._failures,
+                )
+                self._trip()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            next_probe = None
+            if self._state == self.OPEN:
+                next_probe = round(max(self._opened_at + self._reset_timeout - time.monotonic(), 0.0), 1)
+            return {
+                "peer_base_url": self.peer_base_url,
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "opened_at": self._opened_wall.isoformat() if self._opened_wall else None,
+                "next_probe_in_seconds": next_probe,
+            }
+
+    def _trip(self) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._opened_wall = datetime.now(timezone.utc)
+
+    def _close(self) -> None:
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_wall = None
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def _probe_peer(peer_base_url: str) -> bool:
+    """Cheap liveness check against the peer's public identity endpoint."""
+    rtt = rtt_for(peer_base_url)
+    started = time.perf_counter()
+    try:
+        resp = httpx.get(f"{peer_base_url}/.well-known/hilo-node", timeout=rtt.timeout())
+    except Exception as exc:
+        rtt.record(time.perf_counter() - started, error=exc)
+        raise
+    rtt.record(time.perf_counter() - started)
+    return resp.is_success
+
+
+def breaker_for(peer_base_url: str) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get(peer_base_url)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                peer_base_url,
+                failure_threshold=settings.breaker_failure_threshold,
+                reset_timeout=settings.breaker_reset_seconds,
+            )
+            _breakers[peer_base_url] = breaker
+        return breaker
+
+
+def breaker_states() -> list[dict]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [b.snapshot() for b in breakers]
+
+
+# ── Per-peer RTT ──────────────────────────────────────────────────────────────
+
+class PeerRtt:
+    """Round-trip estimate for one peer, used for its forward timeouts and retry delays.
+
+    Same estimator as the API's services/peer_rtt.py (RFC 6298): srtt and rttvar
+    are updated from every response, rto = srtt + 4·rttvar, and a timeout doubles a
+    backoff factor instead of updating srtt (Karn's algorithm).
+      timeout()            — rto × backoff × 3, clamped to [forward_timeout_min_seconds,
+                             forward_timeout_max_seconds]; forward_timeout_default_seconds
+                             before the first response
+      retry_delay(attempt) — rto × 2^(attempt−1), clamped to [0.5 s, 30 s]
+    """
+
+    TIMEOUT_FACTOR = 3
+    MAX_BACKOFF = 8
+
+    def __init__(self, peer_base_url: str):
+        self.peer_base_url = peer_base_url
+        self.srtt: float | None = None
+        self.rttvar: float | None = None
+        self.backoff = 1
+        self.samples = 0
+        self.errors = 0
+        self.recent_errors: deque = deque(maxlen=10)
+        self._lock = threading.Lock()
+
+    def _rto(self) -> float | None:
+        return None if self.srtt is None else self.srtt + 4 * self.rttvar
+
+    def record(self, rtt: float, error: Exception | None = None) -> None:
+        """Record one call: any HTTP response is a round trip; error is the exception otherwise."""
+        with self._lock:
+            self.samples += 1
+            if error is None:
+                if self.srtt is None:
+                    self.srtt, self.rttvar = rtt, rtt / 2
+                else:
+                    self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+                    self.srtt = 0.875 * self.srtt + 0.125 * rtt
+                self.backoff = 1
+                return
+            self.errors += 1
+            if isinstance(error, httpx.TimeoutException):
+                self.backoff = min(self.backoff * 2, self.MAX_BACKOFF)
+            self.recent_errors.append({
+                "at": datetime.now(timezone.utc).isoformat(),
+                "after_ms": round(rtt * 1000, 1),
+                "error": str(error) or type(error).__name__,
+            })
+
+    def timeout(self) -> float:
+        with self._lock:
+            rto, backoff = self._rto(), self.backoff
+        if rto is None:
+            return settings.forward_timeout_default_seconds
+        value = rto * backoff * self.TIMEOUT_FACTOR
+        return min(max(value, settings.forward_timeout_min_seconds), settings.forward_timeout_max_seconds)
+
+    def retry_delay(self, attempt: int) -> float:
+        with self._lock:
+            rto = self._rto()
+        base = rto if rto is not None else 1.0
+        return min(max(base * 2 ** (attempt - 1), 0.5), 30.0)
+
+    def snapshot(self) -> dict:
+        timeout = self.timeout()
+        with self._lock:
+            return {
+                "peer_base_url": self.peer_base_url,
+                "samples": self.samples,
+                "srtt_ms": None if self.srtt is None else round(self.srtt * 1000, 1),
+                "rttvar_ms": None if self.rttvar is None else round(self.rttvar * 1000, 1),
+                "error_rate": round(self.errors / self.samples, 3) if self.samples else None,
+                "timeout_seconds": round(timeout, 2),
+                "backoff": self.backoff,
+                "recent_errors": list(self.recent_errors),
+            }
+
+
+_rtts: dict[str, PeerRtt] = {}
+_rtts_lock = threading.Lock()
+
+
+def rtt_for(peer_base_url: str) -> PeerRtt:
+    with _rtts_lock:
+        rtt = _rtts.get(peer_base_url)
+        if rtt is None:
+            rtt = _rtts[peer_base_url] = PeerRtt(peer_base_url)
+        return rtt
+
+
+def rtt_states() -> list[dict]:
+    with _rtts_lock:
+        rtts = list(_rtts.values())
+    return [r.snapshot() for r in rtts]
+
+
+# ── Forwarding ────────────────────────────────────────────────────────────────
+
 def _forward_to_peer(peer_base_url: str, notification: dict) -> bool:
-    """POST notification to peer's /bridge/receive. Returns True on success."""
+    """POST notification to peer's /bridge/receive. Returns True on success.
+
+    Returns False straight away while the peer's circuit breaker is open. The
+    request timeout and the delay between attempts come from the peer's measured RTT.
+    """
     url = f"{peer_base_url}/bridge/receive"
-    delay = 1.0
+    breaker = breaker_for(peer_base_url)
+    rtt = rtt_for(peer_base_url)
     for attempt in range(1, FORWARD_RETRIES + 1):
+        if not breaker.allow():
+            logger.info("Circuit breaker for %s is open — skipping forward attempt", peer_base_url)
+            return False
+        started = time.perf_counter()
         try:
-            resp = httpx.post(url, json=notification, timeout=10)
+            with metrics.FORWARD_LATENCY.labels(peer=peer_base_url).time():
+                resp = httpx.post(url, json=notification, timeout=rtt.timeout())
+            rtt.record(time.perf_counter() - started)
             if resp.is_success:
+                breaker.record_success()
+                metrics.record_delivery()
                 logger.info("Forwarded notification to %s", peer_base_url)
                 return True
+            breaker.record_failure()
             logger.warning(
                 "Forward attempt %d/%d to %s returned %d",
                 attempt, FORWARD_RETRIES, peer_base_url, resp.status_code,
             )
         except Exception as exc:
+            rtt.record(time.perf_counter() - started, error=exc)
+            breaker.record_failure()
             logger.warning(
                 "Forward attempt %d/%d to %s failed: %s",
                 attempt, FORWARD_RETRIES, peer_base_url, exc,
             )
         if attempt < FORWARD_RETRIES:
-            time.sleep(delay)
-            delay = min(delay * 2, 30)
+            time.sleep(rtt.retry_delay(attempt))
 
     logger.error("All %d forward attempts to %s failed — moving to dead-letter", FORWARD_RETRIES, peer_base_url)
     return False
 
 
-def process_notification(body: bytes) -> bool:
-    """Parse an EventNotification and forward it to active peers based on receiver field.
+def _forward_batch_to_peer(peer_base_url: str, notifications: list[dict]) -> list[bool] | None:
+    """POST a micro-batch to the peer's /bridge/receive/batch.
+
+    Returns one success flag per notification, in order (all False when every attempt
+    failed). Returns None when the peer predates the batch endpoint (404/405) — the
+    caller then falls back to single POSTs. Timeouts and retry delays are RTT-derived,
+    as in _forward_to_peer.
+    """
+    url = f"{peer_base_url}/bridge/receive/batch"
+    breaker = breaker_for(peer_base_url)
+    rtt = rtt_for(peer_base_url)
+    for attempt in range(1, FORWARD_RETRIES + 1):
+        if not breaker.allow():
+            logger.info("Circuit breaker for %s is open — skipping batch forward attempt", peer_base_url)
+            return [False] * len(notifications)
+        started = time.perf_counter()
+        try:
+            with metrics.FORWARD_LATENCY.labels(peer=peer_base_url).time():
+                resp = httpx.post(url, json={"notifications": notifications}, timeout=rtt.timeout())
+            rtt.record(time.perf_counter() - started)
+            if resp.status_code in (404, 405):
+                breaker.record_success()
+                return None
+            if resp.is_success:
+                breaker.record_success()
+                results = resp.json().get("results", [])
+                flags = [
+                    i < len(results) and results[i].get("status") in ("received", "duplicate")
+                    for i in range(len(notifications))
+                ]
+                if any(flags):
+                    metrics.record_delivery()
+                logger.info("Forwarded batch of %d to %s (%d stored)", len(notifications), peer_base_url, sum(flags))
+                return flags
+            breaker.record_failure()
+            logger.warning(
+                "Batch forward attempt %d/%d to %s returned %d",
+                attempt, FORWARD_RETRIES, peer_base_url, resp.status_code,
+            )
+        except Exception as exc:
+            rtt.record(time.perf_counter() - started, error=exc)
+            breaker.record_failure()
+            logger.warning(
+                "Batch forward attempt %d/%d to %s failed: %s",
+                attempt, FORWARD_RETRIES, peer_base_url, exc,
+            )
+        if attempt < FORWARD_RETRIES:
+            time.sleep(rtt.retry_delay(attempt))
+
+    logger.error("All %d batch forward attempts to %s failed", FORWARD_RETRIES, peer_base_url)
+    return [False] * len(notifications)
+
+
+def _enqueue_for_peer(channel, peer: dict, body: bytes) -> None:
+    """Publish a notification onto one peer's delivery queue and make sure a worker drains it."""
+    peer_node_id = peer["peer_node_id"]
+    ensure_peer_queue(channel, peer_node_id)
+    channel.basic_publish(
+        exchange=EXCHANGE_NAME,
+        routing_key=peer_routing_key(peer_node_id),
+        body=body,
+        properties=pika.BasicProperties(
+            delivery_mode=2,  # persistent
+            content_type="application/json",
+            headers={PEER_URL_HEADER: peer.get("peer_base_url", "")},
+        ),
+    )
+    _ensure_peer_worker(peer_node_id)
 
-    receiver="all"          → forward to all active peers (broadcast)
-    receiver=<peer_node_id> → forward only to that peer (unicast)
+
+def process_notification(body: bytes, channel=None) -> bool:
+    """Parse an EventNotification and fan it out to per-peer delivery queues based on receiver field.
+
+    receiver="all"          → enqueue for all active peers (broadcast)
+    receiver=<peer_node_id> → enqueue only for that peer (unicast)
+
+    The actual HTTP delivery happens in the per-peer workers (on_peer_message), so a
+    slow peer only backs up its own queue.
 
     Missing receiver field raises a deserialization error (no silent default).
     Peer offline at consume time → warning logged, message ACK'd (no dead-letter).
@@ -137,16 +511,12 @@ def process_notification(body: bytes) -> bool:
                 )
                 return True
 
-        all_ok = True
         for peer in targets:
-            peer_url = peer.get("peer_base_url", "")
-            if not peer_url:
+            if not peer.get("peer_base_url"):
                 continue
-            ok = _forward_to_peer(peer_url, notification)
-            if not ok:
-                all_ok = False
+            _enqueue_for_peer(channel, peer, body)
 
-        return all_ok
+        return True
 
     except KeyError:
         logger.error("Notification missing required 'receiver' field — cannot process")
@@ -156,8 +526,8 @@ def process_notification(body: bytes) -> bool:
         return False
 
 
-def on_message(channel, method, properties, body):
-    """RabbitMQ message callback. Retries up to MAX_RETRIES with exponential backoff.
+def _ack_with_retries(channel, method, attempt) -> None:
+    """Run attempt() up to MAX_RETRIES extra times with exponential backoff.
 
     ACKs on success. NACKs without requeue on final failure — message goes to dead-letter queue.
     """
@@ -167,11 +537,12 @@ def on_message(channel, method, properties, body):
 
     while retry_count <= MAX_RETRIES and not success:
         if retry_count > 0:
+            metrics.RETRIES.labels(attempt=str(retry_count)).inc()
             logger.info("Retry %d/%d for message tag=%s", retry_count, MAX_RETRIES, method.delivery_tag)
             time.sleep(delay)
             delay = min(delay * 2, 30)
 
-        success = process_notification(body)
+        success = attempt()
         retry_count += 1
 
     if success:
@@ -186,11 +557,370 @@ def on_message(channel, method, properties, body):
         channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
 
 
+def on_message(channel, method, properties, body):
+    """Dispatch-queue callback — fans the notification out to per-peer delivery queues."""
+    metrics.MESSAGES_CONSUMED.labels(queue="dispatch").inc()
+    metered = _MeteredChannel(channel, "dispatch")
+    _ack_with_retries(metered, method, lambda: process_notification(body, channel))
+
+
+def _decode_delivery(channel, method, properties, body) -> tuple[str, dict] | None:
+    """Return (peer_url, notification) for a delivery message, or NACK it and return None."""
+    headers = (properties.headers or {}) if properties else {}
+    peer_url = headers.get(PEER_URL_HEADER, "")
+    if not peer_url:
+        logger.error("Delivery message without %s header — sending to dead-letter", PEER_URL_HEADER)
+        channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+        return None
+
+    try:
+        return peer_url, json.loads(body)
+    except Exception as exc:
+        logger.error("Undecodable delivery message: %s — sending to dead-letter", exc)
+        channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+        return None
+
+
+def on_peer_message(channel, method, properties, body):
+    """Per-peer delivery callback — POSTs the notification to the peer's /bridge/receive."""
+    decoded = _decode_delivery(channel, method, properties, body)
+    if decoded is None:
+        return
+    peer_url, notification = decoded
+    _ack_with_retries(channel, method, lambda: _deliver(peer_url, notification))
+
+
+class PoolStopping(Exception):
+    """The worker's pool is stopping while a delivery was parked; leave the message unacked."""
+
+
+def _wait_for_breaker(peer_url: str) -> None:
+    """Park while the peer's breaker is open. Raises PoolStopping if the pool stops meanwhile."""
+    if not breaker_for(peer_url).wait_until_allowed(getattr(_pool_worker, "stop", None)):
+        raise PoolStopping(peer_url)
+
+
+def _deliver(peer_url: str, notification: dict) -> bool:
+    """Park while the peer's breaker is open (the message stays unacked in its queue), then forward."""
+    _wait_for_breaker(peer_url)
+    return _forward_to_peer(peer_url, notification)
+
+
+def on_peer_batch(channel, deliveries: list) -> None:
+    """Pool handler — deliver a micro-batch of (method, properties, body) for one peer.
+
+    A single delivery takes the plain /bridge/receive path. Larger batches go to
+    /bridge/receive/batch; notifications the peer reports as stored are ACKed and
+    the rest are resent with the same backoff as on_message, then dead-lettered.
+    After a failure, later notifications about the same subject are resent with it
+    (the peer reports those already stored as duplicates), keeping subject order.
+    Attempts only count while the peer's circuit breaker is closed — an offline
+    peer's messages are parked, not dead-lettered.
+    """
+    if len(deliveries) == 1:
+        on_peer_message(channel, *deliveries[0])
+        return
+
+    # Group by target URL (normally one per peer queue), preserving order
+    groups: dict[str, list[tuple]] = {}
+    for method, properties, body in deliveries:
+        decoded = _decode_delivery(channel, method, properties, body)
+        if decoded is not None:
+            peer_url, notification = decoded
+            groups.setdefault(peer_url, []).append((method, notification))
+
+    for peer_url, pending in groups.items():
+        retry_count = 0
+        delay = 1.0
+        while pending and retry_count <= MAX_RETRIES:
+            if retry_count > 0:
+                metrics.RETRIES.labels(attempt=str(retry_count)).inc(len(pending))
+                logger.info("Retry %d/%d for %d batched notifications", retry_count, MAX_RETRIES, len(pending))
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+
+            _wait_for_breaker(peer_url)
+            flags = _forward_batch_to_peer(peer_url, [n for _, n in pending])
+            if flags is None:
+                logger.info("Peer %s has no batch endpoint — delivering individually", peer_url)
+                for method, notification in pending:
+                    _ack_with_retries(channel, method, lambda n=notification: _deliver(peer_url, n))
+                pending = []
+                break
+
+            # Resend from each subject's first failure on, so a later notification about
+            # a subject is never ACKed ahead of an earlier one still being retried
+            remaining = []
+            failed_subjects = set()
+            for (method, notification), ok in zip(pending, flags):
+                subject = notification.get("subject") or ""
+                if ok and subject not in failed_subjects:
+                    channel.basic_ack(delivery_tag=method.delivery_tag)
+                else:
+                    failed_subjects.add(subject)
+                    remaining.append((method, notification))
+            pending = remaining
+            retry_count += 1
+
+        for method, _ in pending:
+            logger.error(
+                "Batched message failed after %d attempts — sending to dead-letter. tag=%s",
+                MAX_RETRIES, method.delivery_tag,
+            )
+            channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+
+
+def partition_for(body: bytes, partitions: int) -> int:
+    """Stable partition index for a notification, keyed on its subject.
+
+    Notifications about the same subject always land on the same worker, so they
+    are delivered in queue order even when several workers run concurrently.
+    """
+    try:
+        subject = json.loads(body).get("subject") or ""
+    except Exception:
+        subject = ""
+    return zlib.crc32(subject.encode()) % partitions
+
+
+class _MeteredChannel:
+    """Channel wrapper that counts acks and nacks; everything else passes through."""
+
+    def __init__(self, channel, queue: str):
+        self._channel = channel
+        self._queue = queue
+
+    def basic_ack(self, **kwargs) -> None:
+        metrics.MESSAGES_ACKED.labels(queue=self._queue).inc()
+        self._channel.basic_ack(**kwargs)
+
+    def basic_nack(self, **kwargs) -> None:
+        metrics.MESSAGES_NACKED.labels(queue=self._queue).inc()
+        self._channel.basic_nack(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._channel, name)
+
+
+class _ThreadsafeChannel:
+    """Channel facade for worker threads — acks and nacks are marshalled back onto
+    the connection's own thread, since pika connections are not thread-safe."""
+
+    def __init__(self, connection, channel):
+        self._connection = connection
+        self._channel = channel
+
+    def basic_ack(self, **kwargs) -> None:
+        self._connection.add_callback_threadsafe(functools.partial(self._channel.basic_ack, **kwargs))
+
+    def basic_nack(self, **kwargs) -> None:
+        self._connection.add_callback_threadsafe(functools.partial(self._channel.basic_nack, **kwargs))
+
+
+# Per worker thread of a SubjectPartitionedPool: .stop is the pool's stop Event, so a
+# delivery parked on an open breaker (_wait_for_breaker) wakes up when the pool stops.
+_pool_worker = threading.local()
+
+
+class SubjectPartitionedPool:
+    """Runs a batch handler on N worker threads, one FIFO per worker.
+
+    on_message is the consume callback: it only enqueues, so the connection thread
+    keeps servicing heartbeats while workers block on slow peers. Each worker hands
+    handler(channel, deliveries) up to batch_size messages, waiting at most
+    batch_window seconds after the first one for the batch to fill.
+    """
+
+    def __init__(self, connection, channel, handler, workers: int, batch_size: int = 1, batch_window: float = 0.0):
+        self._channel = _MeteredChannel(_ThreadsafeChannel(connection, channel), "delivery")
+        self._handler = handler
+        self._batch_size = max(batch_size, 1)
+        self._batch_window = batch_window
+        self._queues: list[Queue] = [Queue() for _ in range(max(workers, 1))]
+        self._stop = threading.Event()
+        self._threads = [
+            threading.Thread(target=self._run, args=(q,), name=f"{threading.current_thread().name}-w{i}", daemon=True)
+            for i, q in enumerate(self._queues)
+        ]
+
+    def start(self) -> None:
+        for t in self._threads:
+            t.start()
+
+    def stop(self) -> None:
+        """Drop undispatched messages (the broker redelivers them) and wait for in-flight ones.
+
+        Workers parked on an open breaker give up at once; each join is bounded by
+        POOL_STOP_TIMEOUT so a worker stuck in a peer call cannot block the caller.
+        """
+        self._stop.set()
+        for q in self._queues:
+            try:
+                while True:
+                    q.get_nowait()
+            except Empty:
+                pass
+            q.put(None)
+        for t in self._threads:
+            t.join(timeout=POOL_STOP_TIMEOUT)
+            if t.is_alive():
+                logger.warning("Delivery thread %s did not stop within %.0f s — leaving it", t.name, POOL_STOP_TIMEOUT)
+
+    def on_message(self, channel, method, properties, body) -> None:
+        metrics.MESSAGES_CONSUMED.labels(queue="delivery").inc()
+        self._queues[partition_for(body, len(self._queues))].put((method, properties, body))
+
+    def _next_batch(self, q: Queue) -> tuple[list, bool]:
+        """Block for one delivery, then collect more until the batch is full or the window closes.
+
+        Returns (batch, stop) — stop is True once the shutdown sentinel has been seen.
+        """
+        item = q.get()
+        if item is None:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self._batch_window
+        while len(batch) < self._batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = q.get(timeout=remaining) if remaining > 0 else q.get_nowait()
+            except Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self, q: Queue) -> None:
+        _pool_worker.stop = self._stop
+        stop = False
+        while not stop:
+            batch, stop = self._next_batch(q)
+            if not batch:
+                continue
+            try:
+                self._handler(self._channel, batch)
+            except PoolStopping:
+                # Unacked messages go back to the queue when the connection closes
+                logger.info("Delivery pool stopping — leaving %d parked message(s) unacked", len(batch))
+                return
+            except Exception as exc:
+                logger.error("Delivery handler crashed for a batch of %d: %s", len(batch), exc)
+                for method, _, _ in batch:
+                    self._channel.basic_nack(delivery_tag=method.delivery_tag, requeue=False)
+
+
+def _run_peer_worker(peer_node_id: str) -> None:
+    """Consume one peer's delivery queue on a dedicated connection until it goes away.
+
+    Returns when the broker cancels the consumer (queue deleted on disconnect) or the
+    connection drops; the next notification for that peer starts a fresh worker.
+
+    Deliveries run on settings.consumer_workers threads partitioned by subject, with up
+    to settings.consumer_prefetch messages in flight, in micro-batches of up to
+    settings.bridge_batch_size notifications.
+    """
+    conn = None
+    pool = None
+    try:
+        conn = get_connection()
+        channel = conn.channel()
+        ensure_infrastructure(channel)
+        ensure_peer_queue(channel, peer_node_id)
+        pool = SubjectPartitionedPool(
+            conn,
+            channel,
+            on_peer_batch,
+            settings.consumer_workers,
+            batch_size=settings.bridge_batch_size,
+            batch_window=settings.bridge_batch_window_ms / 1000,
+        )
+        pool.start()
+        channel.basic_qos(prefetch_count=max(settings.consumer_prefetch, settings.consumer_workers))
+        channel.basic_consume(queue=peer_queue_name(peer_node_id), on_message_callback=pool.on_message)
+        logger.info(
+            "Delivery worker started for peer %s (workers=%d)", peer_node_id, settings.consumer_workers,
+        )
+        channel.start_consuming()
+        logger.info("Delivery queue for peer %s cancelled — worker stopping", peer_node_id)
+    except Exception as exc:
+        logger.warning("Delivery worker for peer %s stopped: %s", peer_node_id, exc)
+    finally:
+        if pool is not None:
+            pool.stop()
+        if conn is not None and conn.is_open:
+            try:
+                conn.process_data_events(time_limit=0)  # flush acks queued by the pool
+                conn.close()
+            except Exception:
+                pass
+        with _peer_workers_lock:
+            if _peer_workers.get(peer_node_id) is threading.current_thread():
+                del _peer_workers[peer_node_id]
+
+
+def _ensure_peer_worker(peer_node_id: str) -> None:
+    """Start a delivery thread for peer_node_id unless one is already running."""
+    with _peer_workers_lock:
+        worker = _peer_workers.get(peer_node_id)
+        if worker is not None and worker.is_alive():
+            return
+        worker = threading.Thread(
+            target=_run_peer_worker,
+            args=(peer_node_id,),
+            name=f"deliver-{peer_node_id}",
+            daemon=True,
+        )
+        _peer_workers[peer_node_id] = worker
+        worker.start()
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    """GET /breakers — circuit breaker states, read by the API's GET /queue/stats.
+    GET /rtt      — per-peer RTT estimates, read by the API's GET /connections/{peer}/rtt.
+    GET /metrics  — Prometheus exposition."""
+
+    def do_GET(self):
+        if self.path == "/breakers":
+            body, content_type = json.dumps(breaker_states()).encode(), "application/json"
+        elif self.path == "/rtt":
+            body, content_type = json.dumps(rtt_states()).encode(), "application/json"
+        elif self.path == "/metrics":
+            body, content_type = metrics.render()
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep probe traffic out of the consumer log
+
+
+def start_status_server(port: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("0.0.0.0", port), _StatusHandler)
+    threading.Thread(target=server.serve_forever, name="status-server", daemon=True).start()
+    logger.info("Status server listening on :%d", port)
+    return server
+
+
 def main():
-    """Entry point. Connects to RabbitMQ, sets up infrastructure, and starts blocking consume loop."""
+    """Entry point. Connects to RabbitMQ, sets up infrastructure, and starts blocking consume loop.
+
+    The main thread consumes the node's dispatch queue; one delivery thread per active
+    peer consumes that peer's queue. Workers for peers with a backlog are started up front.
+    """
+    if settings.status_port:
+        start_status_server(settings.status_port)
     conn = get_connection()
     channel = conn.channel()
     ensure_infrastructure(channel)
+    for peer in _get_active_peers():
+        if peer.get("peer_node_id"):
+            _ensure_peer_worker(peer["peer_node_id"])
     channel.basic_qos(prefetch_count=1)
     channel.basic_consume(queue=NODE_QUEUE, on_message_callback=on_message)
     logger.info("Consumer started for %s. Waiting for notifications...", settings.node_id)
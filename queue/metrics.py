@@ -0,0 +1,65 @@
+"""Prometheus metrics for the queue consumer.
+
+Served as GET /metrics on the consumer's status server (see consumer.start_status_server).
+Label cardinality stays bounded: queue is "dispatch" or "delivery", peer is one
+value per connected peer.
+"""
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+MESSAGES_CONSUMED = Counter(
+    "hilo_consumer_messages_consumed_total",
+    "Messages received from RabbitMQ",
+    ["queue"],
+)
+MESSAGES_ACKED = Counter(
+    "hilo_consumer_messages_acked_total",
+    "Messages acknowledged",
+    ["queue"],
+)
+MESSAGES_NACKED = Counter(
+    "hilo_consumer_messages_nacked_total",
+    "Messages rejected to the dead-letter queue",
+    ["queue"],
+)
+RETRIES = Counter(
+    "hilo_consumer_retries_total",
+    "Message handling retries, by attempt number",
+    ["attempt"],
+)
+FORWARD_LATENCY = Histogram(
+    "hilo_consumer_forward_seconds",
+    "Round trip of one POST to a peer's bridge endpoint",
+    ["peer"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+PEER_LIST_FETCH = Histogram(
+    "hilo_consumer_peer_list_fetch_seconds",
+    "Duration of the active-peer lookup against the API",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+LAST_DELIVERY = Gauge(
+    "hilo_consumer_last_delivery_timestamp_seconds",
+    "Unix time of the last successful delivery to any peer",
+)
+SECONDS_SINCE_DELIVERY = Gauge(
+    "hilo_consumer_seconds_since_last_delivery",
+    "Seconds since the last successful delivery to any peer (-1 before the first one)",
+)
+
+_last_delivery: float | None = None
+
+
+def record_delivery() -> None:
+    global _last_delivery
+    _last_delivery = time.time()
+    LAST_DELIVERY.set(_last_delivery)
+
+
+SECONDS_SINCE_DELIVERY.set_function(lambda: time.time() - _last_delivery if _last_delivery else -1.0)
+
+
+def render() -> tuple[bytes, str]:
+    """Return (body, content_type) for a scrape."""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,10 +1,26 @@
-"""Tests for queue/consumer.py — receiver-based routing logic."""
+"""Tests for queue/consumer.py — receiver-based routing and per-peer delivery."""
 import json
-from unittest.mock import patch, ANY
+import random
+import time
+from unittest.mock import MagicMock, patch, ANY
 
+import httpx
 import pytest
+from prometheus_client import REGISTRY
 
-from consumer import process_notification
+from consumer import (
+    PEER_URL_HEADER,
+    CircuitBreaker,
+    PeerRtt,
+    _forward_to_peer,
+    on_message,
+    start_status_server,
+    SubjectPartitionedPool,
+    on_peer_batch,
+    on_peer_message,
+    partition_for,
+    process_notification,
+)
 
 # ── Shared test fixtures ───────────────────────────────────────────────────────
 
@@ -27,52 +43,337 @@ def _notification(receiver: str) -> bytes:
 # ── Tests ──────────────────────────────────────────────────────────────────────
 
 def test_broadcast_forwards_to_all_peers():
-    """receiver='all' with two active peers → _forward_to_peer called for each."""
+    """receiver='all' with two active peers → enqueued on each peer's delivery queue."""
     with (
         patch("consumer._get_active_peers", return_value=[PEER_A, PEER_B]),
-        patch("consumer._forward_to_peer", return_value=True) as mock_fwd,
+        patch("consumer._enqueue_for_peer") as mock_enqueue,
     ):
         result = process_notification(_notification("all"))
 
     assert result is True
-    assert mock_fwd.call_count == 2
-    mock_fwd.assert_any_call("http://node-a:8000", ANY)
-    mock_fwd.assert_any_call("http://node-b:8000", ANY)
+    assert mock_enqueue.call_count == 2
+    mock_enqueue.assert_any_call(ANY, PEER_A, ANY)
+    mock_enqueue.assert_any_call(ANY, PEER_B, ANY)
 
 
 def test_unicast_forwards_to_targeted_peer_only():
-    """receiver=node-b → only node-b receives the forward call; node-a does not."""
+    """receiver=node-b → only node-b's delivery queue receives the notification; node-a does not."""
     with (
         patch("consumer._get_active_peers", return_value=[PEER_A, PEER_B]),
-        patch("consumer._forward_to_peer", return_value=True) as mock_fwd,
+        patch("consumer._enqueue_for_peer") as mock_enqueue,
     ):
         result = process_notification(_notification("node-b"))
 
     assert result is True
-    mock_fwd.assert_called_once_with("http://node-b:8000", ANY)
+    mock_enqueue.assert_called_once_with(ANY, PEER_B, ANY)
 
 
 def test_unknown_receiver_logs_warning_acks_without_forwarding():
-    """receiver=<unknown> → warning logged, _forward_to_peer not called, returns True (ACK)."""
+    """receiver=<unknown> → warning logged, nothing enqueued, returns True (ACK)."""
     with (
         patch("consumer._get_active_peers", return_value=[PEER_A, PEER_B]),
-        patch("consumer._forward_to_peer", return_value=True) as mock_fwd,
+        patch("consumer._enqueue_for_peer") as mock_enqueue,
         patch("consumer.logger") as mock_logger,
     ):
         result = process_notification(_notification("node-unknown"))
 
     assert result is True
-    mock_fwd.assert_not_called()
+    mock_enqueue.assert_not_called()
     mock_logger.warning.assert_called_once()
 
 
 def test_broadcast_with_zero_peers_acks_without_forwarding():
-    """receiver='all' with no active peers → _forward_to_peer not called, returns True (ACK)."""
+    """receiver='all' with no active peers → nothing enqueued, returns True (ACK)."""
     with (
         patch("consumer._get_active_peers", return_value=[]),
-        patch("consumer._forward_to_peer", return_value=True) as mock_fwd,
+        patch("consumer._enqueue_for_peer") as mock_enqueue,
     ):
         result = process_notification(_notification("all"))
 
     assert result is True
+    mock_enqueue.assert_not_called()
+
+
+# ── Per-peer delivery ──────────────────────────────────────────────────────────
+
+def _delivery(peer_url: str | None = "http://node-b:8000"):
+    method = MagicMock(delivery_tag=7)
+    properties = MagicMock(headers={PEER_URL_HEADER: peer_url} if peer_url else {})
+    return MagicMock(), method, properties
+
+
+def test_peer_message_forwards_to_header_url_and_acks():
+    """Delivery worker POSTs to the peer URL carried in the message header, then ACKs."""
+    channel, method, properties = _delivery()
+    with patch("consumer._forward_to_peer", return_value=True) as mock_fwd:
+        on_peer_message(channel, method, properties, _notification("node-b"))
+
+    mock_fwd.assert_called_once_with("http://node-b:8000", ANY)
+    channel.basic_ack.assert_called_once_with(delivery_tag=7)
+
+
+def test_peer_message_without_url_header_is_dead_lettered():
+    """A delivery message with no peer URL cannot be delivered → NACK without requeue."""
+    channel, method, properties = _delivery(peer_url=None)
+    with patch("consumer._forward_to_peer") as mock_fwd:
+        on_peer_message(channel, method, properties, _notification("node-b"))
+
     mock_fwd.assert_not_called()
+    channel.basic_nack.assert_called_once_with(delivery_tag=7, requeue=False)
+
+
+# ── Subject-partitioned worker pool ────────────────────────────────────────────
+
+def _body(subject: str, seq: int) -> bytes:
+    return json.dumps({"event_id": f"evt-{seq}", "subject": subject, "receiver": "all"}).encode()
+
+
+def test_partition_is_stable_per_subject():
+    """The same subject always maps to the same worker."""
+    body = _body("http://example.org/order/1", 1)
+    assert partition_for(body, 8) == partition_for(_body("http://example.org/order/1", 2), 8)
+    assert partition_for(b"not json", 8) == partition_for(b"", 8)
+
+
+def test_pool_preserves_order_per_subject():
+    """With several workers, notifications about one subject are handled in queue order."""
+    seen: dict[str, list[int]] = {}
+
+    def handler(channel, deliveries):
+        for method, _properties, body in deliveries:
+            time.sleep(random.random() / 500)
+            msg = json.loads(body)
+            seen.setdefault(msg["subject"], []).append(int(msg["event_id"][4:]))
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+
+    connection = MagicMock()
+    connection.add_callback_threadsafe.side_effect = lambda cb: cb()
+    channel = MagicMock()
+    pool = SubjectPartitionedPool(connection, channel, handler, workers=4, batch_size=3, batch_window=0.005)
+    pool.start()
+    for seq in range(60):
+        pool.on_message(channel, MagicMock(delivery_tag=seq), None, _body(f"urn:s:{seq % 5}", seq))
+    # stop() drops undispatched items, so wait for the handlers to drain first
+    deadline = time.time() + 5
+    while sum(len(v) for v in seen.values()) < 60 and time.time() < deadline:
+        time.sleep(0.01)
+    pool.stop()
+
+    assert sum(len(v) for v in seen.values()) == 60
+    for seqs in seen.values():
+        assert seqs == sorted(seqs)
+    assert channel.basic_ack.call_count == 60
+
+
+def test_pool_stop_releases_worker_parked_on_open_breaker():
+    """stop() returns promptly and the parked message is left unacked for redelivery."""
+    open_breaker = CircuitBreaker("http://node-b:8000", failure_threshold=1, reset_timeout=3600)
+    open_breaker.record_failure()
+    connection = MagicMock()
+    connection.add_callback_threadsafe.side_effect = lambda cb: cb()
+    channel = MagicMock()
+    pool = SubjectPartitionedPool(connection, channel, on_peer_batch, workers=1)
+    with (
+        patch("consumer.breaker_for", return_value=open_breaker),
+        patch("consumer._forward_to_peer") as mock_forward,
+    ):
+        pool.start()
+        method, props, body = _deliveries(1)[0]
+        pool.on_message(channel, method, props, body)
+        time.sleep(0.05)  # let the worker park
+        started = time.monotonic()
+        pool.stop()
+    assert time.monotonic() - started < 2
+    assert not any(t.is_alive() for t in pool._threads)
+    mock_forward.assert_not_called()
+    channel.basic_ack.assert_not_called()
+    channel.basic_nack.assert_not_called()
+
+
+# ── Micro-batched delivery ─────────────────────────────────────────────────────
+
+def _deliveries(n: int, subjects: int = 1):
+    props = MagicMock(headers={PEER_URL_HEADER: "http://node-b:8000"})
+    return [(MagicMock(delivery_tag=i), props, _body(f"urn:s:{i % subjects}", i)) for i in range(n)]
+
+
+def test_batch_acks_stored_and_retries_failed_items():
+    """Items the peer reports as stored are ACKed; the rest are resent, then ACKed on success."""
+    channel = MagicMock()
+    with (
+        patch("consumer._forward_batch_to_peer", side_effect=[[True, False, True], [True]]) as mock_batch,
+        patch("consumer.time.sleep"),
+    ):
+        on_peer_batch(channel, _deliveries(3, subjects=3))
+
+    assert mock_batch.call_count == 2
+    resent = mock_batch.call_args_list[1].args[1]
+    assert [n["event_id"] for n in resent] == ["evt-1"]
+    assert sorted(c.kwargs["delivery_tag"] for c in channel.basic_ack.call_args_list) == [0, 1, 2]
+    channel.basic_nack.assert_not_called()
+
+
+def test_batch_retry_resends_from_first_failure_per_subject():
+    """A later notification about a failed one's subject is not ACKed ahead of its retry."""
+    props = MagicMock(headers={PEER_URL_HEADER: "http://node-b:8000"})
+    deliveries = [
+        (MagicMock(delivery_tag=i), props, _body(subject, i))
+        for i, subject in enumerate(["urn:s:1", "urn:s:1", "urn:s:2"])
+    ]
+    channel = MagicMock()
+    acked = []
+    channel.basic_ack.side_effect = lambda delivery_tag: acked.append(delivery_tag)
+    with (
+        patch("consumer._forward_batch_to_peer", side_effect=[[False, True, True], [True, True]]) as mock_batch,
+        patch("consumer.time.sleep"),
+    ):
+        on_peer_batch(channel, deliveries)
+
+    resent = mock_batch.call_args_list[1].args[1]
+    assert [n["event_id"] for n in resent] == ["evt-0", "evt-1"]
+    assert acked == [2, 0, 1]
+
+
+def test_batch_size_above_the_endpoint_limit_is_rejected():
+    from pydantic import ValidationError
+
+    from config import Settings
+
+    with pytest.raises(ValidationError):
+        Settings(bridge_batch_size=501)
+
+
+def test_batch_falls_back_to_single_posts_for_old_peers():
+    """A peer without /bridge/receive/batch gets each notification on /bridge/receive."""
+    channel = MagicMock()
+    with (
+        patch("consumer._forward_batch_to_peer", return_value=None),
+        patch("consumer._forward_to_peer", return_value=True) as mock_single,
+    ):
+        on_peer_batch(channel, _deliveries(2))
+
+    assert mock_single.call_count == 2
+    assert channel.basic_ack.call_count == 2
+
+
+# ── Circuit breaker ────────────────────────────────────────────────────────────
+
+def test_breaker_opens_after_threshold_and_skips_probe_while_cooling_down():
+    """Consecutive failures open the breaker; no probe runs before reset_timeout."""
+    probe = MagicMock(return_value=True)
+    breaker = CircuitBreaker("http://node-b:8000", failure_threshold=3, reset_timeout=60, probe=probe)
+    for _ in range(3):
+        assert breaker.allow() is True
+        breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow() is False
+    probe.assert_not_called()
+    assert breaker.snapshot()["state"] == "open"
+
+
+def test_breaker_probe_closes_or_reopens():
+    """After the cooldown a successful probe closes the breaker; a failed one re-opens it."""
+    probe = MagicMock(side_effect=[False, True])
+    breaker = CircuitBreaker("http://node-b:8000", failure_threshold=1, reset_timeout=0, probe=probe)
+    breaker.record_failure()
+
+    assert breaker.allow() is False
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow() is True
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert probe.call_count == 2
+
+
+def test_forward_short_circuits_while_breaker_open():
+    """An open breaker fails the forward immediately — no HTTP request, no timeout."""
+    open_breaker = CircuitBreaker("http://node-b:8000", failure_threshold=1, reset_timeout=60)
+    open_breaker.record_failure()
+    with (
+        patch("consumer.breaker_for", return_value=open_breaker),
+        patch("consumer.httpx.post") as mock_post,
+    ):
+        assert _forward_to_peer("http://node-b:8000", {"event_id": "evt-1"}) is False
+    mock_post.assert_not_called()
+
+
+# ── Per-peer RTT ───────────────────────────────────────────────────────────────
+
+def test_peer_rtt_timeout_follows_measured_rtt():
+    """The default applies until a response is measured; then rto × 3, clamped; a timeout doubles it."""
+    rtt = PeerRtt("http://node-b:8000")
+    assert rtt.timeout() == 10.0
+
+    rtt.record(1.0)  # srtt 1 s, rttvar 0.5 s → rto 3 s → timeout 9 s
+    assert rtt.timeout() == pytest.approx(9.0)
+    assert rtt.retry_delay(2) == pytest.approx(6.0)
+
+    rtt.record(9.0, error=httpx.ReadTimeout("timed out"))
+    assert rtt.timeout() == pytest.approx(18.0)
+    assert rtt.snapshot()["error_rate"] == 0.5
+
+    fast = PeerRtt("http://node-c:8000")
+    fast.record(0.01)
+    assert fast.timeout() == 2.0  # clamped to forward_timeout_min_seconds
+
+
+def test_forward_uses_peer_rtt_for_timeout_and_retry_delay():
+    """_forward_to_peer passes the peer's RTT-derived timeout to httpx and sleeps its retry delay."""
+    rtt = PeerRtt("http://node-b:8000")
+    rtt.record(2.0)  # rto 6 s → timeout 18 s
+    breaker = CircuitBreaker("http://node-b:8000", failure_threshold=10, reset_timeout=60)
+    with (
+        patch("consumer.breaker_for", return_value=breaker),
+        patch("consumer.rtt_for", return_value=rtt),
+        patch("consumer.httpx.post", side_effect=[MagicMock(is_success=False, status_code=503),
+                                                  MagicMock(is_success=True)]) as mock_post,
+        patch("consumer.time.sleep") as mock_sleep,
+    ):
+        assert _forward_to_peer("http://node-b:8000", {"event_id": "evt-1"}) is True
+
+    assert mock_post.call_args_list[0].kwargs["timeout"] == pytest.approx(18.0)
+    mock_sleep.assert_called_once()
+    # after the 503 (measured at ~0 s): srtt 1.75 s, rttvar 1.25 s → rto 6.75 s
+    assert mock_sleep.call_args.args[0] == pytest.approx(6.75, abs=0.01)
+    assert rtt.samples == 3
+
+
+# ── Metrics ────────────────────────────────────────────────────────────────────
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_dispatch_message_counts_consumed_and_acked():
+    """A dispatched notification increments the consumed and ACKed counters for the dispatch queue."""
+    consumed = _sample("hilo_consumer_messages_consumed_total", queue="dispatch")
+    acked = _sample("hilo_consumer_messages_acked_total", queue="dispatch")
+    with (
+        patch("consumer._get_active_peers", return_value=[PEER_B]),
+        patch("consumer._enqueue_for_peer"),
+    ):
+        on_message(MagicMock(), MagicMock(delivery_tag=1), None, _notification("all"))
+
+    assert _sample("hilo_consumer_messages_consumed_total", queue="dispatch") == consumed + 1
+    assert _sample("hilo_consumer_messages_acked_total", queue="dispatch") == acked + 1
+
+
+def test_forward_records_latency_per_peer():
+    """Each POST to a peer is observed in the forward-latency histogram under that peer's label."""
+    before = _sample("hilo_consumer_forward_seconds_count", peer="http://node-c:8000")
+    with patch("consumer.httpx.post", return_value=MagicMock(is_success=True)):
+        assert _forward_to_peer("http://node-c:8000", {"event_id": "evt-1"}) is True
+    assert _sample("hilo_consumer_forward_seconds_count", peer="http://node-c:8000") == before + 1
+    assert _sample("hilo_consumer_seconds_since_last_delivery") >= 0
+
+
+def test_status_server_serves_metrics():
+    """GET /metrics on the status server returns the Prometheus exposition."""
+    server = start_status_server(0)
+    try:
+        resp = httpx.get(f"http://127.0.0.1:{server.server_address[1]}/metrics")
+    finally:
+        server.shutdown()
+    assert resp.status_code == 200
+    assert "hilo_consumer_messages_consumed_total" in resp.text
+    assert "hilo_consumer_peer_list_fetch_seconds" in resp.text
@@ -49,6 +49,8 @@ export async function sendConnectionRequest(peerBaseUrl: string): Promise<Connec
       name: ours.name,
       base_url: ours.base_url,
       public_key: ours.public_key,
+      algorithms: ours.algorithms,
+      public_keys: ours.public_keys,
     }),
   });
   if (resp.status === 409) throw new Error("Connection request already exists");
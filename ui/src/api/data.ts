@@ -26,10 +26,19 @@ export async function runSparqlQuery(sparql: string): Promise<SparqlResults> {
   return resp.json();
 }
 
+export interface TranslationCacheStats {
+  entries: number;
+  hits: number;
+  misses: number;
+  hit_rate: number;
+}
+
 export interface AskResponse {
   sparql: string | null;
   results: SparqlResults | null;
   error: string | null;
+  cached?: boolean;
+  cache?: TranslationCacheStats | null;
 }
 
 export async function askNaturalLanguage(question: string): Promise<AskResponse> {
@@ -91,12 +91,52 @@ export async function createEvent(params: CreateEventParams): Promise<Event> {
   return resp.json();
 }
 
-/** Fetch the full event from a remote node using a bearer token. */
-export async function fetchRemoteEvent(dataUrl: string, token: string): Promise<Event> {
-  const resp = await fetch(dataUrl, {
-    headers: { Accept: "application/json", Authorization: `Bearer ${token}` },
+/**
+ * Peer event payload from this node's payload cache, or null if it isn't cached.
+ * With fetchOnMiss the API fetches it from the source node (server-side) and caches it.
+ */
+export async function fetchCachedPayload(id: string, fetchOnMiss = false): Promise<Event | null> {
+  const internalKey = import.meta.env.VITE_INTERNAL_KEY || "dev";
+  const qs = fetchOnMiss ? "?fetch=true" : "";
+  const resp = await fetch(`${API_URL}/events/${id}/payload${qs}`, {
+    headers: { Accept: "application/json", Authorization: `Bearer ${internalKey}` },
   });
-  if (resp.status === 401) throw new Error("Token rejected — request a fresh token from the Connections page");
-  if (!resp.ok) throw new Error(`Remote fetch failed (${resp.status})`);
+  if (resp.status === 404 && !fetchOnMiss) return null;
+  if (!resp.ok) {
+    const err = await resp.json().catch(() => ({ detail: `Fetch failed (${resp.status})` }));
+    throw new Error(err.detail || `Fetch failed (${resp.status})`);
+  }
+  return resp.json();
+}
+
+/** Have the API fetch a peer event from its source node and import it — the payload never passes through the browser. */
+export async function importFromSource(id: string): Promise<{ status: string; id: string; cached: boolean }> {
+  const internalKey = import.meta.env.VITE_INTERNAL_KEY || "dev";
+  const resp = await fetch(`${API_URL}/events/${id}/import-from-source`, {
+    method: "POST",
+    headers: { Authorization: `Bearer ${internalKey}` },
+  });
+  if (!resp.ok) {
+    const err = await resp.json().catch(() => ({ detail: `Import failed (${resp.status})` }));
+    throw new Error(err.detail || `Import failed (${resp.status})`);
+  }
   return resp.json();
 }
+
+export interface BulkImportResult {
+  id: string;
+  status: "imported" | "already_imported" | "error";
+  error?: string;
+}
+
+/** Server-side import of many peer events at once. */
+export async function importManyFromSource(ids: string[]): Promise<BulkImportResult[]> {
+  const internalKey = import.meta.env.VITE_INTERNAL_KEY || "dev";
+  const resp = await fetch(`${API_URL}/events/import-from-source`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json", Authorization: `Bearer ${internalKey}` },
+    body: JSON.stringify({ event_ids: ids }),
+  });
+  if (!resp.ok) throw new Error(`Bulk import failed (${resp.status})`);
+  return (await resp.json()).results;
+}
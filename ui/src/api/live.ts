@@ -0,0 +1,55 @@
+const API_URL = import.meta.env.VITE_API_URL || "http://localhost:8000";
+
+/**
+ * Server-Sent Events from GET /live — one EventSource per tab, shared by every page.
+ *
+ * Topics (see api/services/live.py): hello, event, event_updated, events_purged,
+ * connection, queue_stats. "hello" arrives on every (re)connect; reload state on it
+ * so nothing missed while disconnected is lost.
+ */
+export type LiveTopic =
+  | "hello"
+  | "event"
+  | "event_updated"
+  | "events_purged"
+  | "connection"
+  | "queue_stats";
+
+type Handler = (data: any) => void;
+
+const handlers = new Map<LiveTopic, Set<Handler>>();
+let source: EventSource | null = null;
+
+function connect() {
+  const internalKey = import.meta.env.VITE_INTERNAL_KEY || "dev";
+  // EventSource cannot send headers — the API accepts the key as a query parameter
+  source = new EventSource(`${API_URL}/live?access_token=${encodeURIComponent(internalKey)}`);
+  for (const topic of handlers.keys()) listen(topic);
+}
+
+function listen(topic: LiveTopic) {
+  source?.addEventListener(topic, (e) => {
+    const data = JSON.parse((e as MessageEvent).data);
+    handlers.get(topic)?.forEach((h) => h(data));
+  });
+}
+
+/** Call handler for every message on topic. Returns an unsubscribe function. */
+export function subscribe(topic: LiveTopic, handler: Handler): () => void {
+  if (!handlers.has(topic)) {
+    handlers.set(topic, new Set());
+    listen(topic);
+  }
+  handlers.get(topic)!.add(handler);
+  if (!source) connect();
+
+  return () => {
+    handlers.get(topic)?.delete(handler);
+    const remaining = Array.from(handlers.values()).reduce((n, s) => n + s.size, 0);
+    if (remaining === 0 && source) {
+      source.close();
+      source = null;
+      handlers.clear();
+    }
+  };
+}
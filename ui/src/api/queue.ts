@@ -7,6 +7,22 @@ export interface Consumer {
   messages_processed: number;
 }
 
+export interface CircuitBreaker {
+  peer_base_url: string;
+  state: "closed" | "open" | "half_open";
+  consecutive_failures: number;
+  opened_at: string | null;
+  next_probe_in_seconds: number | null;
+}
+
+export interface QueueInfo {
+  name: string;
+  messages_ready: number | null;
+  messages_unacked: number | null;
+  consumers: number | null;
+  publish_per_minute: number | null;
+}
+
 export interface QueueStats {
   messages_ready: number | null;
   messages_unacked: number | null;
@@ -14,6 +30,19 @@ export interface QueueStats {
   dead_letters: number | null;
   throughput_per_minute: number | null;
   consumer_details: Consumer[];
+  circuit_breakers: CircuitBreaker[] | null;
+  queues?: QueueInfo[];
+  sampled_at?: string;
+}
+
+export interface QueueStatsSample {
+  at: string;
+  messages_ready: number | null;
+  messages_unacked: number | null;
+  dead_letters: number | null;
+  throughput_per_minute: number | null;
+  consumers: number | null;
+  queues: Record<string, number | null>;
 }
 
 export async function fetchQueueStats(): Promise<QueueStats> {
@@ -28,11 +57,22 @@ export async function fetchQueueStats(): Promise<QueueStats> {
       dead_letters: null,
       throughput_per_minute: null,
       consumer_details: [],
+      circuit_breakers: null,
     };
   }
   return resp.json();
 }
 
+/** Recent background samples (oldest first) for throughput / backlog charts. */
+export async function fetchQueueStatsHistory(limit?: number): Promise<QueueStatsSample[]> {
+  const qs = limit ? `?limit=${limit}` : "";
+  const resp = await fetch(`${API_URL}/queue/stats/history${qs}`, {
+    headers: { Accept: "application/json" },
+  });
+  if (!resp.ok) return [];
+  return (await resp.json()).samples;
+}
+
 // TODO: implement POST /queue/retry/{message_id} on the backend (Phase 7)
 export async function retryDeadLetter(messageId: string): Promise<void> {
   const resp = await fetch(`${API_URL}/queue/retry/${messageId}`, {
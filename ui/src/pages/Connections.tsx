@@ -29,6 +29,7 @@ import {
   resendAcceptance,
   sendConnectionRequest,
 } from "../api/connections";
+import { subscribe } from "../api/live";
 import { Connection, NodeIdentity, TokenResponse } from "../types";
 
 // ─── Helpers ──────────────────────────────────────────────────────────────────
@@ -405,8 +406,13 @@ export default function Connections() {
 
   useEffect(() => {
     load();
-    const id = setInterval(load, 10_000);
-    return () => clearInterval(id);
+    // Reload on connection state changes pushed by GET /live (and after reconnects)
+    const offChange = subscribe("connection", load);
+    const offHello = subscribe("hello", load);
+    return () => {
+      offChange();
+      offHello();
+    };
   }, [load]);
 
   // ── Preview ──
@@ -5,6 +5,7 @@ import { runSparqlQuery, SparqlBinding } from "../api/data";
 import { fetchHealth } from "../api/health";
 import { fetchEvents, Event } from "../api/events";
 import { fetchQueueStats, QueueStats } from "../api/queue";
+import { subscribe } from "../api/live";
 import { useTheme } from "../context/ThemeContext";
 
 // ─── useCountUp ──────────────────────────────────────────────────────────────
@@ -366,8 +367,17 @@ function RecentEvents({ onNavigate }: { onNavigate: (page: string) => void }) {
 
   useEffect(() => {
     load();
-    const id = setInterval(load, 10_000);
-    return () => clearInterval(id);
+    // New events are pushed by GET /live; reload only after (re)connecting
+    const offEvent = subscribe("event", (ev: Event) => {
+      setEvents((prev) => [ev, ...prev.filter((e) => e.id !== ev.id)].slice(0, 5));
+    });
+    const offPurged = subscribe("events_purged", load);
+    const offHello = subscribe("hello", load);
+    return () => {
+      offEvent();
+      offPurged();
+      offHello();
+    };
   }, [load]);
 
   const isNew = (id: string) => !prevIds.current.has(id);
@@ -502,8 +512,15 @@ function QueuePulse({ onNavigate }: { onNavigate: (page: string) => void }) {
 
   useEffect(() => {
     load();
-    const id = setInterval(load, 10_000);
-    return () => clearInterval(id);
+    const offStats = subscribe("queue_stats", (data: QueueStats) => {
+      setStats(data);
+      setError(null);
+    });
+    const offHello = subscribe("hello", load);
+    return () => {
+      offStats();
+      offHello();
+    };
   }, [load]);
 
   return (
@@ -14,8 +14,9 @@ import {
   X,
   Zap,
 } from "lucide-react";
-import { fetchEvents, fetchEvent, fetchRemoteEvent, importEvent, createEvent, Event } from "../api/events";
-import { getToken, listConnections } from "../api/connections";
+import { fetchEvents, fetchEvent, fetchCachedPayload, importFromSource, createEvent, Event } from "../api/events";
+import { listConnections } from "../api/connections";
+import { subscribe } from "../api/live";
 import { Connection } from "../types";
 import FilterChips from "../components/FilterChips";
 
@@ -799,8 +800,25 @@ export default function Events({ onNavigate }: EventsProps) {
 
   useEffect(() => {
     load();
-    const id = setInterval(load, 10_000);
-    return () => clearInterval(id);
+    // Pushed by GET /live instead of polling; a full reload only after (re)connecting
+    const offEvent = subscribe("event", (ev: Event) => {
+      newIds.current = new Set([ev.id]);
+      prevIds.current = new Set([ev.id, ...Array.from(prevIds.current)]);
+      setEvents((prev) => [ev, ...prev.filter((e) => e.id !== ev.id)].slice(0, 100));
+    });
+    const offUpdated = subscribe("event_updated", (u: { id: string; has_local_copy: boolean }) => {
+      setEvents((prev) => prev.map((e) => (e.id === u.id ? { ...e, has_local_copy: u.has_local_copy } : e)));
+    });
+    const offPurged = subscribe("events_purged", (p: { source_node: string }) => {
+      setEvents((prev) => prev.filter((e) => e.source_node !== p.source_node));
+    });
+    const offHello = subscribe("hello", load);
+    return () => {
+      offEvent();
+      offUpdated();
+      offPurged();
+      offHello();
+    };
   }, [load]);
 
   useEffect(() => {
@@ -809,21 +827,29 @@ export default function Events({ onNavigate }: EventsProps) {
     setFetchError(null);
     setStoreError(null);
     fetchEvent(selectedId)
-      .then(setDetail)
+      .then(async (ev) => {
+        // Peer event not stored locally — show the prefetched payload if the cache has it
+        if (!ev.has_local_copy && ev.links?.data) {
+          const cached = await fetchCachedPayload(selectedId).catch(() => null);
+          if (cached) return setDetail({ ...cached, has_local_copy: false });
+        }
+        setDetail(ev);
+      })
       .catch(() => setDetail(null))
       .finally(() => setLoadingDetail(false));
   }, [selectedId]);
 
   const handleFetchFromSource = async () => {
-    if (!detail?.links?.data || !detail.source_node) return;
+    if (!selectedId || !detail?.links?.data) return;
     setFetchingRemote(true);
     setFetchError(null);
     try {
-      const tokenResp = await getToken(detail.source_node);
-      const full = await fetchRemoteEvent(detail.links.data, tokenResp.token);
+      // The API fetches from the source node and caches the payload, so
+      // "Store locally" afterwards does not need a second fetch
+      const full = await fetchCachedPayload(selectedId, true);
       // has_local_copy from the source node's response reflects *their* store status,
       // not ours — we know we don't have a local copy yet or we wouldn't be fetching
-      setDetail({ ...full, has_local_copy: false });
+      if (full) setDetail({ ...full, has_local_copy: false });
     } catch (e: any) {
       setFetchError(e.message);
     } finally {
@@ -836,7 +862,7 @@ export default function Events({ onNavigate }: EventsProps) {
     setStoring(true);
     setStoreError(null);
     try {
-      await importEvent(selectedId, detail.triples);
+      await importFromSource(selectedId);
       // Re-fetch from local API to confirm storage and update has_local_copy
       const updated = await fetchEvent(selectedId);
       setDetail(updated);
@@ -888,7 +914,7 @@ export default function Events({ onNavigate }: EventsProps) {
           Events Monitor
         </h1>
         <p className="text-[var(--text-muted)] text-sm">
-          Real-time data sharing activity · auto-refreshes every 10 s
+          Real-time data sharing activity · live
         </p>
       </div>
 
@@ -13,7 +13,8 @@ import {
   RefreshCw,
   RotateCcw,
 } from "lucide-react";
-import { fetchQueueStats, retryDeadLetter, Consumer, QueueStats } from "../api/queue";
+import { fetchQueueStats, fetchQueueStatsHistory, retryDeadLetter, Consumer, QueueStats, QueueStatsSample } from "../api/queue";
+import { subscribe } from "../api/live";
 import FilterChips from "../components/FilterChips";
 
 // ─── useCountUp ───────────────────────────────────────────────────────────────
@@ -101,6 +102,32 @@ function KpiCard({
   );
 }
 
+// ─── Throughput sparkline ────────────────────────────────────────────────────
+
+function ThroughputChart({ samples }: { samples: QueueStatsSample[] }) {
+  const values = samples.map((s) => s.throughput_per_minute ?? 0);
+  if (values.length < 2) return null;
+  const max = Math.max(...values, 1);
+  const w = 600;
+  const h = 60;
+  const points = values
+    .map((v, i) => `${(i / (values.length - 1)) * w},${h - (v / max) * h}`)
+    .join(" ");
+  return (
+    <div className="glass rounded-hilo p-5 border border-[var(--border)]">
+      <div className="flex items-baseline justify-between mb-2">
+        <p className="text-xs font-medium uppercase tracking-widest text-[var(--text-muted)]">
+          Throughput history
+        </p>
+        <span className="text-xs text-[var(--text-muted)]">peak {max}/min</span>
+      </div>
+      <svg viewBox={`0 0 ${w} ${h}`} preserveAspectRatio="none" className="w-full h-16">
+        <polyline points={points} fill="none" stroke="currentColor" strokeWidth="2" className="text-hilo-purple" />
+      </svg>
+    </div>
+  );
+}
+
 // ─── HealthStrip (compact, problem state) ────────────────────────────────────
 
 function CompactHealthStrip({ stats }: { stats: QueueStats }) {
@@ -423,14 +450,16 @@ function DeadLetterSection({ count, problemState }: { count: number; problemStat
 
 export default function Queue() {
   const [stats, setStats] = useState<QueueStats | null>(null);
+  const [history, setHistory] = useState<QueueStatsSample[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [consumersExpanded, setConsumersExpanded] = useState(false);
 
   const load = useCallback(async () => {
     try {
-      const data = await fetchQueueStats();
+      const [data, samples] = await Promise.all([fetchQueueStats(), fetchQueueStatsHistory(180)]);
       setStats(data);
+      setHistory(samples);
       setError(null);
     } catch {
       setError("Could not load queue stats");
@@ -441,8 +470,27 @@ export default function Queue() {
 
   useEffect(() => {
     load();
-    const id = setInterval(load, 10_000);
-    return () => clearInterval(id);
+    // Pushed by GET /live whenever the stats change — no per-tab polling
+    const offStats = subscribe("queue_stats", (data: QueueStats) => {
+      setStats(data);
+      setError(null);
+      setHistory((prev) =>
+        [...prev, {
+          at: data.sampled_at ?? new Date().toISOString(),
+          messages_ready: data.messages_ready,
+          messages_unacked: data.messages_unacked,
+          dead_letters: data.dead_letters,
+          throughput_per_minute: data.throughput_per_minute,
+          consumers: data.consumers,
+          queues: {},
+        }].slice(-180)
+      );
+    });
+    const offHello = subscribe("hello", load);
+    return () => {
+      offStats();
+      offHello();
+    };
   }, [load]);
 
   const deadLetters = stats?.dead_letters ?? 0;
@@ -457,7 +505,7 @@ export default function Queue() {
             Queue Inspector
           </h1>
           <p className="text-[var(--text-muted)] text-sm">
-            Message queue health and dead-letter management · auto-refreshes every 10 s
+            Message queue health and dead-letter management · live
           </p>
         </div>
         {/* T6: ghost/secondary Refresh button */}
@@ -541,6 +589,8 @@ export default function Queue() {
             <CompactHealthStrip stats={stats} />
           )}
 
+          <ThroughputChart samples={history} />
+
           {/* Dead-letter section */}
           <div className="space-y-1">
             <p className="text-xs font-medium uppercase tracking-widest text-[var(--text-muted)] px-1">
@@ -1,7 +1,16 @@
+export interface HealthCheck {
+  status: string;
+  latency_ms: number;
+  last_checked: string;
+  last_success: string | null;
+  consecutive_failures: number;
+}
+
 export interface HealthStatus {
   graphdb: string;
   queue: string;
   status: "healthy" | "degraded";
+  checks: Record<string, HealthCheck>;
 }
 
 export interface Event {
@@ -45,6 +54,8 @@ export interface NodeIdentity {
   name: string;
   base_url: string;
   public_key: string;
+  algorithms?: string[]; // absent on version 2 nodes (RS256 only)
+  public_keys?: Record<string, string>;
   version: string;
 }
 